@@ -106,9 +106,9 @@ const HierarchyBuilder = () => {
       return;
     }
 
-    // Check if relationship already exists
+    // Check if relationship already exists (lines derived from Excel can be overridden)
     const existingRelation = hierarchyData.find(rel => rel.employeeId === selectedEmployee);
-    if (existingRelation) {
+    if (existingRelation && existingRelation.source !== "excel") {
       toast.error("This employee already has a reporting manager");
       return;
     }
@@ -120,14 +120,14 @@ const HierarchyBuilder = () => {
         reportsTo: selectedManager
       });
 
-      // Update local state
-      setHierarchyData(prev => [...prev, newRelation]);
+      // Update local state, replacing any Excel-derived line for the employee
+      setHierarchyData(prev => [...prev.filter(rel => rel.employeeId !== newRelation.employeeId), newRelation]);
       setSelectedEmployee("");
       setSelectedManager("");
       toast.success("Reporting relationship added successfully!");
     } catch (error) {
       console.error("Error adding relationship:", error);
-      toast.error("Failed to add reporting relationship");
+      toast.error(error.message || "Failed to add reporting relationship");
     }
   };
 
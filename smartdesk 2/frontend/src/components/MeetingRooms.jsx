@@ -6,7 +6,7 @@ import { Input } from './ui/input';
 import { Calendar, MapPin, Users, Clock, CheckCircle, XCircle } from 'lucide-react';
 import { toast } from 'sonner';
 import { useAuth } from '../context/AuthContext';
-import { meetingRoomAPI, employeeAPI, utilityAPI } from '../services/api';
+import { meetingRoomAPI, employeeAPI, utilityAPI, eventAPI } from '../services/api';
 import SearchableEmployeeDropdown from './ui/SearchableEmployeeDropdown';
 
 const MeetingRooms = () => {
@@ -47,6 +47,13 @@ const MeetingRooms = () => {
 
   useEffect(() => {
     fetchRooms();
+
+    // Refresh when bookings change here or in another tab
+    const unsubscribe = eventAPI.subscribe('booking', () => {
+      fetchRooms();
+    });
+
+    return () => unsubscribe();
   }, [filters]);
 
   const fetchRooms = async () => {
@@ -146,15 +153,13 @@ const MeetingRooms = () => {
 
   const handleClearRoomBookings = async (roomId) => {
     const room = rooms.find(r => r.id === roomId);
-    const bookingCount = room?.bookings?.length || 0;
+    const bookingCount = room?.booking_count || 0;
     
     if (window.confirm(`Are you sure you want to clear all ${bookingCount} booking(s) for this room?`)) {
       try {
-        // Cancel each booking individually
-        for (const booking of room.bookings) {
-          await meetingRoomAPI.cancelSpecificBooking(roomId, booking.id);
-        }
-        toast.success(`All bookings cleared for ${room.name}`);
+        // Clear the room's bookings in a single update
+        const result = await meetingRoomAPI.clearAllBookings({ room_id: roomId });
+        toast.success(result.message || `All bookings cleared for ${room.name}`);
         fetchRooms();
       } catch (error) {
         console.error('Error clearing room bookings:', error);
@@ -378,15 +383,15 @@ const MeetingRooms = () => {
                   </div>
                 )}
 
-                {/* Show all bookings for the room */}
-                {room.bookings && room.bookings.length > 0 && (
+                {/* Show the next bookings for the room */}
+                {room.next_bookings && room.next_bookings.length > 0 && (
                   <div className="bg-blue-50 border border-blue-200 p-3 rounded-md">
                     <div className="flex items-center text-sm text-blue-800 mb-2">
                       <Clock className="mr-1 h-4 w-4" />
-                      📋 {room.bookings.length === 1 ? 'Booking' : `${room.bookings.length} Bookings`}
+                      📋 {room.booking_count === 1 ? 'Booking' : `${room.booking_count} Bookings`}
                     </div>
                     <div className="space-y-2 max-h-32 overflow-y-auto">
-                      {room.bookings.map((booking, index) => (
+                      {room.next_bookings.map((booking, index) => (
                         <div key={booking.id || index} className="text-sm bg-white p-2 rounded border">
                           <p><strong>Employee:</strong> {booking.employee_name}</p>
                           <p><strong>Time:</strong> {new Date(booking.start_time).toLocaleString()} - {new Date(booking.end_time).toLocaleString()}</p>
@@ -423,7 +428,7 @@ const MeetingRooms = () => {
                 )}
 
                 {/* Show truly vacant status */}
-                {(!room.bookings || room.bookings.length === 0) && (
+                {(!room.next_bookings || room.next_bookings.length === 0) && (
                   <div className="bg-green-50 border border-blue-200 p-3 rounded-md">
                     <div className="flex items-center text-sm text-blue-800">
                       <CheckCircle className="mr-2 h-4 w-4" />
@@ -443,14 +448,14 @@ const MeetingRooms = () => {
                   </Button>
                   
                   {/* Show clear all bookings button if there are any bookings */}
-                  {room.bookings && room.bookings.length > 0 && (
+                  {room.booking_count > 0 && (
                     <Button 
                       variant="destructive"
                       onClick={() => handleClearRoomBookings(room.id)}
                       className="flex-1"
                     >
                       <XCircle className="mr-1 h-4 w-4" />
-                      Clear All ({room.bookings.length})
+                      Clear All ({room.booking_count})
                     </Button>
                   )}
                 </div>
@@ -6,7 +6,7 @@ import {
   Clock,
   Bell
 } from "lucide-react";
-import { alertAPI } from "../services/api";
+import { alertAPI, eventAPI } from "../services/api";
 
 const UserAlerts = () => {
   const [alerts, setAlerts] = useState([]);
@@ -64,12 +64,12 @@ const UserAlerts = () => {
   useEffect(() => {
     loadActiveAlerts();
     
-    // Refresh alerts every 30 seconds to check for new ones
-    const refreshInterval = setInterval(() => {
+    // Reload whenever an alert is created, changed, deleted or expires
+    const unsubscribe = eventAPI.subscribe('alert', () => {
       loadActiveAlerts();
-    }, 30000);
+    });
 
-    return () => clearInterval(refreshInterval);
+    return () => unsubscribe();
   }, [dismissedAlerts]);
 
   // Handle alert rotation
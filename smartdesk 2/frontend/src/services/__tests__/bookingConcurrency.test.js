@@ -0,0 +1,199 @@
+import dataService from '../dataService';
+
+const ROOM_ID = 'ifc-14-001';
+const HOUR = 60 * 60 * 1000;
+
+// Tomorrow at 10:00 local time, plus `hours`
+const slot = (hours = 0) => {
+  const start = new Date();
+  start.setDate(start.getDate() + 1);
+  start.setHours(10, 0, 0, 0);
+  return {
+    start_time: new Date(start.getTime() + hours * HOUR).toISOString(),
+    end_time: new Date(start.getTime() + (hours + 1) * HOUR).toISOString()
+  };
+};
+
+const bookingRequest = (i, hours = 0) => ({
+  ...slot(hours),
+  employee_id: String(80000 + i),
+  employee_name: `Employee ${i}`,
+  purpose: `Stress ${i}`
+});
+
+// A fresh "tab": its own service instance over the shared localStorage
+// (or the singleton, reloaded from it)
+const openTab = (service = new dataService.constructor()) => {
+  service.meetingRooms = service.generateMeetingRooms();
+  service.loadBookingsFromStorage(service.meetingRooms);
+  service.indexMeetingRoomBookings();
+  return service;
+};
+
+const closeTab = (service) => {
+  clearTimeout(service.bookingSweepTimer);
+  service.bookingSweepTimer = null;
+};
+
+// Stand-in for the Web Locks API: one FIFO queue per lock name, shared
+// by every service instance like the browser shares it between tabs
+const installWebLocks = () => {
+  const queues = new Map();
+  const locks = {
+    request(name, callback) {
+      const run = (queues.get(name) || Promise.resolve()).then(() => callback());
+      queues.set(name, run.catch(() => {}));
+      return run;
+    }
+  };
+  Object.defineProperty(global.navigator, 'locks', { value: locks, configurable: true });
+  return () => delete global.navigator.locks;
+};
+
+const percentile = (values, p) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.ceil(p / 100 * sorted.length) - 1)];
+};
+
+// Fire every request at once; resolves to per-call outcomes and timings
+const fireConcurrently = async (requests) => {
+  const startedAt = performance.now();
+  const outcomes = await Promise.all(requests.map(request => request().then(
+    booking => ({ booking, ms: performance.now() - startedAt }),
+    error => ({ error, ms: performance.now() - startedAt })
+  )));
+  const elapsedMs = performance.now() - startedAt;
+  return {
+    booked: outcomes.filter(outcome => outcome.booking),
+    failed: outcomes.filter(outcome => outcome.error),
+    p99: percentile(outcomes.map(outcome => outcome.ms), 99),
+    throughput: requests.length / (elapsedMs / 1000)
+  };
+};
+
+const N = 200;
+
+describe('concurrent bookings on one slot', () => {
+  let tabs = [];
+
+  beforeEach(() => {
+    localStorage.clear();
+    tabs = [openTab(dataService)];
+  });
+
+  afterEach(() => {
+    tabs.forEach(closeTab);
+  });
+
+  test(`exactly one of ${N} parallel bookings wins within a tab`, async () => {
+    const result = await fireConcurrently(Array.from({ length: N }, (_, i) => () => dataService.bookMeetingRoom(ROOM_ID, bookingRequest(i))));
+
+    expect(result.booked).toHaveLength(1);
+    expect(result.failed).toHaveLength(N - 1);
+    result.failed.forEach(({ error }) => expect(error.message).toMatch('already booked'));
+    expect([...dataService.bookingIndex.overlapping(ROOM_ID, ...Object.values(slot()).map(Date.parse))]).toHaveLength(1);
+
+    expect(result.throughput).toBeGreaterThan(200);
+    expect(result.p99).toBeLessThan(1000);
+  });
+
+  test(`exactly one of ${N} parallel bookings wins across two tabs`, async () => {
+    const uninstall = installWebLocks();
+    try {
+      const otherTab = openTab();
+      tabs.push(otherTab);
+
+      // Each tab only knows the other's bookings if it re-reads storage
+      // under the lock before its conflict check
+
+      const result = await fireConcurrently(Array.from({ length: N }, (_, i) => () => tabs[i % 2].bookMeetingRoom(ROOM_ID, bookingRequest(i))));
+
+      expect(result.booked).toHaveLength(1);
+      expect(result.failed).toHaveLength(N - 1);
+      result.failed.forEach(({ error }) => expect(error.message).toMatch('already booked'));
+
+      // Both tabs and a freshly opened one see the single winner
+      const winner = result.booked[0].booking.id;
+      const reopened = openTab();
+      tabs.push(reopened);
+      [dataService, otherTab, reopened].forEach(tab => {
+        tab.syncMeetingRoomsFromStorage();
+        expect([...tab.bookings.keys()]).toEqual([winner]);
+      });
+
+      expect(result.throughput).toBeGreaterThan(200);
+      expect(result.p99).toBeLessThan(1000);
+    } finally {
+      uninstall();
+    }
+  });
+
+  test(`${N} parallel bookings of distinct slots all succeed`, async () => {
+    const result = await fireConcurrently(Array.from({ length: N }, (_, i) => () => dataService.bookMeetingRoom(ROOM_ID, bookingRequest(i, i))));
+
+    expect(result.failed.map(({ error }) => error.message)).toEqual([]);
+    expect(new Set(result.booked.map(({ booking }) => booking.id)).size).toBe(N);
+    expect(result.throughput).toBeGreaterThan(100);
+    expect(result.p99).toBeLessThan(2000);
+  });
+});
+
+describe('purging aged-out bookings', () => {
+  const tabs = [];
+
+  beforeEach(() => {
+    localStorage.clear();
+  });
+
+  afterEach(() => {
+    tabs.splice(0).forEach(closeTab);
+  });
+
+  test('a read drops them in memory and purges storage under the lock', async () => {
+    const uninstall = installWebLocks();
+    try {
+      const writer = openTab();
+      const reader = openTab();
+      tabs.push(writer, reader);
+
+      // Long past the 90-day history window
+      const aged = {
+        id: 'booking_aged',
+        room_id: ROOM_ID,
+        employee_id: '80001',
+        employee_name: 'Employee 1',
+        start_time: '2020-01-06T10:00:00.000Z',
+        end_time: '2020-01-06T11:00:00.000Z'
+      };
+      writer.storeBooking(aged);
+      writer.saveBookingsToStorage();
+      const agedKey = writer.bookingPartitionKey(aged);
+
+      // The writer holds the lock while the reader reads
+      let release;
+      const gate = new Promise(resolve => { release = resolve; });
+      const write = writer.withMeetingRoomsLock(async () => {
+        await gate;
+        return writer.applyBooking(ROOM_ID, bookingRequest(1));
+      });
+
+      const revision = localStorage.getItem('meetingRooms_revision');
+      expect(reader.syncMeetingRoomsFromStorage()).toBe(true);
+      expect(reader.bookings.has(aged.id)).toBe(false);
+      expect(localStorage.getItem('meetingRooms_revision')).toBe(revision);
+      expect(localStorage.getItem(agedKey)).not.toBeNull();
+
+      release();
+      const booking = await write;
+      await reader.bookingPurge;
+
+      // The purge re-read storage first, so the writer's booking survives
+      expect(localStorage.getItem(agedKey)).toBeNull();
+      const reopened = openTab();
+      tabs.push(reopened);
+      expect([...reopened.bookings.keys()]).toEqual([booking.id]);
+    } finally {
+      uninstall();
+    }
+  });
+});
@@ -0,0 +1,43 @@
+import CalendarExport from '../calendarExport';
+
+const calendar = new CalendarExport();
+const octets = (line) => new TextEncoder().encode(line).length;
+const unfold = (text) => text.replace(/\r\n /g, '');
+
+describe('CalendarExport.fold', () => {
+  test('leaves lines of up to 75 octets alone', () => {
+    const line = `SUMMARY:${'a'.repeat(67)}`;
+    expect(calendar.fold(line)).toBe(line);
+    expect(calendar.fold(line + 'b').split('\r\n')).toEqual([line, ' b']);
+  });
+
+  test.each([
+    ['Devanagari', 'SUMMARY:साप्ताहिक टीम बैठक - परियोजना समीक्षा और योजना, सभी विभागों के प्रमुखों के साथ'],
+    ['accented Latin', `DESCRIPTION:Booked by ${'José Ñúñez-Müller, '.repeat(8)}`],
+    ['astral characters', `SUMMARY:${'Launch 🚀🎉 '.repeat(12)}`]
+  ])('folds %s text by encoded length without splitting characters', (_, line) => {
+    const folded = calendar.fold(line);
+    const lines = folded.split('\r\n');
+
+    expect(lines.length).toBeGreaterThan(1);
+    lines.forEach(part => expect(octets(part)).toBeLessThanOrEqual(75));
+    lines.slice(1).forEach(part => expect(part[0]).toBe(' '));
+    // No lone surrogates, so every part encodes to valid UTF-8
+    lines.forEach(part => expect(part).not.toMatch(/[\uD800-\uDBFF](?![\uDC00-\uDFFF])|(?:^|[^\uD800-\uDBFF])[\uDC00-\uDFFF]/));
+    expect(unfold(folded)).toBe(line);
+  });
+
+  test('folds every line of an exported event', () => {
+    const text = calendar.event({
+      id: 'booking_1',
+      start_time: '2030-01-07T10:00:00.000Z',
+      end_time: '2030-01-07T11:00:00.000Z',
+      purpose: 'त्रैमासिक व्यावसायिक समीक्षा बैठक — सभी क्षेत्रीय प्रबंधकों के लिए',
+      employee_name: 'Zoë Ångström',
+      room_name: 'OVAL MEETING ROOM'
+    });
+
+    text.split('\r\n').forEach(line => expect(octets(line)).toBeLessThanOrEqual(75));
+    expect(unfold(text)).toMatch('SUMMARY:त्रैमासिक व्यावसायिक समीक्षा बैठक — सभी क्षेत्रीय प्रबंधकों के लिए\r\n');
+  });
+});
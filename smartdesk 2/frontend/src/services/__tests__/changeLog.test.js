@@ -0,0 +1,69 @@
+import ChangeLog from '../changeLog';
+import dataService from '../dataService';
+
+describe('ChangeLog', () => {
+  test('returns the latest change per id since a version', () => {
+    const log = new ChangeLog('boot1');
+    log.record('a');
+    const seen = log.version;
+    log.record('b');
+    log.record('a');
+    log.record('c', true);
+
+    expect(seen).toBe('boot1-1');
+    expect(log.since(seen)).toEqual({ full: false, changed: ['b', 'a'], deleted: ['c'] });
+    expect(log.since(log.version)).toEqual({ full: false, changed: [], deleted: [] });
+  });
+
+  test('forces a full resync for versions from another page load', () => {
+    const previousLoad = new ChangeLog('boot1');
+    previousLoad.record('a');
+    previousLoad.record('b');
+    const staleVersion = previousLoad.version;
+
+    // Same sequence numbers, different boot
+    const log = new ChangeLog('boot2');
+    log.record('x');
+    log.record('y');
+    log.record('z');
+    expect(log.since(staleVersion).full).toBe(true);
+    expect(log.since('boot2-2').full).toBe(false);
+  });
+
+  test('forces a full resync for missing, malformed and future versions', () => {
+    const log = new ChangeLog('boot1');
+    log.record('a');
+    [null, undefined, 1, '1', 'boot1-', 'boot1-x', 'boot1-1.5', 'boot1-2'].forEach(version => {
+      expect(log.since(version).full).toBe(true);
+    });
+  });
+
+  test('forces a full resync once tombstones a reader needs are dropped', () => {
+    const log = new ChangeLog('boot1');
+    const start = log.version;
+    for (let i = 0; i < 1100; i++) log.record(`id${i}`, true);
+
+    expect(log.since(start).full).toBe(true);
+    const recent = log.since('boot1-1050');
+    expect(recent.full).toBe(false);
+    expect(recent.deleted).toHaveLength(50);
+  });
+});
+
+describe('getNewsChanges', () => {
+  test('tells a version from a previous page load apart from a current one', async () => {
+    const before = await dataService.getNewsChanges(null);
+    expect(before.full).toBe(true);
+
+    const item = await dataService.createNews({ title: 'Delta', content: 'Body' });
+    const delta = await dataService.getNewsChanges(before.version);
+    expect(delta.full).toBe(false);
+    expect(delta.items.map(news => news.id)).toEqual([item.id]);
+
+    // A reader that polled before a reload has a version with a small
+    // sequence from the old boot
+    const stale = await dataService.getNewsChanges(`previousboot-${dataService.changeLogs.news.sequence}`);
+    expect(stale.full).toBe(true);
+    expect(stale.items.map(news => news.id)).toContain(item.id);
+  });
+});
@@ -0,0 +1,118 @@
+import EventStream from '../eventStream';
+
+// In-memory BroadcastChannel: every instance with the same name hears the
+// others' messages, like tabs of one origin
+class FakeBroadcastChannel {
+  static channels = new Map();
+
+  constructor(name) {
+    this.name = name;
+    this.onmessage = null;
+    this.posted = [];
+    if (!FakeBroadcastChannel.channels.has(name)) {
+      FakeBroadcastChannel.channels.set(name, new Set());
+    }
+    FakeBroadcastChannel.channels.get(name).add(this);
+  }
+
+  postMessage(data) {
+    this.posted.push(data);
+    FakeBroadcastChannel.channels.get(this.name).forEach(channel => {
+      if (channel !== this && channel.onmessage) channel.onmessage({ data: JSON.parse(JSON.stringify(data)) });
+    });
+  }
+}
+
+const flush = () => new Promise(resolve => setTimeout(resolve, 0));
+
+describe('EventStream', () => {
+  const originalChannel = global.BroadcastChannel;
+
+  beforeEach(() => {
+    FakeBroadcastChannel.channels.clear();
+    global.BroadcastChannel = FakeBroadcastChannel;
+  });
+
+  afterEach(() => {
+    global.BroadcastChannel = originalChannel;
+  });
+
+  test('delivers batches to matching subscribers only', async () => {
+    const stream = new EventStream('test');
+    const bookings = [];
+    const everything = [];
+    stream.subscribe('booking', events => bookings.push(...events));
+    stream.subscribe('*', events => everything.push(...events));
+
+    stream.publish('booking.created', { booking_id: 'b1' });
+    stream.publish('alert.created', { alert_id: 'a1' });
+    stream.publish('bookings.other');
+    await flush();
+
+    expect(bookings.map(event => event.type)).toEqual(['booking.created']);
+    expect(everything.map(event => event.seq)).toEqual([1, 2, 3]);
+  });
+
+  test('replaces an overflowing backlog with one resync', async () => {
+    const stream = new EventStream('test');
+    const batches = [];
+    stream.subscribe('alert', events => batches.push(events), { maxQueue: 3 });
+
+    for (let i = 0; i < 5; i++) stream.publish('alert.updated', { alert_id: i });
+    await flush();
+
+    expect(batches).toHaveLength(1);
+    expect(batches[0].map(event => event.type)).toEqual(['resync']);
+  });
+
+  test('relays only the configured types to other tabs', async () => {
+    const tab = new EventStream('test', { relay: ['booking'] });
+    const otherTab = new EventStream('test', { relay: ['booking'] });
+    const received = [];
+    otherTab.subscribe('*', events => received.push(...events));
+
+    tab.publish('alert.created', { alert_id: 'a1' });
+    tab.publish('news.deleted', { news_id: 'n1' });
+    tab.publish('booking.cancelled', { booking_id: 'b1' });
+    await flush();
+
+    expect(tab.channel.posted.map(event => event.type)).toEqual(['booking.cancelled']);
+    expect(received.map(event => event.type)).toEqual(['booking.cancelled']);
+  });
+
+  test('gives relayed events the receiver\'s own sequence', async () => {
+    const tab = new EventStream('test', { relay: ['booking'] });
+    const otherTab = new EventStream('test', { relay: ['booking'] });
+    const received = [];
+    otherTab.subscribe('*', events => received.push(...events));
+
+    otherTab.publish('alert.created');
+    otherTab.publish('alert.created');
+    tab.publish('booking.created', { booking_id: 'b1' });
+    otherTab.publish('booking.created', { booking_id: 'b2' });
+    await flush();
+
+    expect(received.map(event => [event.type, event.seq, event.remote_seq, event.remote])).toEqual([
+      ['alert.created', 1, undefined, undefined],
+      ['alert.created', 2, undefined, undefined],
+      ['booking.created', 3, 1, true],
+      ['booking.created', 4, undefined, undefined]
+    ]);
+  });
+
+  test('ignores relayed types it does not relay itself', async () => {
+    const tab = new EventStream('test', { relay: ['*'] });
+    const otherTab = new EventStream('test', { relay: ['booking'] });
+    const received = [];
+    otherTab.subscribe('*', events => received.push(...events));
+
+    tab.publish('alert.created');
+    await flush();
+
+    expect(received).toEqual([]);
+  });
+
+  test('does not open a channel when nothing is relayed', () => {
+    expect(new EventStream('test').channel).toBeNull();
+  });
+});
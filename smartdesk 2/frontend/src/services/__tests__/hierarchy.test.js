@@ -0,0 +1,213 @@
+import dataService from '../dataService';
+import HierarchyIndex from '../hierarchyIndex';
+
+const makeEmployees = (count) => Array.from({ length: count }, (_, i) => ({
+  id: String(10000 + i),
+  name: `Employee ${i}`,
+  department: 'IT',
+  location: 'Noida'
+}));
+
+// Load a synthetic directory straight into the service, skipping Excel
+const loadEmployees = (count) => {
+  dataService.employees = makeEmployees(count);
+  dataService.indexEmployees();
+  dataService.hierarchy = [];
+  dataService.hierarchyIndex.clear();
+  dataService.isLoaded = true;
+  return dataService.employees.map(emp => emp.id);
+};
+
+// A tree where employee i reports to employee floor((i - 1) / fanout)
+const treeRelations = (ids, fanout) => ids.slice(1).map((employeeId, i) => ({
+  employeeId,
+  reportsTo: ids[Math.floor(i / fanout)]
+}));
+
+// Reference answers from walking the flat relationship list
+const bruteAncestors = (relations, employeeId) => {
+  const parentOf = new Map(relations.map(rel => [rel.employeeId, rel.reportsTo]));
+  const chain = [];
+  for (let current = parentOf.get(employeeId); current !== undefined; current = parentOf.get(current)) {
+    chain.push(current);
+  }
+  return chain;
+};
+
+const bruteSubtree = (relations, rootId, maxDepth = null) => {
+  const found = new Map(); // employeeId -> depth
+  let level = [rootId];
+  for (let depth = 1; level.length > 0 && (maxDepth === null || depth <= maxDepth); depth++) {
+    level = relations.filter(rel => level.includes(rel.reportsTo)).map(rel => rel.employeeId);
+    level.forEach(id => found.set(id, depth));
+  }
+  return found;
+};
+
+describe('HierarchyIndex', () => {
+  const ids = makeEmployees(400).map(emp => emp.id);
+  const relations = treeRelations(ids, 3);
+  const index = new HierarchyIndex();
+  index.build(relations);
+
+  test('isAncestor and ancestors match a brute-force walk', () => {
+    ids.forEach((employeeId, i) => {
+      const chain = bruteAncestors(relations, employeeId);
+      expect(index.ancestors(employeeId)).toEqual(chain);
+      [ids[0], ids[(i * 31) % ids.length], ids[(i + 1) % ids.length]].forEach(candidate => {
+        expect(index.isAncestor(candidate, employeeId)).toBe(chain.includes(candidate));
+      });
+    });
+  });
+
+  test('subtree matches a brute-force walk at every depth', () => {
+    [ids[0], ids[1], ids[7], ids[399]].forEach(rootId => {
+      [null, 0, 1, 2, 4].forEach(maxDepth => {
+        const nodes = index.subtree(rootId, maxDepth);
+        const expected = bruteSubtree(relations, rootId, maxDepth);
+        expect(new Map(nodes.map(node => [node.employeeId, node.depth]))).toEqual(expected);
+        expect(nodes).toHaveLength(expected.size);
+        nodes.forEach(node => expect(index.parentOf.get(node.employeeId)).toBe(node.reportsTo));
+      });
+    });
+  });
+
+  test('remove detaches only the employee', () => {
+    const scratch = new HierarchyIndex();
+    scratch.build(relations);
+    expect(scratch.remove(ids[1])).toBe(true);
+    expect(scratch.remove(ids[1])).toBe(false);
+    expect(scratch.isAncestor(ids[0], ids[4])).toBe(false);
+    expect(scratch.isAncestor(ids[1], ids[4])).toBe(true);
+    expect(scratch.subtree(ids[0]).map(node => node.employeeId)).not.toContain(ids[4]);
+  });
+});
+
+describe('hierarchy validation', () => {
+  let ids;
+
+  beforeEach(async () => {
+    ids = loadEmployees(10);
+    // 0 <- 1 <- 2 <- 3
+    await dataService.createHierarchyBulk([
+      { employeeId: ids[1], reportsTo: ids[0] },
+      { employeeId: ids[2], reportsTo: ids[1] },
+      { employeeId: ids[3], reportsTo: ids[2] }
+    ]);
+  });
+
+  test('rejects self-edges', () => {
+    expect(dataService.validateHierarchyRelation({ employeeId: ids[5], reportsTo: ids[5] }))
+      .toBe('Employee cannot report to themselves');
+  });
+
+  test('rejects direct and indirect cycles', () => {
+    expect(dataService.validateHierarchyRelation({ employeeId: ids[0], reportsTo: ids[1] })).toMatch('reporting cycle');
+    expect(dataService.validateHierarchyRelation({ employeeId: ids[0], reportsTo: ids[3] })).toMatch('reporting cycle');
+    expect(dataService.validateHierarchyRelation({ employeeId: ids[4], reportsTo: ids[3] })).toBeNull();
+  });
+
+  test('rejects missing fields, unknown employees and second managers', () => {
+    expect(dataService.validateHierarchyRelation({ employeeId: ids[4] })).toMatch('required');
+    expect(dataService.validateHierarchyRelation(null)).toMatch('required');
+    expect(dataService.validateHierarchyRelation({ employeeId: 'nobody', reportsTo: ids[0] })).toMatch('not found');
+    expect(dataService.validateHierarchyRelation({ employeeId: ids[4], reportsTo: 'nobody' })).toMatch('not found');
+    expect(dataService.validateHierarchyRelation({ employeeId: ids[2], reportsTo: ids[5] })).toMatch('already has a reporting manager');
+  });
+
+  test('createHierarchy refuses a cycle', async () => {
+    await expect(dataService.createHierarchy({ employeeId: ids[0], reportsTo: ids[2] })).rejects.toThrow('reporting cycle');
+    expect(dataService.hierarchy).toHaveLength(3);
+  });
+
+  test('bulk import is all-or-nothing, including cycles within the batch', async () => {
+    let failure = null;
+    try {
+      await dataService.createHierarchyBulk([
+        { employeeId: ids[5], reportsTo: ids[4] },
+        { employeeId: ids[6], reportsTo: ids[5] },
+        { employeeId: ids[4], reportsTo: ids[6] }
+      ]);
+    } catch (error) {
+      failure = error;
+    }
+
+    expect(failure.message).toMatch('nothing was imported');
+    expect(failure.errors).toHaveLength(1);
+    expect(failure.errors[0]).toMatchObject({ index: 2, employeeId: ids[4] });
+    expect(failure.errors[0].error).toMatch('reporting cycle');
+    expect(dataService.hierarchy).toHaveLength(3);
+    expect(dataService.hierarchyIndex.hasManager(ids[5])).toBe(false);
+    expect(dataService.hierarchyIndex.hasManager(ids[6])).toBe(false);
+  });
+});
+
+describe('bulk hierarchy import', () => {
+  test('imports 20k relationships quickly and indexes them', async () => {
+    const ids = loadEmployees(20001);
+    const relations = treeRelations(ids, 5);
+
+    const start = performance.now();
+    const result = await dataService.createHierarchyBulk(relations);
+    const elapsedMs = performance.now() - start;
+
+    expect(result.created).toBe(20000);
+    expect(dataService.hierarchy).toHaveLength(20000);
+    expect(dataService.hierarchyIndex.subtree(ids[0])).toHaveLength(20000);
+    expect(dataService.hierarchyIndex.ancestors(ids[20000])).toEqual(bruteAncestors(relations, ids[20000]));
+    expect(elapsedMs).toBeLessThan(1000);
+  });
+});
+
+describe('Excel-derived hierarchy', () => {
+  let ids;
+
+  beforeEach(() => {
+    ids = loadEmployees(5);
+    // 1 and 2 report to 0 in the workbook, 3 to 1
+    dataService.employees[1].reportingId = ids[0];
+    dataService.employees[2].reportingId = `${ids[0]}.0`;
+    dataService.employees[3].reportingManager = `Employee 1(${ids[1]})`;
+    dataService.deriveHierarchyFromEmployees();
+  });
+
+  test('derives one edge per resolvable manager', () => {
+    expect(dataService.hierarchy.map(rel => [rel.employeeId, rel.reportsTo, rel.source])).toEqual([
+      [ids[1], ids[0], 'excel'],
+      [ids[2], ids[0], 'excel'],
+      [ids[3], ids[1], 'excel']
+    ]);
+  });
+
+  test('a manual relationship replaces the derived one', async () => {
+    const relation = await dataService.createHierarchy({ employeeId: ids[2], reportsTo: ids[4] });
+
+    expect(dataService.hierarchy.filter(rel => rel.employeeId === ids[2])).toEqual([relation]);
+    expect(dataService.hierarchyIndex.ancestors(ids[2])).toEqual([ids[4]]);
+    expect(dataService.hierarchyIndex.hasDerivedManager(ids[2])).toBe(false);
+    await expect(dataService.createHierarchy({ employeeId: ids[2], reportsTo: ids[0] })).rejects.toThrow('already has a reporting manager');
+
+    // and survives the next derivation
+    dataService.deriveHierarchyFromEmployees();
+    expect(dataService.hierarchy.filter(rel => rel.employeeId === ids[2])).toEqual([relation]);
+  });
+
+  test('overrides still may not form a cycle', async () => {
+    await expect(dataService.createHierarchy({ employeeId: ids[1], reportsTo: ids[3] })).rejects.toThrow('reporting cycle');
+    expect(dataService.hierarchyIndex.ancestors(ids[1])).toEqual([ids[0]]);
+  });
+
+  test('a failed bulk import restores the derived lines it replaced', async () => {
+    await expect(dataService.createHierarchyBulk([
+      { employeeId: ids[1], reportsTo: ids[4] },
+      { employeeId: ids[4], reportsTo: ids[4] }
+    ])).rejects.toThrow('nothing was imported');
+    expect(dataService.hierarchyIndex.ancestors(ids[3])).toEqual([ids[1], ids[0]]);
+    expect(dataService.hierarchyIndex.hasDerivedManager(ids[1])).toBe(true);
+
+    const result = await dataService.createHierarchyBulk([{ employeeId: ids[1], reportsTo: ids[4] }]);
+    expect(result.replaced).toBe(1);
+    expect(dataService.hierarchy).toHaveLength(3);
+    expect(dataService.hierarchyIndex.ancestors(ids[3])).toEqual([ids[1], ids[4]]);
+  });
+});
@@ -0,0 +1,190 @@
+import dataService from '../dataService';
+
+const HOUR = 60 * 60 * 1000;
+
+// Tomorrow at 09:00 local time, plus `hours`
+const tomorrowAt = (hours) => {
+  const start = new Date();
+  start.setDate(start.getDate() + 1);
+  start.setHours(9, 0, 0, 0);
+  return start.getTime() + hours * HOUR;
+};
+
+const book = (roomId, hours, extra = {}) => dataService.bookMeetingRoom(roomId, {
+  start_time: new Date(tomorrowAt(hours)).toISOString(),
+  end_time: new Date(tomorrowAt(hours + 1)).toISOString(),
+  employee_id: '80001',
+  employee_name: 'Employee 1',
+  purpose: 'Test',
+  ...extra
+});
+
+beforeEach(() => {
+  localStorage.clear();
+  dataService.isLoaded = true;
+  dataService.meetingRooms = dataService.generateMeetingRooms();
+  dataService.loadBookingsFromStorage(dataService.meetingRooms);
+  dataService.indexMeetingRoomBookings();
+});
+
+afterEach(() => {
+  clearTimeout(dataService.bookingSweepTimer);
+  dataService.bookingSweepTimer = null;
+});
+
+describe('clearAllMeetingRoomBookings', () => {
+  test('clears everything and reports the count and scope', async () => {
+    await book('ifc-14-001', 0);
+    await book('ifc-14-001', 2);
+    await book('noida-1-001', 0);
+
+    const result = await dataService.clearAllMeetingRoomBookings();
+
+    expect(result.message).toBe('3 bookings cleared from all rooms');
+    expect(result.cleared_count).toBe(3);
+    expect(result.rooms_updated).toBe(dataService.meetingRooms.length);
+    expect(result.rooms_changed).toBe(2);
+    expect(dataService.bookings.size).toBe(0);
+  });
+
+  test('reports only what a filtered clear removed', async () => {
+    const kept = await book('ifc-14-001', 0);
+    await book('noida-1-001', 0);
+    await book('noida-1-001', 3);
+
+    const byRoom = await dataService.clearAllMeetingRoomBookings({ room_id: 'noida-1-001' });
+    expect(byRoom.message).toBe('2 bookings cleared from Noida Conference Room');
+    expect(byRoom.rooms_updated).toBe(1);
+    expect(byRoom.cleared_count).toBe(2);
+    expect([...dataService.bookings.keys()]).toEqual([kept.id]);
+
+    const byFloor = await dataService.clearAllMeetingRoomBookings({ location: 'IFC', floor: '12th Floor' });
+    expect(byFloor.message).toBe('No bookings to clear in rooms at IFC, 12th Floor');
+    expect(byFloor.cleared_count).toBe(0);
+    expect(byFloor.rooms_changed).toBe(0);
+  });
+
+  test('removes a series whose first occurrence is already running', async () => {
+    const now = Date.now();
+    const series = {
+      id: 'recurring_running',
+      room_id: 'ifc-14-001',
+      employee_id: '80001',
+      employee_name: 'Employee 1',
+      start_time: new Date(now - HOUR / 2).toISOString(),
+      end_time: new Date(now + HOUR / 2).toISOString(),
+      recurrence: { frequency: 'daily', count: 3 }
+    };
+    dataService.recurringBookings.set(series.id, series);
+    dataService.indexRecurringBooking(series);
+    dataService.saveBookingsToStorage();
+
+    const result = await dataService.clearAllMeetingRoomBookings();
+
+    expect(result.cleared_booking_ids).toEqual([series.id]);
+    expect(dataService.recurringBookings.size).toBe(0);
+    expect(JSON.parse(localStorage.getItem('meetingRecurring_data'))).toEqual([]);
+  });
+
+  test('clears only bookings overlapping the window', async () => {
+    const early = await book('ifc-14-001', 0);
+    await book('ifc-14-001', 2);
+    const from = new Date(tomorrowAt(1)).toISOString();
+
+    const result = await dataService.clearAllMeetingRoomBookings({ room_id: 'ifc-14-001', from });
+    expect(result.cleared_count).toBe(1);
+    expect(result.scope).toBe(`OVAL MEETING ROOM from ${new Date(from).toLocaleString()}`);
+    expect([...dataService.bookings.keys()]).toEqual([early.id]);
+  });
+});
+
+describe('getBookingHistory', () => {
+  const ROOM_ID = 'ifc-14-002';
+  const now = Math.floor(Date.now() / HOUR) * HOUR;
+
+  // Ended bookings go straight into the collection; bookMeetingRoom
+  // refuses past times
+  const addEnded = (id, hoursAgo, employeeId = '80001') => {
+    const booking = {
+      id,
+      room_id: ROOM_ID,
+      employee_id: employeeId,
+      employee_name: `Employee ${employeeId}`,
+      start_time: new Date(now - hoursAgo * HOUR).toISOString(),
+      end_time: new Date(now - (hoursAgo - 1) * HOUR).toISOString()
+    };
+    dataService.storeBooking(booking);
+    dataService.indexBooking(booking);
+    return booking;
+  };
+
+  const pageThrough = async (params, between = () => {}) => {
+    const ids = [];
+    let cursor = null;
+    do {
+      const page = await dataService.getBookingHistory({ ...params, limit: 2, cursor });
+      ids.push(...page.items.map(booking => booking.id));
+      cursor = page.next_cursor;
+      between(page);
+    } while (cursor);
+    return ids;
+  };
+
+  let expected;
+
+  beforeEach(() => {
+    // Three bookings share a start; ids are added out of order on purpose
+    addEnded('b_late', 2);
+    addEnded('b_tie_c', 5, '80002');
+    addEnded('b_tie_a', 5, '80001');
+    addEnded('b_tie_b', 5, '80001');
+    addEnded('b_early', 9);
+    addEnded('b_earliest', 12);
+    dataService.saveBookingsToStorage();
+    // newest first, ties by id descending
+    expected = ['b_late', 'b_tie_c', 'b_tie_b', 'b_tie_a', 'b_early', 'b_earliest'];
+  });
+
+  test('pages newest first with a stable order for equal starts', async () => {
+    expect(await pageThrough({ room_id: ROOM_ID })).toEqual(expected);
+  });
+
+  test('keeps its place when the index is rebuilt between pages', async () => {
+    const ids = await pageThrough({ room_id: ROOM_ID }, () => {
+      // e.g. syncMeetingRoomsFromStorage after another tab wrote
+      dataService.loadBookingsFromStorage(dataService.meetingRooms);
+      dataService.indexMeetingRoomBookings();
+    });
+    expect(ids).toEqual(expected);
+  });
+
+  test('continues past a cursor booking that was deleted', async () => {
+    const first = await dataService.getBookingHistory({ room_id: ROOM_ID, limit: 3 });
+    expect(first.items.map(booking => booking.id)).toEqual(['b_late', 'b_tie_c', 'b_tie_b']);
+
+    dataService.dropBooking(dataService.bookings.get('b_tie_b'));
+    const second = await dataService.getBookingHistory({ room_id: ROOM_ID, limit: 3, cursor: first.next_cursor });
+    expect(second.items.map(booking => booking.id)).toEqual(['b_tie_a', 'b_early', 'b_earliest']);
+  });
+
+  test('pages an employee\'s overlapping bookings the same way', async () => {
+    expect(await pageThrough({ employee_id: '80001' })).toEqual(['b_late', 'b_tie_b', 'b_tie_a', 'b_early', 'b_earliest']);
+  });
+});
+
+describe('per-employee booking index', () => {
+  test('history reads do not add entries for unknown keys', async () => {
+    const page = await dataService.getBookingHistory({ employee_id: 'nobody' });
+    expect(page.items).toEqual([]);
+    expect(dataService.employeeBookingIndex.rooms.has('nobody')).toBe(false);
+  });
+
+  test('refuses queries that assume non-overlapping bookings', () => {
+    const index = dataService.employeeBookingIndex;
+    expect(() => index.findConflict('80001', 0, 1)).toThrow('non-overlapping');
+    expect(() => index.countEndingAfter('80001', 0)).toThrow('non-overlapping');
+    expect(() => index.removeOverlapping('80001', 0, 1)).toThrow('non-overlapping');
+    expect(() => [...index.overlapping('80001', 0, 1)]).toThrow('non-overlapping');
+    expect(() => [...index.startingBetween('80001', 0, 1)]).not.toThrow();
+  });
+});
@@ -0,0 +1,70 @@
+/**
+ * @jest-environment node
+ */
+// Node provides the Blob streams and DecompressionStream that jsdom lacks
+import fs from 'fs';
+import path from 'path';
+import PdfTextExtractor from '../pdfText';
+
+const POLICIES = path.join(__dirname, '../../../public/company policies');
+
+const readPdf = (file) => {
+  const bytes = fs.readFileSync(path.join(POLICIES, file));
+  return bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.length);
+};
+
+const extract = (file) => new PdfTextExtractor().extract(readPdf(file));
+
+describe('PdfTextExtractor', () => {
+  test.each([
+    ['Working Hours & Attendance Policy.pdf', 2, 'Policy No: SW-HR-002-Version 3'],
+    ['_11_11_70bde4e9a0a04aed_Business Hours Attendance Policy.pdf', 5, 'Business Hours & Attendance Policy'],
+    ['_12_39_b356500c83384d2d_Sexual Harassment At Work Redressal Policy_26-Apr-22.pdf', 7, 'Sexual Harassment Redressal Policy'],
+    ['_13_55_00673d13502c42da_Dress code policy.pdf', 3, 'HR-04-21'],
+    ['_14_19_2fe9bd4b1c514d00_Employee referral policy.pdf', 3, 'HR-07-21'],
+    ['_14_33_50e319284d7e4fe4_Leave Policy (Revised).pdf', 5, 'Leave Policy'],
+    ['_15_9_02985794b8584650_Local Conveyance policy.pdf', 2, 'HR-03-21'],
+    ['_16_4_3edd02c8f36f429f_Whistle Blower Policy.pdf', 4, 'This policy is applicable to all employees'],
+    ['_23_44_6eca6e909cee4aa7_Tour Travel Policy.pdf', 7, 'Policy No.:  SW-HR/0010'],
+    ['_38_0_62d66a9aaaf645cc_Meal and Conveyance for Employees Working at Night on Sites.pdf', 1, 'Objective: To provide Meals and Transportation'],
+    ['Microsoft Word - Flexible Work Schedule.pdf', 2, 'Smart World Flexible Work Schedule Policy'],
+    ['List of Holidays -2025.xlsx.pdf', 1, 'Independence Day 15th August,2025']
+  ])('%s', async (file, pageCount, phrase) => {
+    const pages = await extract(file);
+
+    expect(pages).toHaveLength(pageCount);
+    pages.forEach(page => expect(page.trim().length).toBeGreaterThan(0));
+    expect(pages.join('\n')).toMatch(phrase);
+    // Nothing undecoded leaks through as control characters
+    expect(pages.join('\n')).not.toMatch(/[\u0000-\u0008\u000e-\u001f]/);
+  });
+
+  test('keeps text in reading order with line and paragraph breaks', async () => {
+    const [page] = await extract('List of Holidays -2025.xlsx.pdf');
+
+    expect(page.startsWith('S.no Holiday List Date Day\n\n1 New Year Day 01st January,2025 Wednesday')).toBe(true);
+    const christmas = page.indexOf('Christmas Day 25th December,2025 Thursday');
+    expect(christmas).toBeGreaterThan(page.indexOf('Diwali 21st October,2025 Tuesday'));
+  });
+
+  test('decodes text through font encodings and ToUnicode maps', async () => {
+    const pages = await extract('Microsoft Word - Flexible Work Schedule.pdf');
+
+    expect(pages[0]).toMatch('The ‘Flexible Work Schedule’ intends to');
+    expect(pages[0]).toMatch('Flexible Work Schedule – How does it work?');
+    expect(pages[1]).toMatch('0.5 day leave on every 4.5 hours');
+  });
+
+  test('the revised attendance PDF has the same text as the working hours policy', async () => {
+    const current = await extract('Working Hours & Attendance Policy.pdf');
+    const revised = await extract('_36_12_f19af68b04f849ee_Revised Attendance Policy w.e.f 21st May 25.pdf');
+
+    expect(revised).toEqual(current);
+  });
+
+  test('returns no pages for input that is not a PDF', async () => {
+    const bytes = new TextEncoder().encode('not a pdf at all');
+
+    await expect(new PdfTextExtractor().extract(bytes.buffer)).resolves.toEqual([]);
+  });
+});
@@ -0,0 +1,83 @@
+import PrefixIndex from '../prefixIndex';
+
+const FIELDS = {
+  name: emp => emp.name,
+  id: emp => emp.id,
+  department: emp => emp.department
+};
+
+const FIRST_NAMES = ['Aarav', 'Rahul', 'Priya', 'Anita', 'Vikram', 'Sneha', 'Rohit', 'Kavya', 'Arjun', 'Meera'];
+const DEPARTMENTS = ['IT', 'HR', 'Finance', 'Sales', 'Operations'];
+
+const makeEmployees = (count) => Array.from({ length: count }, (_, i) => ({
+  id: String(80000 + i),
+  name: `${FIRST_NAMES[i % FIRST_NAMES.length]} ${String.fromCharCode(65 + (i % 26))}${i}`,
+  department: DEPARTMENTS[i % DEPARTMENTS.length]
+}));
+
+// What getEmployees() did before the index: startsWith() on every record
+const scan = (employees, prefix, fields = Object.keys(FIELDS)) => {
+  const search = prefix.toLowerCase();
+  return new Set(employees
+    .filter(emp => fields.some(field => String(FIELDS[field](emp)).toLowerCase().startsWith(search)))
+    .map(emp => emp.id));
+};
+
+const PREFIXES = ['ra', 'Priya', 'priya s', '8001', '80000', 'it', 'fin', 'zz', 'a'];
+
+// Average milliseconds per call of fn over `rounds` calls
+const timePerCall = (rounds, fn) => {
+  const start = performance.now();
+  for (let i = 0; i < rounds; i++) fn(i);
+  return (performance.now() - start) / rounds;
+};
+
+describe.each([10000, 100000])('PrefixIndex with %i employees', (count) => {
+  const employees = makeEmployees(count);
+  let index;
+
+  beforeEach(() => {
+    index = new PrefixIndex(FIELDS);
+    index.build(employees);
+  });
+
+  test('lookup returns the same ids as a full scan', () => {
+    PREFIXES.forEach(prefix => {
+      expect(index.lookup(prefix)).toEqual(scan(employees, prefix));
+      expect(index.lookup(prefix, ['name'])).toEqual(scan(employees, prefix, ['name']));
+    });
+  });
+
+  test('selective lookups stay under 1ms', () => {
+    const ids = employees.map(emp => emp.id);
+    const perLookup = timePerCall(2000, i => index.lookup(ids[(i * 7919) % count]));
+    expect(perLookup).toBeLessThan(1);
+  });
+
+  test('upsert and remove keep lookups correct', () => {
+    const renamed = { ...employees[5], name: 'Zubin Renamed' };
+    index.upsert(renamed);
+    expect(index.lookup('zubin')).toEqual(new Set([renamed.id]));
+    expect(index.lookup(employees[5].name).has(renamed.id)).toBe(false);
+
+    const added = { id: '99999999', name: 'Yash New', department: 'Legal' };
+    index.upsert(added);
+    expect(index.lookup('legal')).toEqual(new Set([added.id]));
+
+    index.remove(added.id);
+    index.remove(renamed.id);
+    expect(index.lookup('legal').size).toBe(0);
+    expect(index.lookup('zubin').size).toBe(0);
+    expect(index.lookup(renamed.id).size).toBe(0);
+
+    index.remove('not-indexed');
+    expect(index.lookup('ra')).toEqual(scan(employees.filter(emp => emp.id !== renamed.id), 'ra'));
+  });
+
+  test('upsert and remove stay under 5ms each', () => {
+    const perUpsert = timePerCall(200, i => index.upsert({ ...employees[i], name: `Updated ${i}` }));
+    const perRemove = timePerCall(200, i => index.remove(employees[i].id));
+    expect(perUpsert).toBeLessThan(5);
+    expect(perRemove).toBeLessThan(5);
+  });
+});
@@ -0,0 +1,194 @@
+import RecurrenceRule from '../recurrence';
+import BookingIndex from '../bookingIndex';
+
+const HOUR = 60 * 60 * 1000;
+const DAY = 24 * HOUR;
+
+// Monday 7 January 2030, 10:00 local time, plus `days` calendar days
+const MONDAY = 1;
+const localDay = (days, hour = 10, minute = 0) => new Date(2030, 0, 7 + days, hour, minute).getTime();
+
+let sequence = 0;
+const rule = (recurrence, { day = 0, hour = 10, hours = 1, exceptions = [] } = {}) => new RecurrenceRule({
+  id: `recurring_${++sequence}`,
+  start_time: new Date(localDay(day, hour)).toISOString(),
+  end_time: new Date(localDay(day, hour) + hours * HOUR).toISOString(),
+  recurrence,
+  exceptions: exceptions.map(exceptionDay => new Date(localDay(exceptionDay, hour)).toISOString())
+});
+
+const startDays = (occurrences) => [...occurrences].map(occurrence => Math.round((occurrence.start - localDay(0)) / DAY));
+
+describe('RecurrenceRule occurrences', () => {
+  test('daily and weekly steps with an interval', () => {
+    expect(startDays(rule({ frequency: 'daily', interval: 2, count: 4 }).occurrences())).toEqual([0, 2, 4, 6]);
+    expect(startDays(rule({ frequency: 'weekly', interval: 2, count: 3 }).occurrences())).toEqual([0, 14, 28]);
+  });
+
+  test('weekly days_of_week start from the booked day', () => {
+    const occurrences = startDays(rule({ frequency: 'weekly', days_of_week: [5, MONDAY, 3], count: 5 }).occurrences());
+    expect(occurrences).toEqual([0, 2, 4, 7, 9]);
+  });
+
+  test('weekly days_of_week follow calendar weeks from a mid-week start', () => {
+    // Wednesday start, every other week on Monday and Wednesday: the
+    // Monday of the first week is before the booking, so it is skipped
+    const series = rule({ frequency: 'weekly', interval: 2, days_of_week: [MONDAY, 3], count: 5 }, { day: 2 });
+    expect(startDays(series.occurrences())).toEqual([2, 14, 16, 28, 30]);
+    expect(series.lastEnd).toBe(localDay(30) + HOUR);
+
+    // Saturday start with Sunday as the other day: weeks run Sunday to Saturday
+    expect(startDays(rule({ frequency: 'weekly', days_of_week: [0, 6], count: 5 }, { day: 5 }).occurrences())).toEqual([5, 6, 12, 13, 19]);
+
+    const all = [...series.occurrences()];
+    expect([...series.occurrences(localDay(15), localDay(29))]).toEqual(all.filter(occurrence => occurrence.end > localDay(15) && occurrence.start < localDay(29)));
+  });
+
+  test('count and until both bound the series, whichever ends first', () => {
+    expect(startDays(rule({ frequency: 'daily', count: 3 }).occurrences())).toEqual([0, 1, 2]);
+    expect(startDays(rule({ frequency: 'daily', until: new Date(localDay(3)).toISOString() }).occurrences())).toEqual([0, 1, 2, 3]);
+    expect(startDays(rule({ frequency: 'daily', count: 10, until: new Date(localDay(2, 12)).toISOString() }).occurrences())).toEqual([0, 1, 2]);
+    expect(startDays(rule({ frequency: 'daily', count: 2, until: new Date(localDay(9)).toISOString() }).occurrences())).toEqual([0, 1]);
+
+    expect(rule({ frequency: 'daily', count: 3 }).lastEnd).toBe(localDay(2) + HOUR);
+    expect(rule({ frequency: 'weekly', days_of_week: [MONDAY, 3], count: 3 }).lastEnd).toBe(localDay(7) + HOUR);
+    expect(rule({ frequency: 'daily' }).lastEnd).toBe(Infinity);
+  });
+
+  test('exceptions are skipped but do not shorten a counted series', () => {
+    const series = rule({ frequency: 'daily', count: 4 }, { exceptions: [1, 2] });
+    expect(startDays(series.occurrences())).toEqual([0, 3]);
+    expect(series.occurrenceIn(localDay(1), localDay(3))).toBeNull();
+    expect(series.occurrenceIn(localDay(1), localDay(3, 10, 30)).start).toBe(localDay(3));
+  });
+
+  test('windowed expansion matches the full expansion', () => {
+    const series = rule({ frequency: 'weekly', interval: 3, days_of_week: [MONDAY, 4, 6], count: 40 }, { exceptions: [21] });
+    const all = [...series.occurrences()];
+    const from = localDay(100, 10, 30);
+    const to = localDay(200);
+    expect([...series.occurrences(from, to)]).toEqual(all.filter(occurrence => occurrence.end > from && occurrence.start < to));
+  });
+
+  test('occurrences keep their wall-clock time across DST changes', () => {
+    // Every local calendar day for a year, so any DST switch of the
+    // current time zone is crossed
+    const occurrences = [...rule({ frequency: 'daily', count: 366 }, { hour: 9, hours: 2 }).occurrences()];
+    occurrences.forEach((occurrence, i) => {
+      expect(occurrence.start).toBe(localDay(i, 9));
+      expect(new Date(occurrence.start).getHours()).toBe(9);
+      expect(occurrence.end - occurrence.start).toBe(2 * HOUR);
+    });
+
+    // Jumping into the window lands on the same occurrences
+    const series = rule({ frequency: 'weekly' }, { hour: 9 });
+    const from = localDay(7 * 30, 0);
+    expect(series.occurrenceIn(from, from + 7 * DAY).start).toBe(localDay(7 * 30, 9));
+  });
+
+  test('occurrence ids round-trip', () => {
+    const series = rule({ frequency: 'daily', count: 1 });
+    const [occurrence] = series.occurrences();
+    expect(RecurrenceRule.parseOccurrenceId(occurrence.id)).toEqual({ ruleId: series.id, start: occurrence.start });
+    expect(RecurrenceRule.parseOccurrenceId('booking_1')).toBeNull();
+  });
+});
+
+describe('RecurrenceRule.validate', () => {
+  const validate = (recurrence, { day = 0, hours = 1 } = {}) => () =>
+    RecurrenceRule.validate(recurrence, localDay(day), localDay(day) + hours * HOUR);
+
+  test('accepts well-formed rules', () => {
+    expect(validate({ frequency: 'daily', count: 5 })).not.toThrow();
+    expect(validate({ frequency: 'weekly', days_of_week: [MONDAY, 3], until: new Date(localDay(30)).toISOString() })).not.toThrow();
+  });
+
+  test('rejects days_of_week that leave out the booked day', () => {
+    expect(validate({ frequency: 'weekly', days_of_week: [2, 4] })).toThrow('must include the weekday of the first booking');
+  });
+
+  test('rejects malformed rules', () => {
+    expect(validate({ frequency: 'monthly' })).toThrow('frequency');
+    expect(validate({ frequency: 'daily', interval: 0 })).toThrow('interval');
+    expect(validate({ frequency: 'daily', days_of_week: [MONDAY] })).toThrow('only supported for weekly');
+    expect(validate({ frequency: 'weekly', days_of_week: [7] })).toThrow('0 (Sunday) to 6');
+    expect(validate({ frequency: 'daily', count: 0 })).toThrow('count');
+    expect(validate({ frequency: 'daily', until: new Date(localDay(-1)).toISOString() })).toThrow('end date');
+  });
+
+  test('rejects occurrences that would overlap each other', () => {
+    expect(validate({ frequency: 'daily' }, { hours: 25 })).toThrow('longer than the gap');
+    expect(validate({ frequency: 'weekly', days_of_week: [MONDAY, 2] }, { hours: 25 })).toThrow('longer than the gap');
+    expect(validate({ frequency: 'weekly', days_of_week: [MONDAY, 3] }, { hours: 25 })).not.toThrow();
+    // Wednesday start: the next Monday is in the off week, the one after that is 2 days before a Wednesday
+    expect(validate({ frequency: 'weekly', interval: 2, days_of_week: [MONDAY, 3] }, { day: 2, hours: 49 })).toThrow('longer than the gap');
+  });
+});
+
+describe('RecurrenceRule.firstOverlapWith', () => {
+  test('finds the first clash of different periods via their lcm', () => {
+    // Days 0, 2, 4, ... against 1, 4, 7, ...
+    const clash = rule({ frequency: 'daily', interval: 2 }).firstOverlapWith(rule({ frequency: 'daily', interval: 3 }, { day: 1 }));
+    expect(clash.start).toBe(localDay(4));
+  });
+
+  test('terminates with null for open-ended rules that never meet', () => {
+    const evenDays = rule({ frequency: 'daily', interval: 2 });
+    expect(evenDays.firstOverlapWith(rule({ frequency: 'daily', interval: 2 }, { day: 1 }))).toBeNull();
+    expect(evenDays.firstOverlapWith(rule({ frequency: 'daily', interval: 4 }, { hour: 11 }))).toBeNull();
+  });
+
+  test('skips the off weeks of a mid-week start', () => {
+    // Days 2, 14, 16, 28, ... against 7, 21, 35, ...
+    const series = rule({ frequency: 'weekly', interval: 2, days_of_week: [MONDAY, 3] }, { day: 2 });
+    expect(series.firstOverlapWith(rule({ frequency: 'weekly', interval: 2 }, { day: 7 }))).toBeNull();
+    expect(series.firstOverlapWith(rule({ frequency: 'weekly', interval: 2 }, { day: 14 })).start).toBe(localDay(14));
+  });
+
+  test('detects partial overlaps of the time slots', () => {
+    const clash = rule({ frequency: 'daily' }, { hours: 2 }).firstOverlapWith(rule({ frequency: 'weekly' }, { day: 3, hour: 11 }));
+    expect(clash.start).toBe(localDay(3));
+  });
+
+  test('looks past exceptions for a later clash', () => {
+    const weekly = rule({ frequency: 'weekly' }, { exceptions: [0, 7, 14, 21, 28, 35] });
+    const clash = weekly.firstOverlapWith(rule({ frequency: 'weekly', interval: 1 }));
+    expect(clash.start).toBe(localDay(42));
+  });
+
+  test('stops at the end of either series', () => {
+    const everyFive = rule({ frequency: 'daily', interval: 5 }, { day: 3 });
+    expect(rule({ frequency: 'daily', count: 3 }).firstOverlapWith(everyFive)).toBeNull();
+    expect(rule({ frequency: 'daily', until: new Date(localDay(2)).toISOString() }).firstOverlapWith(everyFive)).toBeNull();
+    expect(rule({ frequency: 'daily', count: 4 }).firstOverlapWith(everyFive).start).toBe(localDay(3));
+    expect(rule({ frequency: 'daily', count: 4 }, { exceptions: [3] }).firstOverlapWith(everyFive)).toBeNull();
+  });
+});
+
+describe('BookingIndex.findRuleConflict', () => {
+  const single = (id, day, hour, hours = 1) => ({
+    id,
+    room_id: 'room',
+    start_time: new Date(localDay(day, hour)).toISOString(),
+    end_time: new Date(localDay(day, hour) + hours * HOUR).toISOString()
+  });
+
+  test('checks every occurrence against single bookings', () => {
+    const index = new BookingIndex();
+    index.build([single('b1', 9, 10, 0.5), single('b2', 3, 12)]);
+
+    expect(index.findRuleConflict('room', rule({ frequency: 'daily', count: 10 })).id).toBe('b1');
+    expect(index.findRuleConflict('room', rule({ frequency: 'daily', count: 9 }))).toBeNull();
+    expect(index.findRuleConflict('room', rule({ frequency: 'daily', count: 10 }, { exceptions: [9] }))).toBeNull();
+  });
+
+  test('checks the new rule against the room\'s other rules', () => {
+    const index = new BookingIndex();
+    const existing = { id: 'series', room_id: 'room', ...single('series', 1, 10), recurrence: { frequency: 'weekly', days_of_week: [2, 5] } };
+    index.build([], [existing]);
+
+    // Tuesdays and Fridays (days 1, 4, 8, 11, 15, ...) against every third day
+    expect(index.findRuleConflict('room', rule({ frequency: 'daily', interval: 3 })).start).toBe(localDay(15));
+    expect(index.findRuleConflict('room', rule({ frequency: 'weekly', days_of_week: [MONDAY, 3] }))).toBeNull();
+  });
+});
@@ -0,0 +1,110 @@
+import SearchIndex, { stem, tokenize } from '../searchIndex';
+
+describe('stem', () => {
+  test.each([
+    ['policies', 'policy'],
+    ['booking', 'book'],
+    ['booked', 'book'],
+    ['classes', 'class'],
+    ['hopping', 'hop'],
+    ['travelling', 'travel'],
+    ['traveling', 'travel'],
+    ['travel', 'travel'],
+    ['cancelled', 'cancel'],
+    ['cancel', 'cancel'],
+    ['calling', 'cal'],
+    ['call', 'cal'],
+    ['status', 'status'],
+    ['2025', '2025'],
+    ['bus', 'bus']
+  ])('%s', (word, expected) => {
+    expect(stem(word)).toBe(expected);
+  });
+});
+
+describe('tokenize', () => {
+  test('lowercases, splits on non-alphanumerics and drops stop words', () => {
+    expect(tokenize('The Travelling-Allowance for 2025 is in the POLICY')).toEqual(['travel', 'allowance', '2025', 'policy']);
+    expect(tokenize(null)).toEqual([]);
+    expect(tokenize(42)).toEqual(['42']);
+  });
+});
+
+describe('SearchIndex', () => {
+  let index;
+
+  beforeEach(() => {
+    index = new SearchIndex();
+    index.add('policy:travel', {
+      type: 'policy',
+      id: 'travel',
+      title: 'Tour & Travel Policy',
+      text: 'Employees travelling on tour are entitled to hotel stay and daily allowance.'
+    });
+    index.add('policy:leave', {
+      type: 'policy',
+      id: 'leave',
+      title: 'Leave Policy',
+      text: 'Earned leave accrues monthly. Leave while travelling abroad needs approval.'
+    });
+    index.add('knowledge:hotel', {
+      type: 'knowledge',
+      id: 'hotel',
+      title: 'Booking a hotel',
+      text: 'Use the travel desk to book hotels. ' + 'Filler text about the office. '.repeat(20)
+    });
+    index.add('news:party', { type: 'news', id: 'party', title: 'Annual party', text: 'Join us on Friday.' });
+  });
+
+  const keys = (query, options) => index.search(query, options).map(result => result.key);
+
+  test('finds base words in documents using inflected forms', () => {
+    // "travelling" in the Tour & Travel policy matches "travel"
+    expect(keys('travel').sort()).toEqual(['knowledge:hotel', 'policy:leave', 'policy:travel']);
+    expect(keys('travel')[0]).toBe('policy:travel');
+    expect(keys('hotels').sort()).toEqual(['knowledge:hotel', 'policy:travel']);
+  });
+
+  test('ranks title matches above body matches', () => {
+    expect(keys('leave')[0]).toBe('policy:leave');
+    expect(keys('party')).toEqual(['news:party']);
+  });
+
+  test('weights rare terms above common ones', () => {
+    // "travel" is in three documents, "allowance" in one
+    expect(keys('travel allowance')[0]).toBe('policy:travel');
+    expect(keys('approval travelling')[0]).toBe('policy:leave');
+  });
+
+  test('normalizes for document length', () => {
+    const scores = index.score('travel');
+    expect(scores.get('policy:leave')).toBeLessThan(scores.get('policy:travel'));
+  });
+
+  test('filters by type and limits results', () => {
+    expect(keys('travel', { types: ['knowledge'] })).toEqual(['knowledge:hotel']);
+    expect(keys('travel', { limit: 1 })).toEqual(['policy:travel']);
+    expect(keys('unknownword')).toEqual([]);
+    expect(keys('the of and')).toEqual([]);
+  });
+
+  test('removes and replaces documents', () => {
+    const version = index.version;
+    expect(index.remove('policy:travel')).toBe(true);
+    expect(index.remove('policy:travel')).toBe(false);
+    expect(keys('allowance')).toEqual([]);
+
+    index.add('news:party', { type: 'news', id: 'party', title: 'Annual party moved', text: 'Now on Saturday.' });
+    expect(keys('friday')).toEqual([]);
+    expect(keys('saturday')).toEqual(['news:party']);
+    expect(index.size).toBe(3);
+    expect(index.version).toBeGreaterThan(version);
+  });
+
+  test('returns a snippet around the first query term', () => {
+    const [result] = index.search('travel', { types: ['knowledge'] });
+    expect(result.snippet.startsWith('Use the travel desk')).toBe(true);
+    expect(result.snippet.endsWith('…')).toBe(true);
+    expect(result.snippet.length).toBeLessThanOrEqual(162);
+  });
+});
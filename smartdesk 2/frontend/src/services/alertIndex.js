@@ -0,0 +1,105 @@
+// Alert Index Service - unexpired alerts partitioned by target audience
+// Each partition is kept sorted by priority, then newest first, so an
+// audience's alerts are a merge of its own partition and the 'all'
+// partition, and the top N need only N steps of that merge.
+
+import MinHeap from './minHeap';
+import { toEpoch } from './bookingIndex';
+
+const PRIORITY_RANK = { urgent: 4, high: 3, medium: 2, low: 1 };
+
+class AlertIndex {
+  constructor() {
+    this.partitions = new Map(); // target_audience -> sorted [{ key, alert }]
+  }
+
+  clear() {
+    this.partitions.clear();
+  }
+
+  build(alerts) {
+    this.clear();
+    alerts.forEach(alert => this.partition(alert.target_audience).push({ key: this.sortKey(alert), alert }));
+    this.partitions.forEach(entries => entries.sort((a, b) => a.key - b.key));
+  }
+
+  // Ascending key = higher priority first, then more recent first
+  sortKey(alert) {
+    const rank = PRIORITY_RANK[alert.priority] || 0;
+    const created = toEpoch(alert.created_at) || 0;
+    return -(rank * 1e13 + created);
+  }
+
+  partition(audience) {
+    const key = audience || 'all';
+    if (!this.partitions.has(key)) {
+      this.partitions.set(key, []);
+    }
+    return this.partitions.get(key);
+  }
+
+  // First position whose key is >= key
+  lowerBound(entries, key) {
+    let low = 0;
+    let high = entries.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (entries[mid].key < key) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  add(alert) {
+    const entries = this.partition(alert.target_audience);
+    const key = this.sortKey(alert);
+    entries.splice(this.lowerBound(entries, key), 0, { key, alert });
+  }
+
+  // Remove an alert as it was when added (same priority/created_at/audience)
+  remove(alert) {
+    const entries = this.partition(alert.target_audience);
+    const key = this.sortKey(alert);
+    for (let i = this.lowerBound(entries, key); i < entries.length && entries[i].key === key; i++) {
+      if (entries[i].alert.id === alert.id) {
+        entries.splice(i, 1);
+        return true;
+      }
+    }
+    return false;
+  }
+
+  // Alerts an audience sees, in priority/recency order; 'all' sees every partition
+  *iterate(audience = 'all') {
+    const sources = audience === 'all'
+      ? [...this.partitions.values()]
+      : [this.partition('all'), this.partition(audience)];
+
+    const heap = new MinHeap(cursor => cursor.entries[cursor.position].key);
+    sources.forEach(entries => {
+      if (entries.length > 0) heap.push({ entries, position: 0 });
+    });
+    while (heap.size > 0) {
+      const cursor = heap.pop();
+      yield cursor.entries[cursor.position].alert;
+      cursor.position++;
+      if (cursor.position < cursor.entries.length) {
+        heap.push(cursor);
+      }
+    }
+  }
+
+  list(audience = 'all', limit = Infinity) {
+    const alerts = [];
+    for (const alert of this.iterate(audience)) {
+      if (alerts.length >= limit) break;
+      alerts.push(alert);
+    }
+    return alerts;
+  }
+}
+
+export default AlertIndex;
@@ -3,6 +3,9 @@ import dataService from './dataService';
 import imageStorage from './imageStorage';
 
 // Employee API endpoints - Frontend-only using dataService
+// Read-heavy endpoints also offer getXIfChanged(etag) conditional reads that
+// resolve to { status: 304, etag, lastModified } when nothing was written since
+// the given ETag, or { status: 200, data, etag, lastModified } otherwise.
 export const employeeAPI = {
   // Get all employees with optional search and filters
   getAll: async (searchParams = {}) => {
@@ -14,6 +17,48 @@ export const employeeAPI = {
     }
   },
 
+  // Conditional read: { status: 304, etag } when the employee set is unchanged
+  getAllIfChanged: async (searchParams = {}, etag = null) => {
+    try {
+      return await dataService.conditionalGet('employees', etag, () => dataService.getEmployees(searchParams));
+    } catch (error) {
+      console.error('Error fetching employees:', error);
+      throw error;
+    }
+  },
+
+  // Get one page of employees: { items, total, limit, next_cursor }
+  // Pass `fields` to receive light rows (e.g. ['name', 'department', 'location'])
+  getPage: async (params = {}) => {
+    try {
+      return await dataService.getEmployeePage(params);
+    } catch (error) {
+      console.error('Error fetching employee page:', error);
+      throw error;
+    }
+  },
+
+  // An employee's bookings starting in [from, to) (default: the next 30 days)
+  getBookings: async (employeeId, params = {}) => {
+    try {
+      return await dataService.getEmployeeBookings(employeeId, params);
+    } catch (error) {
+      console.error('Error fetching employee bookings:', error);
+      throw error;
+    }
+  },
+
+  // The same bookings as an iCalendar (.ics) ReadableStream; use
+  // new Response(stream).blob() to offer it as a download
+  exportBookingsCalendar: async (employeeId, params = {}) => {
+    try {
+      return await dataService.getEmployeeBookingsCalendar(employeeId, params);
+    } catch (error) {
+      console.error('Error exporting employee bookings:', error);
+      throw error;
+    }
+  },
+
   // Update employee profile image
   updateImage: async (employeeId, imageData) => {
     try {
@@ -61,6 +106,17 @@ export const hierarchyAPI = {
     }
   },
 
+  // Add many relationships in one all-or-nothing import
+  // On failure the thrown error carries `errors: [{ index, employeeId, error }]`
+  createBulk: async (relationships) => {
+    try {
+      return await dataService.createHierarchyBulk(relationships);
+    } catch (error) {
+      console.error('Error importing hierarchy:', error);
+      throw error;
+    }
+  },
+
   // Remove hierarchy relationship
   remove: async (employeeId) => {
     try {
@@ -71,6 +127,37 @@ export const hierarchyAPI = {
     }
   },
 
+  // Delete several relationships (by relationship or employee id) in one call; resolves to
+  // { deleted, deleted_ids, not_found }
+  removeBulk: async (ids) => {
+    try {
+      return await dataService.deleteHierarchyBulk(ids);
+    } catch (error) {
+      console.error('Error deleting hierarchy:', error);
+      throw error;
+    }
+  },
+
+  // Get everyone below an employee, optionally limited to `depth` levels
+  getSubtree: async (employeeId, depth = null) => {
+    try {
+      return await dataService.getHierarchySubtree(employeeId, depth);
+    } catch (error) {
+      console.error('Error fetching hierarchy subtree:', error);
+      throw error;
+    }
+  },
+
+  // Get the reporting chain above an employee
+  getAncestors: async (employeeId) => {
+    try {
+      return await dataService.getHierarchyAncestors(employeeId);
+    } catch (error) {
+      console.error('Error fetching hierarchy ancestors:', error);
+      throw error;
+    }
+  },
+
   // Clear all hierarchy relationships
   clearAll: async () => {
     try {
@@ -87,9 +174,8 @@ export const utilityAPI = {
   // Refresh Excel data
   refreshExcel: async () => {
     try {
-      // Reload all data from Excel files
-      const result = await dataService.loadAllData();
-      return { message: 'Excel data refreshed successfully', ...result };
+      // Diff the Excel file against loaded employees and apply only the changes
+      return await dataService.refreshEmployeeData();
     } catch (error) {
       console.error('Error refreshing Excel data:', error);
       throw error;
@@ -106,6 +192,15 @@ export const utilityAPI = {
     }
   },
 
+  getDepartmentsIfChanged: async (etag = null) => {
+    try {
+      return await dataService.conditionalGet('departments', etag, () => dataService.getDepartments());
+    } catch (error) {
+      console.error('Error fetching departments:', error);
+      throw error;
+    }
+  },
+
   // Get locations  
   getLocations: async () => {
     try {
@@ -116,6 +211,15 @@ export const utilityAPI = {
     }
   },
 
+  getLocationsIfChanged: async (etag = null) => {
+    try {
+      return await dataService.conditionalGet('locations', etag, () => dataService.getLocations());
+    } catch (error) {
+      console.error('Error fetching locations:', error);
+      throw error;
+    }
+  },
+
   // Get system statistics
   getStats: async () => {
     try {
@@ -138,6 +242,17 @@ export const newsAPI = {
     }
   },
 
+  // Delta read: { version, full, items, deleted } since a previous version
+  // (an opaque string; pass back the `version` of the last read)
+  getChanges: async (since = null) => {
+    try {
+      return await dataService.getNewsChanges(since);
+    } catch (error) {
+      console.error('Error fetching news changes:', error);
+      throw error;
+    }
+  },
+
   create: async (newsData) => {
     try {
       return await dataService.createNews(newsData);
@@ -147,6 +262,16 @@ export const newsAPI = {
     }
   },
 
+  // Create several news items in one call
+  createBulk: async (items) => {
+    try {
+      return await dataService.createNewsBulk(items);
+    } catch (error) {
+      console.error('Error creating news:', error);
+      throw error;
+    }
+  },
+
   update: async (id, newsData) => {
     try {
       return await dataService.updateNews(id, newsData);
@@ -163,6 +288,17 @@ export const newsAPI = {
       console.error('Error deleting news:', error);
       throw error;
     }
+  },
+
+  // Delete several news items in one call; resolves to
+  // { deleted, deleted_ids, not_found }
+  deleteBulk: async (ids) => {
+    try {
+      return await dataService.deleteNewsBulk(ids);
+    } catch (error) {
+      console.error('Error deleting news:', error);
+      throw error;
+    }
   }
 };
 
@@ -202,6 +338,17 @@ export const taskAPI = {
       console.error('Error deleting task:', error);
       throw error;
     }
+  },
+
+  // Delete several tasks in one call; resolves to
+  // { deleted, deleted_ids, not_found }
+  deleteBulk: async (ids) => {
+    try {
+      return await dataService.deleteTasksBulk(ids);
+    } catch (error) {
+      console.error('Error deleting tasks:', error);
+      throw error;
+    }
   }
 };
 
@@ -241,6 +388,17 @@ export const knowledgeAPI = {
       console.error('Error deleting knowledge:', error);
       throw error;
     }
+  },
+
+  // Delete several articles in one call; resolves to
+  // { deleted, deleted_ids, not_found }
+  deleteBulk: async (ids) => {
+    try {
+      return await dataService.deleteKnowledgeBulk(ids);
+    } catch (error) {
+      console.error('Error deleting knowledge:', error);
+      throw error;
+    }
   }
 };
 
@@ -289,6 +447,17 @@ export const helpAPI = {
       console.error('Error deleting help request:', error);
       throw error;
     }
+  },
+
+  // Delete several help requests in one call; resolves to
+  // { deleted, deleted_ids, not_found }
+  deleteBulk: async (ids) => {
+    try {
+      return await dataService.deleteHelpBulk(ids);
+    } catch (error) {
+      console.error('Error deleting help requests:', error);
+      throw error;
+    }
   }
 };
 
@@ -303,6 +472,15 @@ export const meetingRoomAPI = {
     }
   },
 
+  getAllIfChanged: async (filters = {}, etag = null) => {
+    try {
+      return await dataService.conditionalGet('meetingRooms', etag, () => dataService.getMeetingRooms(filters));
+    } catch (error) {
+      console.error('Error fetching meeting rooms:', error);
+      throw error;
+    }
+  },
+
   getLocations: async () => {
     try {
       const rooms = await dataService.getMeetingRooms();
@@ -325,6 +503,41 @@ export const meetingRoomAPI = {
     }
   },
 
+  // Earliest free slots across rooms matching location/floor/min_capacity
+  // for a meeting of `duration` minutes within [from, to)
+  getAvailability: async (params = {}) => {
+    try {
+      return await dataService.getMeetingRoomAvailability(params);
+    } catch (error) {
+      console.error('Error fetching room availability:', error);
+      throw error;
+    }
+  },
+
+  // A room's bookings in [from, to), recurring bookings expanded to occurrences
+  getSchedule: async (roomId, params = {}) => {
+    try {
+      return await dataService.getMeetingRoomSchedule(roomId, params);
+    } catch (error) {
+      console.error('Error fetching room schedule:', error);
+      throw error;
+    }
+  },
+
+  // Ended bookings of a room ({ room_id }) or employee ({ employee_id }),
+  // newest first; pass next_cursor back as `cursor` for the next page
+  getHistory: async (params = {}) => {
+    try {
+      return await dataService.getBookingHistory(params);
+    } catch (error) {
+      console.error('Error fetching booking history:', error);
+      throw error;
+    }
+  },
+
+  // Pass bookingData.recurrence ({ frequency: 'daily' | 'weekly', interval,
+  // days_of_week, until, count }) to store a recurring booking; the booked
+  // slot is the first occurrence, so days_of_week must include its weekday
   book: async (roomId, bookingData) => {
     try {
       return await dataService.bookMeetingRoom(roomId, bookingData);
@@ -352,9 +565,24 @@ export const meetingRoomAPI = {
     }
   },
 
-  clearAllBookings: async () => {
+  // Cancel several bookings (any rooms) in one update; ids may be booking,
+  // recurring series or occurrence ids. Resolves to
+  // { cancelled, cancelled_ids, not_found }
+  cancelBookingsBulk: async (bookingIds) => {
+    try {
+      return await dataService.cancelMeetingRoomBookingsBulk(bookingIds);
+    } catch (error) {
+      console.error('Error cancelling bookings:', error);
+      throw error;
+    }
+  },
+
+  // Clear bookings in one update; filters: room_id, location, floor, from, to
+  // Resolves to { message, scope, cleared_count, cleared_booking_ids,
+  // rooms_updated (rooms in scope), rooms_changed (rooms that had bookings), ... }
+  clearAllBookings: async (filters = {}) => {
     try {
-      return await dataService.clearAllMeetingRoomBookings();
+      return await dataService.clearAllMeetingRoomBookings(filters);
     } catch (error) {
       console.error('Error clearing all bookings:', error);
       throw error;
@@ -364,22 +592,38 @@ export const meetingRoomAPI = {
 
 // Alerts API endpoints - Frontend-only using dataService
 export const alertAPI = {
-  getAll: async (targetAudience = 'all') => {
-    try {
-      const allAlerts = dataService.getAlerts();
-      // Filter by target audience if specified
-      if (targetAudience && targetAudience !== 'all') {
-        return allAlerts.filter(alert => 
-          alert.target_audience === 'all' || alert.target_audience === targetAudience
-        );
-      }
-      return allAlerts;
+  // Highest priority first, newest first within a priority; pass limit
+  // for just the top N (e.g. a dashboard's top 5)
+  getAll: async (targetAudience = 'all', limit = null) => {
+    try {
+      // Served from the per-audience alert index
+      return await dataService.getAlerts(targetAudience, limit);
+    } catch (error) {
+      console.error('Error fetching alerts:', error);
+      throw error;
+    }
+  },
+
+  getAllIfChanged: async (targetAudience = 'all', etag = null) => {
+    try {
+      return await dataService.conditionalGet('alerts', etag, () => alertAPI.getAll(targetAudience));
     } catch (error) {
       console.error('Error fetching alerts:', error);
       throw error;
     }
   },
 
+  // Delta read: { version, full, items, deleted } since a previous version;
+  // deleted includes expired alerts as tombstones
+  getChanges: async (since = null, targetAudience = 'all') => {
+    try {
+      return await dataService.getAlertChanges(since, targetAudience);
+    } catch (error) {
+      console.error('Error fetching alert changes:', error);
+      throw error;
+    }
+  },
+
   create: async (alertData) => {
     try {
       return dataService.createAlert(alertData);
@@ -389,6 +633,16 @@ export const alertAPI = {
     }
   },
 
+  // Create several alerts (e.g. a broadcast per location) in one call
+  createBulk: async (alertsData) => {
+    try {
+      return await dataService.createAlertsBulk(alertsData);
+    } catch (error) {
+      console.error('Error creating alerts:', error);
+      throw error;
+    }
+  },
+
   update: async (alertId, alertData) => {
     try {
       return dataService.updateAlert(alertId, alertData);
@@ -405,6 +659,17 @@ export const alertAPI = {
       console.error('Error deleting alert:', error);
       throw error;
     }
+  },
+
+  // Delete several alerts in one call; resolves to
+  // { deleted, deleted_ids, not_found }
+  deleteBulk: async (ids) => {
+    try {
+      return await dataService.deleteAlertsBulk(ids);
+    } catch (error) {
+      console.error('Error deleting alerts:', error);
+      throw error;
+    }
   }
 };
 
@@ -471,17 +736,7 @@ export const policyAPI = {
 
   update: async (id, policyData) => {
     try {
-      // Find and update manually since dataService doesn't have updatePolicy
-      const policy = dataService.policies.find(p => p.id === id);
-      if (!policy) {
-        throw new Error('Policy not found');
-      }
-      
-      Object.assign(policy, policyData, {
-        updated_at: new Date().toISOString()
-      });
-      
-      return policy;
+      return await dataService.updatePolicy(id, policyData);
     } catch (error) {
       console.error('Error updating policy:', error);
       throw error;
@@ -490,17 +745,42 @@ export const policyAPI = {
 
   delete: async (id) => {
     try {
-      const index = dataService.policies.findIndex(p => p.id === id);
-      if (index === -1) {
-        throw new Error('Policy not found');
-      }
-      
-      dataService.policies.splice(index, 1);
-      return { message: 'Policy deleted successfully' };
+      return await dataService.deletePolicy(id);
     } catch (error) {
       console.error('Error deleting policy:', error);
       throw error;
     }
+  },
+
+  // Policy PDFs with their indexing state ({ id, title, url, indexed, pages, chunks, error })
+  getDocuments: async () => {
+    try {
+      return dataService.getPolicyDocuments();
+    } catch (error) {
+      console.error('Error fetching policy documents:', error);
+      throw error;
+    }
+  },
+
+  // Ranked passages from the policy PDFs: params { q, limit }; results
+  // carry the document, its url and the page of each passage
+  searchDocuments: async (params = {}) => {
+    try {
+      return await dataService.searchPolicyDocuments(params);
+    } catch (error) {
+      console.error('Error searching policy documents:', error);
+      throw error;
+    }
+  },
+
+  // Re-check the PDFs and re-extract any that changed; resolves to the status
+  reindexDocuments: async () => {
+    try {
+      return await dataService.ingestPolicyDocuments();
+    } catch (error) {
+      console.error('Error indexing policy documents:', error);
+      throw error;
+    }
   }
 };
 
@@ -544,23 +824,60 @@ export const workflowAPI = {
   }
 };
 
-// Chat API endpoints (simplified for frontend-only mode)
+// Search API - ranked full-text search over knowledge, news, policies and help
+export const searchAPI = {
+  // params: { q, types, limit }; types narrows to e.g. ['knowledge', 'policy']
+  // Resolves to { query, count, results: [{ type, id, title, score, snippet }] }
+  search: async (params = {}) => {
+    try {
+      return await dataService.search(params);
+    } catch (error) {
+      console.error('Error searching:', error);
+      throw error;
+    }
+  }
+};
+
+// Chat API endpoints - offline answers from the policy documents, the
+// knowledge base and the employee directory
 export const chatAPI = {
   getHistory: async (sessionId) => {
-    // Return empty history for frontend-only mode
-    return [];
+    try {
+      return await dataService.getChatHistory(sessionId);
+    } catch (error) {
+      console.error('Error fetching chat history:', error);
+      throw error;
+    }
   },
 
+  // Resolves to { response, sessionId, sources }; omit sessionId to start a session
   send: async (message, sessionId) => {
-    // Return a mock response for frontend-only mode
-    return {
-      response: "I'm sorry, the AI chat feature is currently unavailable in frontend-only mode. Please use other features of the application.",
-      sessionId: sessionId
-    };
+    try {
+      return await dataService.sendChatMessage(message, sessionId);
+    } catch (error) {
+      console.error('Error sending chat message:', error);
+      throw error;
+    }
   },
 
   clearHistory: async (sessionId) => {
-    // No-op for frontend-only mode
-    return { message: 'Chat history cleared' };
+    try {
+      return await dataService.clearChatHistory(sessionId);
+    } catch (error) {
+      console.error('Error clearing chat history:', error);
+      throw error;
+    }
   }
-};
\ No newline at end of file
+};
+// Event API - change notifications instead of polling
+// Event types: booking.created/cancelled/cleared/expired,
+// alert.created/updated/deleted/expired, news.created/updated/deleted.
+// Handlers receive batches of events; a { type: 'resync' } event means the
+// subscriber fell behind and should refetch. Booking events from other tabs
+// arrive too, with remote: true; alert and news events are per tab.
+export const eventAPI = {
+  // Subscribe by type prefix ('booking', 'alert', 'news' or '*'); returns an unsubscribe function
+  subscribe: (types, handler, options = {}) => {
+    return dataService.events.subscribe(types, handler, options);
+  }
+};
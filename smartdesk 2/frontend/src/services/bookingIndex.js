@@ -0,0 +1,298 @@
+// Booking Index Service - per-room sorted booking intervals
+// Bookings in a room never overlap, so keeping them sorted by start time
+// also keeps them sorted by end time. Conflict checks and slot lookups are
+// then a binary search instead of a walk over the room's bookings.
+// Recurring bookings are kept per room as rules and expanded on demand.
+// The same structure keyed by employee id serves per-employee lookups;
+// there bookings may overlap, so it is built with { allowOverlap: true }
+// and only the start-ordered queries may be used.
+//
+// Intervals are ordered by (start, id), so bookings sharing a start time
+// keep the same order however the index was built.
+
+import RecurrenceRule from './recurrence';
+import MinHeap from './minHeap';
+
+// Merge interval streams that are each sorted by start into one sorted stream
+function* mergeByStart(sources) {
+  if (sources.length === 1) {
+    yield* sources[0];
+    return;
+  }
+
+  const heap = new MinHeap(entry => entry.interval.start);
+  sources.forEach(source => {
+    const next = source.next();
+    if (!next.done) heap.push({ source, interval: next.value });
+  });
+  while (heap.size > 0) {
+    const entry = heap.pop();
+    yield entry.interval;
+    const next = entry.source.next();
+    if (!next.done) {
+      entry.interval = next.value;
+      heap.push(entry);
+    }
+  }
+}
+
+// A rule's occurrences starting in [from, to)
+function* occurrencesStartingFrom(rule, from, to) {
+  for (const occurrence of rule.occurrences(from, to)) {
+    if (occurrence.start >= from) yield occurrence;
+  }
+}
+
+// Parse an ISO string / Date / epoch into UTC epoch milliseconds
+export const toEpoch = (value) => {
+  if (value instanceof Date) return value.getTime();
+  if (typeof value === 'number') return value;
+  return new Date(value).getTime();
+};
+
+// (start, id) order of two intervals
+const compareIntervals = (a, b) => a.start - b.start || (a.id < b.id ? -1 : a.id > b.id ? 1 : 0);
+
+class BookingIndex {
+  constructor({ allowOverlap = false } = {}) {
+    this.rooms = new Map(); // key (room id) -> [{ start, end, id }] sorted by (start, id)
+    this.rules = new Map(); // key (room id) -> Map of ruleId -> RecurrenceRule
+    this.allowOverlap = allowOverlap;
+  }
+
+  // Queries that binary-search end times or treat overlaps as a contiguous
+  // run are only correct when a key's intervals never overlap
+  requireDisjoint(method) {
+    if (this.allowOverlap) {
+      throw new Error(`BookingIndex.${method} needs non-overlapping intervals`);
+    }
+  }
+
+  clear() {
+    this.rooms.clear();
+    this.rules.clear();
+  }
+
+  // Rebuild from single and recurring booking records; records without a key are skipped
+  build(bookings, recurringBookings = [], getKey = booking => booking.room_id) {
+    this.clear();
+    bookings.forEach(booking => {
+      const key = getKey(booking);
+      if (key) this.ensureIntervals(key).push(this.toInterval(booking));
+    });
+    this.rooms.forEach(intervals => intervals.sort(compareIntervals));
+    recurringBookings.forEach(booking => {
+      const key = getKey(booking);
+      if (key) this.addRule(key, booking);
+    });
+  }
+
+  toInterval(booking) {
+    return { start: toEpoch(booking.start_time), end: toEpoch(booking.end_time), id: booking.id };
+  }
+
+  // A room's sorted intervals; read-only, so unknown keys are not added
+  intervals(roomId) {
+    return this.rooms.get(roomId) || [];
+  }
+
+  // Same, creating the room's entry for a write
+  ensureIntervals(roomId) {
+    if (!this.rooms.has(roomId)) {
+      this.rooms.set(roomId, []);
+    }
+    return this.rooms.get(roomId);
+  }
+
+  // Number of intervals starting before `time`
+  countStartingBefore(intervals, time) {
+    let low = 0;
+    let high = intervals.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (intervals[mid].start < time) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  // Number of intervals ordered before (start, id)
+  countBefore(intervals, start, id) {
+    let low = 0;
+    let high = intervals.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (compareIntervals(intervals[mid], { start, id }) < 0) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  // Number of intervals still running or to come at `time`
+  // (binary search on end times, so only valid where intervals never overlap)
+  countEndingAfter(roomId, time) {
+    this.requireDisjoint('countEndingAfter');
+    const intervals = this.intervals(roomId);
+    let low = 0;
+    let high = intervals.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (intervals[mid].end <= time) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return intervals.length - low;
+  }
+
+  roomRules(roomId) {
+    return this.rules.get(roomId) || new Map();
+  }
+
+  // Add or replace a recurring booking; returns its RecurrenceRule
+  addRule(roomId, booking) {
+    if (!this.rules.has(roomId)) {
+      this.rules.set(roomId, new Map());
+    }
+    const rule = new RecurrenceRule(booking);
+    this.rules.get(roomId).set(rule.id, rule);
+    return rule;
+  }
+
+  removeRule(roomId, ruleId) {
+    const rules = this.rules.get(roomId);
+    return rules ? rules.delete(ruleId) : false;
+  }
+
+  // The booking interval or rule occurrence overlapping [start, end), or null
+  findConflict(roomId, start, end) {
+    this.requireDisjoint('findConflict');
+    const intervals = this.intervals(roomId);
+    const candidate = this.countStartingBefore(intervals, end) - 1;
+    if (candidate >= 0 && intervals[candidate].end > start) {
+      return intervals[candidate];
+    }
+    for (const rule of this.roomRules(roomId).values()) {
+      const occurrence = rule.occurrenceIn(start, end);
+      if (occurrence) return occurrence;
+    }
+    return null;
+  }
+
+  // First clash between a new rule's occurrences and the room's bookings
+  // or other rules, or null
+  findRuleConflict(roomId, rule) {
+    for (const interval of this.overlapping(roomId, rule.start, rule.lastEnd)) {
+      if (rule.occurrenceIn(interval.start, interval.end)) return interval;
+    }
+    for (const other of this.roomRules(roomId).values()) {
+      if (other.id === rule.id) continue;
+      const occurrence = rule.firstOverlapWith(other);
+      if (occurrence) return occurrence;
+    }
+    return null;
+  }
+
+  // Single bookings overlapping [from, to), earliest first
+  *overlapping(roomId, from, to) {
+    this.requireDisjoint('overlapping');
+    const intervals = this.intervals(roomId);
+    let position = Math.max(this.countStartingBefore(intervals, from) - 1, 0);
+    for (; position < intervals.length && intervals[position].start < to; position++) {
+      if (intervals[position].end > from) yield intervals[position];
+    }
+  }
+
+  // Bookings and rule occurrences overlapping [from, to), merged by start
+  *busyIntervals(roomId, from, to) {
+    const sources = [this.overlapping(roomId, from, to)];
+    this.roomRules(roomId).forEach(rule => sources.push(rule.occurrences(from, to)));
+    yield* mergeByStart(sources);
+  }
+
+  // Single bookings starting in [from, to), earliest first
+  *singlesStartingBetween(key, from, to) {
+    const intervals = this.intervals(key);
+    let position = this.countStartingBefore(intervals, from);
+    for (; position < intervals.length && intervals[position].start < to; position++) {
+      yield intervals[position];
+    }
+  }
+
+  // Bookings and rule occurrences starting in [from, to), merged by start
+  // (safe where bookings overlap, e.g. in the per-employee index)
+  *startingBetween(key, from, to) {
+    const sources = [this.singlesStartingBetween(key, from, to)];
+    this.roomRules(key).forEach(rule => sources.push(occurrencesStartingFrom(rule, from, to)));
+    yield* mergeByStart(sources);
+  }
+
+  // Insert a booking; returns its position in the room's sorted order
+  add(roomId, booking) {
+    const intervals = this.ensureIntervals(roomId);
+    const interval = this.toInterval(booking);
+    const position = this.countBefore(intervals, interval.start, interval.id);
+    intervals.splice(position, 0, interval);
+    return position;
+  }
+
+  remove(roomId, bookingId) {
+    const intervals = this.intervals(roomId);
+    const position = intervals.findIndex(interval => interval.id === bookingId);
+    if (position === -1) return false;
+    intervals.splice(position, 1);
+    return true;
+  }
+
+  clearRoom(roomId) {
+    this.rooms.set(roomId, []);
+  }
+
+  // Drop intervals overlapping [from, to); they form one contiguous run,
+  // so this is a single splice. Returns the removed ids.
+  removeOverlapping(roomId, from, to) {
+    this.requireDisjoint('removeOverlapping');
+    const intervals = this.intervals(roomId);
+    let first = this.countStartingBefore(intervals, from);
+    if (first > 0 && intervals[first - 1].end > from) {
+      first--;
+    }
+    const last = this.countStartingBefore(intervals, to);
+    if (last <= first) return [];
+    return intervals.splice(first, last - first).map(interval => interval.id);
+  }
+
+  // Free gaps of at least `duration` ms inside [from, to), earliest first
+  *iterateFreeSlots(roomId, from, to, duration) {
+    let cursor = from;
+
+    for (const interval of this.busyIntervals(roomId, from, to)) {
+      if (interval.end <= cursor) continue;
+      if (interval.start - cursor >= duration) {
+        yield { start: cursor, end: interval.start };
+      }
+      cursor = Math.max(cursor, interval.end);
+    }
+    if (to - cursor >= duration) {
+      yield { start: cursor, end: to };
+    }
+  }
+
+  freeSlots(roomId, from, to, duration, limit = Infinity) {
+    const slots = [];
+    for (const slot of this.iterateFreeSlots(roomId, from, to, duration)) {
+      if (slots.length >= limit) break;
+      slots.push(slot);
+    }
+    return slots;
+  }
+}
+
+export default BookingIndex;
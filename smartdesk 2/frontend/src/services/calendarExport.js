@@ -0,0 +1,92 @@
+// Calendar Export Service - iCalendar (RFC 5545) text for bookings
+// Produces the calendar one chunk per event so large exports can be
+// streamed instead of being built as a single string.
+
+import { toEpoch } from './bookingIndex';
+
+const PRODUCT_ID = '-//SmartDesk//Meeting Rooms//EN';
+const UID_DOMAIN = 'smartdesk';
+
+// Content lines longer than this many UTF-8 octets are folded (RFC 5545)
+const MAX_LINE_OCTETS = 75;
+
+const utf8Length = (codePoint) => (codePoint < 0x80 ? 1 : codePoint < 0x800 ? 2 : codePoint < 0x10000 ? 3 : 4);
+
+class CalendarExport {
+  // 20261016T093000Z
+  formatDate(value) {
+    return new Date(toEpoch(value)).toISOString().replace(/[-:]/g, '').replace(/\.\d{3}/, '');
+  }
+
+  escapeText(value) {
+    return String(value === null || value === undefined ? '' : value)
+      .replace(/\\/g, '\\\\')
+      .replace(/;/g, '\\;')
+      .replace(/,/g, '\\,')
+      .replace(/\r?\n/g, '\\n');
+  }
+
+  // Split by encoded length, between characters (for...of walks code
+  // points, so surrogate pairs stay together); continuation lines start
+  // with a space, which counts towards their 75 octets
+  fold(line) {
+    const parts = [];
+    let current = '';
+    let octets = 0;
+    for (const character of line) {
+      const size = utf8Length(character.codePointAt(0));
+      if (octets + size > MAX_LINE_OCTETS) {
+        parts.push(current);
+        current = ' ';
+        octets = 1;
+      }
+      current += character;
+      octets += size;
+    }
+    parts.push(current);
+    return parts.join('\r\n');
+  }
+
+  lines(lines) {
+    return lines.map(line => this.fold(line)).join('\r\n') + '\r\n';
+  }
+
+  // booking: a booking record; room: its room (for the location), optional
+  event(booking, room = null) {
+    const location = room
+      ? [room.name, room.floor, room.location].filter(Boolean).join(', ')
+      : booking.room_name;
+    const summary = booking.purpose || `Meeting in ${booking.room_name || 'meeting room'}`;
+
+    return this.lines([
+      'BEGIN:VEVENT',
+      `UID:${String(booking.id).replace('@', '-')}@${UID_DOMAIN}`,
+      `DTSTAMP:${this.formatDate(booking.created_at || Date.now())}`,
+      `DTSTART:${this.formatDate(booking.start_time)}`,
+      `DTEND:${this.formatDate(booking.end_time)}`,
+      `SUMMARY:${this.escapeText(summary)}`,
+      `LOCATION:${this.escapeText(location)}`,
+      `DESCRIPTION:${this.escapeText(`Booked by ${booking.employee_name || 'Unknown'}`)}`,
+      'END:VEVENT'
+    ]);
+  }
+
+  // Calendar text in chunks: header, one chunk per event, footer
+  // entries: iterable of { booking, room }
+  *chunks(entries, name = 'Meeting Room Bookings') {
+    yield this.lines([
+      'BEGIN:VCALENDAR',
+      'VERSION:2.0',
+      `PRODID:${PRODUCT_ID}`,
+      'CALSCALE:GREGORIAN',
+      'METHOD:PUBLISH',
+      `X-WR-CALNAME:${this.escapeText(name)}`
+    ]);
+    for (const { booking, room } of entries) {
+      yield this.event(booking, room);
+    }
+    yield this.lines(['END:VCALENDAR']);
+  }
+}
+
+export default CalendarExport;
@@ -0,0 +1,99 @@
+// Change Log Service - per-collection change sequence for delta reads
+// Every create/update/delete records the record id under the next
+// sequence number; a reader that remembers the last sequence it saw gets
+// back just the ids that changed since, with deletions as tombstones.
+//
+// Versions are "<epoch>-<sequence>". The sequence restarts on every page
+// load, so the epoch (a boot id) tells a version from an earlier load
+// apart from a current one; such readers must resync in full.
+//
+// Only the latest change per id is kept. Tombstones are capped; once old
+// ones are dropped, readers from before them must resync in full.
+
+const MAX_TOMBSTONES = 1000;
+
+class ChangeLog {
+  constructor(epoch = Date.now().toString(36)) {
+    this.epoch = epoch;
+    this.sequence = 0;
+    this.entries = [];         // [{ seq, id, deleted }] in sequence order
+    this.latest = new Map();   // id -> its entry in this.entries
+    this.superseded = 0;       // entries replaced by a later change to the same id
+    this.tombstones = 0;
+    this.floor = 0;            // readers with since < floor need a full resync
+  }
+
+  // Current version, for readers to pass back as `since`
+  get version() {
+    return `${this.epoch}-${this.sequence}`;
+  }
+
+  record(id, deleted = false) {
+    const previous = this.latest.get(id);
+    if (previous) {
+      previous.superseded = true;
+      this.superseded++;
+      if (previous.deleted) this.tombstones--;
+    }
+
+    const entry = { seq: ++this.sequence, id, deleted };
+    this.entries.push(entry);
+    this.latest.set(id, entry);
+    if (deleted) this.tombstones++;
+
+    if (this.superseded > this.entries.length / 2 || this.tombstones > MAX_TOMBSTONES) {
+      this.compact();
+    }
+    return entry.seq;
+  }
+
+  // Drop superseded entries and the oldest tombstones over the cap
+  compact() {
+    let excessTombstones = Math.max(this.tombstones - MAX_TOMBSTONES, 0);
+    this.entries = this.entries.filter(entry => {
+      if (entry.superseded) return false;
+      if (entry.deleted && excessTombstones > 0) {
+        excessTombstones--;
+        this.tombstones--;
+        this.latest.delete(entry.id);
+        this.floor = entry.seq;
+        return false;
+      }
+      return true;
+    });
+    this.superseded = 0;
+  }
+
+  // Changes after the `version` a reader last saw: { full: true } when the
+  // reader must resync, otherwise { full: false, changed: [ids], deleted: [ids] }
+  since(version) {
+    const match = typeof version === 'string' ? /^(.*)-(\d+)$/.exec(version) : null;
+    const since = match ? Number(match[2]) : NaN;
+    if (!match || match[1] !== this.epoch || since < this.floor || since > this.sequence) {
+      return { full: true, changed: [], deleted: [] };
+    }
+
+    // First entry with seq > since
+    let low = 0;
+    let high = this.entries.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (this.entries[mid].seq <= since) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+
+    const changed = [];
+    const deleted = [];
+    for (let i = low; i < this.entries.length; i++) {
+      const entry = this.entries[i];
+      if (entry.superseded) continue;
+      (entry.deleted ? deleted : changed).push(entry.id);
+    }
+    return { full: false, changed, deleted };
+  }
+}
+
+export default ChangeLog;
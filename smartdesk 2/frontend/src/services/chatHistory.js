@@ -0,0 +1,43 @@
+// Chat History Service - bounded per-session message store
+// Keeps the most recent messages of the most recently used sessions; the
+// oldest messages of a session and the least recently used sessions are
+// dropped first, so memory stays flat however long the app runs.
+
+class ChatHistory {
+  constructor(maxSessions = 100, maxMessages = 50) {
+    this.maxSessions = maxSessions;
+    this.maxMessages = maxMessages;
+    this.sessions = new Map(); // session id -> messages, least recently used first
+  }
+
+  // Messages of a session, oldest first (a copy)
+  get(sessionId) {
+    const messages = this.sessions.get(sessionId);
+    return messages ? [...messages] : [];
+  }
+
+  add(sessionId, message) {
+    let messages = this.sessions.get(sessionId);
+    if (messages) {
+      this.sessions.delete(sessionId); // re-inserted below as most recent
+    } else {
+      messages = [];
+      if (this.sessions.size >= this.maxSessions) {
+        this.sessions.delete(this.sessions.keys().next().value);
+      }
+    }
+
+    messages.push(message);
+    if (messages.length > this.maxMessages) {
+      messages.splice(0, messages.length - this.maxMessages);
+    }
+    this.sessions.set(sessionId, messages);
+    return message;
+  }
+
+  clear(sessionId) {
+    return this.sessions.delete(sessionId);
+  }
+}
+
+export default ChatHistory;
@@ -1,4 +1,152 @@
 import * as XLSX from 'xlsx';
+import PrefixIndex from './prefixIndex';
+import HierarchyIndex from './hierarchyIndex';
+import BookingIndex, { toEpoch } from './bookingIndex';
+import MinHeap from './minHeap';
+import RecurrenceRule from './recurrence';
+import EventStream from './eventStream';
+import CalendarExport from './calendarExport';
+import ChangeLog from './changeLog';
+import AlertIndex from './alertIndex';
+import SearchIndex, { tokenize } from './searchIndex';
+import PdfTextExtractor from './pdfText';
+import ChatHistory from './chatHistory';
+
+// Fields covered by the employee "starts with" search
+const EMPLOYEE_SEARCH_FIELDS = {
+  name: emp => emp.name,
+  id: emp => emp.id,
+  department: emp => emp.department,
+  location: emp => emp.location,
+  grade: emp => emp.grade,
+  mobile: emp => emp.mobile
+};
+
+// Employee fields that come from the Excel sheet (profileImage is app-owned)
+const EMPLOYEE_EXCEL_FIELDS = [
+  'id', 'name', 'department', 'grade', 'reportingManager', 'reportingId',
+  'location', 'mobile', 'extension', 'email', 'dateOfJoining'
+];
+
+// Employee workbook and its compiled snapshot
+const EMPLOYEE_WORKBOOK_URL = '/employee_directory.xlsx';
+const EMPLOYEE_SNAPSHOT_KEY = 'employeeSnapshot_data';
+const EMPLOYEE_SNAPSHOT_FORMAT = 1;
+
+// Meeting room persistence and the cross-tab write lock
+const MEETING_ROOMS_KEY = 'meetingRooms_data';
+const MEETING_ROOMS_REVISION_KEY = 'meetingRooms_revision';
+const MEETING_ROOMS_LOCK = 'meetingRooms_lock';
+
+// Bookings collection: single bookings in one entry per room and month,
+// recurring bookings in a single entry
+const BOOKING_PARTITION_PREFIX = 'meetingBookings_';
+const RECURRING_BOOKINGS_KEY = 'meetingRecurring_data';
+
+// How long ended bookings are kept for history queries
+const BOOKING_HISTORY_DAYS = 90;
+
+// Upcoming bookings summarized on each room (current one included)
+const ROOM_NEXT_BOOKINGS = 5;
+
+// Default window for an employee's bookings and calendar export
+const EMPLOYEE_BOOKINGS_DAYS = 30;
+
+// BroadcastChannel that relays change events between tabs. Only bookings
+// are persisted (localStorage); alerts and news live in each tab's memory,
+// so their events stay local
+const EVENTS_CHANNEL = 'smartdesk_events';
+const RELAYED_EVENTS = ['booking'];
+
+// setTimeout cannot wait longer than this (about 24.8 days)
+const MAX_TIMER_DELAY = 2147483647;
+
+// Rows handed over per batch while streaming Excel sheets
+const EXCEL_BATCH_SIZE = 500;
+
+// Page size bounds for getEmployeePage
+const DEFAULT_PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 500;
+
+// Page size bounds for getBookingHistory
+const DEFAULT_HISTORY_PAGE_SIZE = 20;
+const MAX_HISTORY_PAGE_SIZE = 100;
+
+// Content covered by full-text search: collection -> type, and the title
+// and body text indexed for each record
+const SEARCH_SOURCES = {
+  knowledge: {
+    type: 'knowledge',
+    title: item => item.title,
+    text: item => [item.content, item.category, (item.tags || []).join(' ')].filter(Boolean).join('\n')
+  },
+  news: {
+    type: 'news',
+    title: item => item.title,
+    text: item => [item.summary, item.content, item.description, item.category].filter(Boolean).join('\n')
+  },
+  policies: {
+    type: 'policy',
+    title: item => item.title,
+    text: item => [item.content, item.category].filter(Boolean).join('\n')
+  },
+  help: {
+    type: 'help',
+    title: item => item.title,
+    text: item => [item.message, ...(item.replies || []).map(reply => reply.message)].filter(Boolean).join('\n')
+  }
+};
+
+// Company policy PDFs (served from public/) whose text is indexed for search.
+// The "Revised Attendance Policy w.e.f 21st May 25" PDF has the same text as
+// the Working Hours & Attendance Policy, so only the latter is indexed
+const POLICY_DOCUMENTS_PATH = '/company policies/';
+const POLICY_DOCUMENTS = [
+  { id: 'working_hours_attendance', category: 'hr', title: 'Working Hours & Attendance Policy', file: 'Working Hours & Attendance Policy.pdf' },
+  { id: 'sexual_harassment_redressal', category: 'hr', title: 'Sexual Harassment At Work Redressal Policy', file: '_12_39_b356500c83384d2d_Sexual Harassment At Work Redressal Policy_26-Apr-22.pdf' },
+  { id: 'dress_code', category: 'hr', title: 'Dress Code Policy', file: '_13_55_00673d13502c42da_Dress code policy.pdf' },
+  { id: 'employee_referral', category: 'hr', title: 'Employee Referral Policy', file: '_14_19_2fe9bd4b1c514d00_Employee referral policy.pdf' },
+  { id: 'leave', category: 'hr', title: 'Leave Policy (Revised)', file: '_14_33_50e319284d7e4fe4_Leave Policy (Revised).pdf' },
+  { id: 'local_conveyance', category: 'hr', title: 'Local Conveyance Policy', file: '_15_9_02985794b8584650_Local Conveyance policy.pdf' },
+  { id: 'whistle_blower', category: 'hr', title: 'Whistle Blower Policy', file: '_16_4_3edd02c8f36f429f_Whistle Blower Policy.pdf' },
+  { id: 'tour_travel', category: 'hr', title: 'Tour Travel Policy', file: '_23_44_6eca6e909cee4aa7_Tour Travel Policy.pdf' },
+  { id: 'night_meal_conveyance', category: 'hr', title: 'Night Shift Meal & Conveyance Allowance', file: '_38_0_62d66a9aaaf645cc_Meal and Conveyance for Employees Working at Night on Sites.pdf' },
+  { id: 'flexible_work_schedule', category: 'hr', title: 'Flexible Work Schedule Policy', file: 'Microsoft Word - Flexible Work Schedule.pdf' },
+  { id: 'holidays_2025', category: 'holidays', title: 'List of Holidays 2025', file: 'List of Holidays -2025.xlsx.pdf' }
+];
+
+// Extracted policy text is cached per document, keyed by file signature
+const POLICY_TEXT_PREFIX = 'policyText_';
+const POLICY_TEXT_FORMAT = 1;
+
+// Target size of a policy text chunk, in characters
+const POLICY_CHUNK_SIZE = 800;
+
+// Chat: bounded history, passages considered per answer, cached answers
+const CHAT_MAX_SESSIONS = 100;
+const CHAT_MAX_MESSAGES = 50;
+const CHAT_PASSAGES = 3;
+const CHAT_ANSWER_SENTENCES = 3;
+const CHAT_CACHE_SIZE = 200;
+const CHAT_DIRECTORY_MATCHES = 5;
+
+// A question about a person rather than a policy
+const DIRECTORY_QUESTION = /\b(who is|who's|contact|phone|mobile|extension|email|e-mail|reports? to|manager of|department of|where does|where is)\b/i;
+
+// Words dropped from a directory question to leave the name being asked about
+const DIRECTORY_FILLER = new Set([
+  'who', 'is', "who's", 'whos', 'what', 'whats', 'the', 'of', 'for', 'me', 'give', 'tell', 'please', 'can', 'you',
+  'i', 'need', 'find', 'show', 'a', 'an', 'his', 'her', 'their', 'does', 'do', 'sit', 'work', 'works', 'in', 'which',
+  'details', 'info', 'information', 'contact', 'phone', 'mobile', 'number', 'no', 'extension', 'ext', 'email',
+  'e', 'mail', 'id', 'reports', 'report', 'to', 'manager', 'department', 'dept', 'where', 'location', 's', 'and', 'about'
+]);
+
+// Result count bounds for search
+const DEFAULT_SEARCH_LIMIT = 10;
+const MAX_SEARCH_LIMIT = 50;
+
+// Collections exposed to conditional (ETag) reads
+const VERSIONED_COLLECTIONS = ['employees', 'departments', 'locations', 'meetingRooms', 'alerts'];
 
 class DataService {
   constructor() {
@@ -15,9 +163,96 @@ class DataService {
     this.workflows = [];
     this.meetingRooms = [];
     this.alerts = []; // Add alerts array
+    this.employeeById = new Map(); // id -> employee
+    this.employeePositions = new Map(); // id -> position in this.employees
+    this.employeeSearchIndex = new PrefixIndex(EMPLOYEE_SEARCH_FIELDS);
+    this.employeeFingerprints = new Map(); // id -> content hash of the Excel row
+    this.employeeWorkbookSignature = null; // identifies the workbook the employees came from
+    this.hierarchyIndex = new HierarchyIndex(); // parent/children maps over this.hierarchy
+    this.hierarchyReport = null; // outcome of the last Excel-derived hierarchy build
+    this.bookings = new Map(); // booking id -> single booking
+    this.recurringBookings = new Map(); // booking id -> recurring booking (rule)
+    this.bookingPartitions = new Map(); // storage partition key -> Set of booking ids
+    this.dirtyBookingPartitions = new Set(); // partitions to write on the next save
+    this.recurringBookingsDirty = false;
+    this.bookingIndex = new BookingIndex(); // (room_id, start) index
+    this.employeeBookingIndex = new BookingIndex({ allowOverlap: true }); // (employee_id, start) index
+    this.calendarExport = new CalendarExport();
+    this.bookingSequence = 0; // keeps booking ids unique within a millisecond
+    this.recordSequence = 0; // same for every other collection's ids
+    this.meetingRoomsRevision = null; // storage revision our in-memory rooms reflect
+    this.meetingRoomsWriteQueue = Promise.resolve(); // in-tab fallback for the write lock
+    this.bookingPurge = null; // pending locked write of aged-out bookings
+    this.bookingExpiryHeap = new MinHeap(entry => entry.end); // booking end times, earliest first
+    this.bookingSweepTimer = null;
+    this.bookingSweepAt = null; // when the pending sweep fires
+    this.bootId = Date.now().toString(36); // keeps ETags unique across reloads
+    this.versions = {}; // collection -> { version, lastModified }
+    VERSIONED_COLLECTIONS.forEach(collection => {
+      this.versions[collection] = { version: 0, lastModified: new Date().toUTCString() };
+    });
+    this.alertById = new Map(); // id -> alert
+    this.newsById = new Map(); // id -> news item
+    this.changeLogs = { alerts: new ChangeLog(this.bootId), news: new ChangeLog(this.bootId) }; // for ?since= delta reads
+    this.alertExpiryIndex = new MinHeap(entry => entry.expiry); // { expiry, alert }, earliest first
+    this.searchIndex = new SearchIndex(); // full-text index over SEARCH_SOURCES
+    this.policyChunkIndex = new SearchIndex(); // chunks of the policy PDFs' text
+    this.policyDocumentState = new Map(); // policy document id -> { signature, pages, chunks, error }
+    this.policyIngestion = null; // running ingestion, if any
+    this.pdfTextExtractor = new PdfTextExtractor();
+    this.chatHistory = new ChatHistory(CHAT_MAX_SESSIONS, CHAT_MAX_MESSAGES);
+    this.chatAnswers = new Map(); // cache key -> answer, least recently used first
+    this.alertIndex = new AlertIndex(); // unexpired alerts by audience, priority then recency
+    this.activeAlertsByAudience = new Map(); // audience -> unexpired alerts it sees
+    this.nextAlertExpiry = null; // earliest future expires_at among alerts
+    this.alertExpiryTimer = null;
+    this.events = new EventStream(EVENTS_CHANNEL, { relay: RELAYED_EVENTS }); // change notifications for subscribers
     this.isLoaded = false;
   }
 
+  // ===== COLLECTION VERSIONS (ETag / Last-Modified) =====
+
+  // Record a write to one or more collections
+  bumpVersion(...collections) {
+    const lastModified = new Date().toUTCString();
+    collections.forEach(collection => {
+      const entry = this.versions[collection];
+      entry.version += 1;
+      entry.lastModified = lastModified;
+    });
+  }
+
+  // Strong ETag for the current state of a collection
+  getETag(collection) {
+    this.syncTimeBasedChanges(collection);
+    return `"${collection}-${this.bootId}-${this.versions[collection].version}"`;
+  }
+
+  // Alerts change state when they expire, not only on writes; for bookings
+  // the sweeper bumps the version, but other tabs may have written
+  syncTimeBasedChanges(collection) {
+    if (collection === 'alerts' && this.nextAlertExpiry !== null && Date.now() >= this.nextAlertExpiry) {
+      this.alertsChanged('alert.expired');
+    } else if (collection === 'meetingRooms') {
+      this.syncMeetingRoomsFromStorage();
+    }
+  }
+
+  // Conditional read: skips the loader entirely when ifNoneMatch is current
+  // Resolves to { status: 304, etag, lastModified } or { status: 200, data, etag, lastModified }
+  async conditionalGet(collection, ifNoneMatch, loader) {
+    if (!this.isLoaded) await this.loadAllData();
+
+    const etag = this.getETag(collection);
+    const { lastModified } = this.versions[collection];
+    if (ifNoneMatch && ifNoneMatch === etag) {
+      return { status: 304, etag, lastModified };
+    }
+
+    const data = await loader();
+    return { status: 200, data, etag, lastModified };
+  }
+
   // Load Excel files and parse data
   async loadAllData() {
     try {
@@ -26,6 +261,9 @@ class DataService {
       // Load employee data
       await this.loadEmployeeData();
       
+      // Build the reporting hierarchy from the REPORTING ID column
+      this.deriveHierarchyFromEmployees();
+      
       // Load attendance data
       await this.loadAttendanceData();
       
@@ -34,6 +272,10 @@ class DataService {
       
       // Initialize demo alerts for testing
       this.initializeDemoAlerts();
+
+      // Index the policy PDFs in the background; searches see each
+      // document as soon as it is done
+      this.ingestPolicyDocuments();
       
       this.isLoaded = true;
       console.log('All data loaded successfully');
@@ -42,7 +284,8 @@ class DataService {
         employees: this.employees.length,
         attendance: this.attendance.length,
         departments: this.departments.length,
-        locations: this.locations.length
+        locations: this.locations.length,
+        hierarchy: this.hierarchy.length
       };
     } catch (error) {
       console.error('Error loading data:', error);
@@ -51,87 +294,29 @@ class DataService {
   }
 
   // Load employee data from Excel
+  // Uses the compiled snapshot when the workbook has not changed since it was built
   async loadEmployeeData() {
     try {
-      const response = await fetch('/employee_directory.xlsx');
-      const arrayBuffer = await response.arrayBuffer();
-      const workbook = XLSX.read(arrayBuffer, { type: 'array' });
-      const sheetName = workbook.SheetNames[0];
-      const worksheet = workbook.Sheets[sheetName];
-      const jsonData = XLSX.utils.sheet_to_json(worksheet);
-
-      this.employees = jsonData.map(row => {
-        // Convert mobile number safely
-        const mobile = row['MOBILE'] ? String(row['MOBILE']) : '';
-        
-        // Convert extension safely
-        const extension = row['EXTENSION NUMBER'] ? String(row['EXTENSION NUMBER']) : '0';
-        
-        // Handle reporting ID
-        let reportingId = null;
-        if (row['REPORTING ID'] && String(row['REPORTING ID']).trim() !== '') {
-          reportingId = String(row['REPORTING ID']);
-        }
-        
-        // Handle date of joining - Convert Excel serial number to date
-        let dateJoining = '';
-        if (row['DATE OF JOINING']) {
-          try {
-            const rawDate = row['DATE OF JOINING'];
-            
-            // If it's a number (Excel serial date), convert it
-            if (typeof rawDate === 'number') {
-              // Excel serial date: days since January 1, 1900
-              // JavaScript Date: milliseconds since January 1, 1970
-              // Excel epoch: January 1, 1900 (but Excel incorrectly treats 1900 as leap year)
-              const excelEpoch = new Date(1900, 0, 1); // January 1, 1900
-              const msPerDay = 24 * 60 * 60 * 1000;
-              // Subtract 2 days to account for Excel's leap year bug and 0-indexing
-              const jsDate = new Date(excelEpoch.getTime() + (rawDate - 2) * msPerDay);
-              dateJoining = jsDate.toISOString().split('T')[0]; // Format: YYYY-MM-DD
-            } 
-            // If it's already a string, try to parse it
-            else if (typeof rawDate === 'string') {
-              const parsedDate = new Date(rawDate);
-              if (!isNaN(parsedDate.getTime())) {
-                dateJoining = parsedDate.toISOString().split('T')[0];
-              } else {
-                dateJoining = String(rawDate).split(' ')[0];
-              }
-            }
-            // If it's a Date object
-            else if (rawDate instanceof Date) {
-              dateJoining = rawDate.toISOString().split('T')[0];
-            }
-            // Fallback
-            else {
-              dateJoining = String(rawDate);
-            }
-          } catch (error) {
-            console.warn('Error parsing date for employee:', row['EMP NAME'], 'Raw date:', row['DATE OF JOINING']);
-            dateJoining = String(row['DATE OF JOINING']);
-          }
-        }
+      const source = await this.getFileSignature(EMPLOYEE_WORKBOOK_URL);
+      const snapshot = this.loadEmployeeSnapshot(source.signature);
+
+      if (snapshot) {
+        this.employees = snapshot;
+        console.log('Loaded employees from compiled snapshot');
+      } else {
+        this.employees = await this.readEmployeeRows(source.arrayBuffer);
+        this.saveEmployeeSnapshot(source.signature, this.employees);
+      }
+      this.employeeWorkbookSignature = source.signature;
+      this.employeeFingerprints = new Map(this.employees.map(emp => [emp.id, this.fingerprintEmployee(emp)]));
 
-        return {
-          id: String(row['EMP ID']),
-          name: String(row['EMP NAME'] || '').trim(),
-          department: String(row['DEPARTMENT'] || '').trim(),
-          grade: String(row['GRADE'] || '').trim(),
-          reportingManager: row['REPORTING MANAGER'] ? String(row['REPORTING MANAGER']).trim() : '*',
-          reportingId: reportingId,
-          location: String(row['LOCATION'] || '').trim(),
-          mobile: mobile,
-          extension: extension,
-          email: String(row['EMAIL ID'] || '').trim(),
-          dateOfJoining: dateJoining,
-          profileImage: '/api/placeholder/150/150'
-        };
-      });
+      // Build lookup maps and the prefix search index
+      this.indexEmployees();
 
       // Extract unique departments and locations
       this.departments = ['All Departments', ...new Set(this.employees.map(emp => emp.department).filter(dept => dept))];
       this.locations = ['All Locations', ...new Set(this.employees.map(emp => emp.location).filter(loc => loc))];
+      this.bumpVersion('employees', 'departments', 'locations');
 
       console.log(`Loaded ${this.employees.length} employees`);
     } catch (error) {
@@ -140,52 +325,463 @@ class DataService {
     }
   }
 
-  // Load attendance data from Excel
-  async loadAttendanceData() {
+  // Fetch the employee workbook and normalize every row
+  async readEmployeeRows(arrayBuffer = null) {
+    const worksheet = await this.openWorksheet(EMPLOYEE_WORKBOOK_URL, arrayBuffer);
+    const employees = [];
+    this.consumeInBatches(this.iterateEmployeeRecords(worksheet), batch => {
+      employees.push(...batch);
+    });
+    return employees;
+  }
+
+  // Yield normalized employee records straight from the sheet
+  *iterateEmployeeRecords(worksheet) {
+    for (const row of this.iterateSheetRows(worksheet)) {
+      yield this.normalizeEmployeeRow(row);
+    }
+  }
+
+  // ===== EMPLOYEE SNAPSHOT =====
+
+  // Identify a file (workbook, policy PDF) without parsing it: HTTP
+  // validators (mtime/ETag) when the server sends them, otherwise a hash of
+  // the downloaded bytes
+  async getFileSignature(url) {
     try {
-      const response = await fetch('/attendance_data.xlsx');
-      const arrayBuffer = await response.arrayBuffer();
-      const workbook = XLSX.read(arrayBuffer, { type: 'array' });
-      const sheetName = workbook.SheetNames[0];
-      const worksheet = workbook.Sheets[sheetName];
-      const jsonData = XLSX.utils.sheet_to_json(worksheet);
-
-      this.attendance = jsonData.map((row, index) => {
-        // Parse dates and times
-        const dateStr = String(row['date']);
-        let dateFormatted = '';
-        if (dateStr.includes('T')) {
-          const dateObj = new Date(dateStr);
-          dateFormatted = dateObj.toISOString().split('T')[0];
-        } else {
-          dateFormatted = dateStr.substring(0, 10);
+      const head = await fetch(url, { method: 'HEAD', cache: 'no-cache' });
+      const lastModified = head.headers.get('last-modified');
+      const etag = head.headers.get('etag');
+      if (head.ok && (lastModified || etag)) {
+        return { signature: `http:${lastModified || ''}|${etag || ''}`, arrayBuffer: null };
+      }
+    } catch (error) {
+      console.warn(`HEAD request for ${url} failed, hashing contents instead:`, error);
+    }
+
+    const response = await fetch(url, { cache: 'no-cache' });
+    const arrayBuffer = await response.arrayBuffer();
+    return { signature: `hash:${await this.hashBuffer(arrayBuffer)}`, arrayBuffer };
+  }
+
+  // SHA-256 where SubtleCrypto is available (secure contexts), FNV-1a otherwise
+  async hashBuffer(arrayBuffer) {
+    if (typeof crypto !== 'undefined' && crypto.subtle) {
+      const digest = await crypto.subtle.digest('SHA-256', arrayBuffer);
+      return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+    }
+    const bytes = new Uint8Array(arrayBuffer);
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < bytes.length; i++) {
+      hash ^= bytes[i];
+      hash = Math.imul(hash, 0x01000193);
+    }
+    return `${(hash >>> 0).toString(16)}-${bytes.length}`;
+  }
+
+  // Restore employees from the columnar snapshot if it matches the workbook
+  loadEmployeeSnapshot(signature) {
+    try {
+      const saved = localStorage.getItem(EMPLOYEE_SNAPSHOT_KEY);
+      if (!saved) return null;
+
+      const snapshot = JSON.parse(saved);
+      if (snapshot.format !== EMPLOYEE_SNAPSHOT_FORMAT || snapshot.signature !== signature) {
+        return null;
+      }
+
+      const { fields, columns, count } = snapshot;
+      const employees = new Array(count);
+      for (let i = 0; i < count; i++) {
+        const employee = {};
+        fields.forEach((field, column) => {
+          employee[field] = columns[column][i];
+        });
+        employee.profileImage = '/api/placeholder/150/150';
+        employees[i] = employee;
+      }
+      return employees;
+    } catch (error) {
+      console.error('Error loading employee snapshot:', error);
+      return null;
+    }
+  }
+
+  // Store employees column by column, keyed by the workbook signature
+  saveEmployeeSnapshot(signature, employees) {
+    try {
+      const snapshot = {
+        format: EMPLOYEE_SNAPSHOT_FORMAT,
+        signature: signature,
+        count: employees.length,
+        fields: EMPLOYEE_EXCEL_FIELDS,
+        columns: EMPLOYEE_EXCEL_FIELDS.map(field => employees.map(emp => emp[field]))
+      };
+      localStorage.setItem(EMPLOYEE_SNAPSHOT_KEY, JSON.stringify(snapshot));
+    } catch (error) {
+      console.error('Error saving employee snapshot:', error);
+    }
+  }
+
+  // ===== EXCEL ROW STREAMING =====
+
+  // Fetch a workbook and parse only its first sheet, skipping formatted
+  // text and HTML so only raw cell values are kept in memory
+  async openWorksheet(url, arrayBuffer = null) {
+    if (!arrayBuffer) {
+      const response = await fetch(url);
+      arrayBuffer = await response.arrayBuffer();
+    }
+    const workbook = XLSX.read(arrayBuffer, {
+      type: 'array',
+      sheets: 0,
+      cellText: false,
+      cellHTML: false
+    });
+    return workbook.Sheets[workbook.SheetNames[0]];
+  }
+
+  // Yield sheet rows one at a time as { header: value } objects, the same
+  // objects sheet_to_json builds by default: raw values keyed by the header
+  // row (a missing header is __EMPTY, repeated headers get _1, _2, ...),
+  // empty and error cells left out, rows without any value skipped
+  *iterateSheetRows(worksheet) {
+    if (!worksheet || !worksheet['!ref']) return;
+
+    const range = XLSX.utils.decode_range(worksheet['!ref']);
+    const headers = [];
+    const headerCounts = {};
+    for (let col = range.s.c; col <= range.e.c; col++) {
+      const cell = worksheet[XLSX.utils.encode_cell({ r: range.s.r, c: col })];
+      const name = !cell ? '__EMPTY' : cell.w !== undefined ? cell.w : cell.v === undefined || cell.v === null ? '' : String(cell.v);
+
+      let header = name;
+      let count = headerCounts[name] || 0;
+      if (count === 0) {
+        headerCounts[name] = 1;
+      } else {
+        do {
+          header = `${name}_${count++}`;
+        } while (headerCounts[header]);
+        headerCounts[name] = count;
+        headerCounts[header] = 1;
+      }
+      headers.push(header);
+    }
+
+    for (let rowIndex = range.s.r + 1; rowIndex <= range.e.r; rowIndex++) {
+      const row = {};
+      let hasValue = false;
+      for (let col = range.s.c; col <= range.e.c; col++) {
+        const cell = worksheet[XLSX.utils.encode_cell({ r: rowIndex, c: col })];
+        if (cell && cell.t !== 'e' && cell.v !== undefined && cell.v !== null) {
+          row[headers[col - range.s.c]] = cell.v;
+          hasValue = true;
         }
+      }
+      if (hasValue) {
+        yield row;
+      }
+    }
+  }
+
+  // Pull records from an iterator and hand them over in fixed-size batches
+  consumeInBatches(iterator, onBatch, batchSize = EXCEL_BATCH_SIZE) {
+    let batch = [];
+    for (const record of iterator) {
+      batch.push(record);
+      if (batch.length === batchSize) {
+        onBatch(batch);
+        batch = [];
+      }
+    }
+    if (batch.length > 0) {
+      onBatch(batch);
+    }
+  }
 
-        // Parse punch in/out times
-        let punchIn = null, punchOut = null;
-        if (row['punch_in'] && String(row['punch_in']) !== 'nan') {
-          punchIn = new Date(String(row['punch_in'])).toISOString();
+  // Convert one Excel row into an employee record
+  normalizeEmployeeRow(row) {
+    // Convert mobile number safely
+    const mobile = row['MOBILE'] ? String(row['MOBILE']) : '';
+    
+    // Convert extension safely
+    const extension = row['EXTENSION NUMBER'] ? String(row['EXTENSION NUMBER']) : '0';
+    
+    // Handle reporting ID
+    let reportingId = null;
+    if (row['REPORTING ID'] && String(row['REPORTING ID']).trim() !== '') {
+      reportingId = String(row['REPORTING ID']);
+    }
+    
+    // Handle date of joining - Convert Excel serial number to date
+    let dateJoining = '';
+    if (row['DATE OF JOINING']) {
+      try {
+        const rawDate = row['DATE OF JOINING'];
+        
+        // If it's a number (Excel serial date), convert it
+        if (typeof rawDate === 'number') {
+          // Excel serial date: days since January 1, 1900
+          // JavaScript Date: milliseconds since January 1, 1970
+          // Excel epoch: January 1, 1900 (but Excel incorrectly treats 1900 as leap year)
+          const excelEpoch = new Date(1900, 0, 1); // January 1, 1900
+          const msPerDay = 24 * 60 * 60 * 1000;
+          // Subtract 2 days to account for Excel's leap year bug and 0-indexing
+          const jsDate = new Date(excelEpoch.getTime() + (rawDate - 2) * msPerDay);
+          dateJoining = jsDate.toISOString().split('T')[0]; // Format: YYYY-MM-DD
+        } 
+        // If it's already a string, try to parse it
+        else if (typeof rawDate === 'string') {
+          const parsedDate = new Date(rawDate);
+          if (!isNaN(parsedDate.getTime())) {
+            dateJoining = parsedDate.toISOString().split('T')[0];
+          } else {
+            dateJoining = String(rawDate).split(' ')[0];
+          }
         }
-        if (row['punch_out'] && String(row['punch_out']) !== 'nan') {
-          punchOut = new Date(String(row['punch_out'])).toISOString();
+        // If it's a Date object
+        else if (rawDate instanceof Date) {
+          dateJoining = rawDate.toISOString().split('T')[0];
         }
+        // Fallback
+        else {
+          dateJoining = String(rawDate);
+        }
+      } catch (error) {
+        console.warn('Error parsing date for employee:', row['EMP NAME'], 'Raw date:', row['DATE OF JOINING']);
+        dateJoining = String(row['DATE OF JOINING']);
+      }
+    }
 
-        return {
-          id: `att_${(index + 1).toString().padStart(4, '0')}`,
-          employee_id: String(row['employee_id']),
-          employee_name: String(row['employee_name']),
-          date: dateFormatted,
-          punch_in: punchIn,
-          punch_out: punchOut,
-          punch_in_location: row['punch_in_location'] ? String(row['punch_in_location']) : null,
-          punch_out_location: row['punch_out_location'] ? String(row['punch_out_location']) : null,
-          status: String(row['status']).toLowerCase(),
-          total_hours: row['total_hours'] ? parseFloat(row['total_hours']) : 0.0,
-          remarks: row['remarks'] && String(row['remarks']) !== 'nan' ? String(row['remarks']) : null,
-          created_at: new Date().toISOString(),
-          updated_at: new Date().toISOString()
-        };
+    return {
+      id: String(row['EMP ID']),
+      name: String(row['EMP NAME'] || '').trim(),
+      department: String(row['DEPARTMENT'] || '').trim(),
+      grade: String(row['GRADE'] || '').trim(),
+      reportingManager: row['REPORTING MANAGER'] ? String(row['REPORTING MANAGER']).trim() : '*',
+      reportingId: reportingId,
+      location: String(row['LOCATION'] || '').trim(),
+      mobile: mobile,
+      extension: extension,
+      email: String(row['EMAIL ID'] || '').trim(),
+      dateOfJoining: dateJoining,
+      profileImage: '/api/placeholder/150/150'
+    };
+  }
+
+  // Rebuild employee lookup maps and the prefix search index
+  indexEmployees() {
+    this.employeeById = new Map(this.employees.map(emp => [emp.id, emp]));
+    this.employeePositions = new Map(this.employees.map((emp, position) => [emp.id, position]));
+    this.employeeSearchIndex.build(this.employees);
+  }
+
+  // Content hash of the Excel-sourced fields of an employee (FNV-1a)
+  fingerprintEmployee(employee) {
+    const content = EMPLOYEE_EXCEL_FIELDS.map(field => employee[field] ?? '').join('\u0001');
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < content.length; i++) {
+      hash ^= content.charCodeAt(i);
+      hash = Math.imul(hash, 0x01000193);
+    }
+    return (hash >>> 0).toString(16);
+  }
+
+  // Re-read the employee workbook and apply only the rows that changed
+  // Keeps profile images and hierarchy; returns per-category counts
+  async refreshEmployeeData() {
+    if (!this.isLoaded) await this.loadAllData();
+
+    const startedAt = performance.now();
+    const source = await this.getFileSignature(EMPLOYEE_WORKBOOK_URL);
+
+    // Same workbook as last time: nothing to parse
+    if (source.signature === this.employeeWorkbookSignature) {
+      return {
+        message: 'Excel data is already up to date',
+        count: this.employees.length,
+        inserted: 0,
+        updated: 0,
+        deleted: 0,
+        unchanged: this.employees.length,
+        elapsed_ms: Math.round((performance.now() - startedAt) * 100) / 100
+      };
+    }
+
+    const worksheet = await this.openWorksheet(EMPLOYEE_WORKBOOK_URL, source.arrayBuffer);
+
+    const fingerprints = new Map();
+    const inserted = [];
+    const updated = [];
+    let unchanged = 0;
+
+    // Single pass over the workbook: classify each row against stored fingerprints
+    const nextEmployees = [];
+    for (const row of this.iterateEmployeeRecords(worksheet)) {
+      const fingerprint = this.fingerprintEmployee(row);
+      fingerprints.set(row.id, fingerprint);
+
+      const existing = this.employeeById.get(row.id);
+      if (!existing) {
+        inserted.push(row);
+        nextEmployees.push(row);
+        continue;
+      }
+      if (this.employeeFingerprints.get(row.id) !== fingerprint) {
+        EMPLOYEE_EXCEL_FIELDS.forEach(field => {
+          existing[field] = row[field];
+        });
+        updated.push(existing);
+      } else {
+        unchanged++;
+      }
+      nextEmployees.push(existing);
+    }
+
+    const deleted = this.employees.filter(emp => !fingerprints.has(emp.id)).map(emp => emp.id);
+    const changedCount = inserted.length + updated.length + deleted.length;
+
+    if (changedCount > 0) {
+      // Swap in the new list at once, then patch the search index with the delta
+      this.employees = nextEmployees;
+      this.employeeFingerprints = fingerprints;
+      this.employeeById = new Map(this.employees.map(emp => [emp.id, emp]));
+      this.employeePositions = new Map(this.employees.map((emp, position) => [emp.id, position]));
+
+      if (changedCount > this.employees.length / 10) {
+        this.employeeSearchIndex.build(this.employees);
+      } else {
+        deleted.forEach(id => this.employeeSearchIndex.remove(id));
+        [...inserted, ...updated].forEach(emp => this.employeeSearchIndex.upsert(emp));
+      }
+
+      this.departments = ['All Departments', ...new Set(this.employees.map(emp => emp.department).filter(dept => dept))];
+      this.locations = ['All Locations', ...new Set([
+        ...this.employees.map(emp => emp.location).filter(loc => loc),
+        ...this.meetingRooms.map(room => room.location)
+      ])];
+      this.bumpVersion('employees', 'departments', 'locations');
+      this.deriveHierarchyFromEmployees();
+    }
+    this.employeeWorkbookSignature = source.signature;
+    this.saveEmployeeSnapshot(source.signature, this.employees);
+
+    const elapsedMs = Math.round((performance.now() - startedAt) * 100) / 100;
+    console.log(`Excel sync: ${inserted.length} inserted, ${updated.length} updated, ${deleted.length} deleted, ${unchanged} unchanged in ${elapsedMs}ms`);
+
+    return {
+      message: 'Excel data refreshed successfully',
+      count: this.employees.length,
+      inserted: inserted.length,
+      updated: updated.length,
+      deleted: deleted.length,
+      unchanged: unchanged,
+      hierarchy: this.hierarchyReport,
+      elapsed_ms: elapsedMs
+    };
+  }
+
+  // ===== HIERARCHY FROM EXCEL =====
+
+  // Build every reporting edge from the employees' REPORTING ID /
+  // REPORTING MANAGER columns in one pass and bulk-load them into the
+  // hierarchy index. Relationships added by hand are kept and take
+  // precedence over the Excel value for that employee; adding one later
+  // replaces the derived line.
+  deriveHierarchyFromEmployees() {
+    const manual = this.hierarchy.filter(rel => rel.source !== 'excel');
+    const manualIds = new Set(manual.map(rel => rel.employeeId));
+    this.hierarchyIndex.build(manual);
+
+    // Unique names only; ambiguous names map to null
+    const employeeIdsByName = new Map();
+    this.employees.forEach(emp => {
+      const name = emp.name.toLowerCase();
+      employeeIdsByName.set(name, employeeIdsByName.has(name) ? null : emp.id);
+    });
+
+    const createdAt = new Date().toISOString();
+    const derived = [];
+    const report = { edges: 0, roots: 0, resolved_by_name: 0, dangling: [], rejected: [] };
+
+    this.employees.forEach(emp => {
+      if (manualIds.has(emp.id)) return;
+
+      const resolved = this.resolveManagerId(emp, employeeIdsByName);
+      if (!resolved.managerId) {
+        if (resolved.reference) {
+          report.dangling.push({ employeeId: emp.id, reportingId: resolved.reference, reportingManager: emp.reportingManager });
+        } else {
+          report.roots++;
+        }
+        return;
+      }
+
+      const relation = { employeeId: emp.id, reportsTo: resolved.managerId };
+      const error = this.validateHierarchyRelation(relation);
+      if (error) {
+        report.rejected.push({ ...relation, error });
+        return;
+      }
+
+      const newRelation = { id: `hier_excel_${emp.id}`, ...relation, source: 'excel', created_at: createdAt };
+      this.hierarchyIndex.add(newRelation);
+      derived.push(newRelation);
+      if (resolved.byName) report.resolved_by_name++;
+    });
+
+    this.hierarchy = [...manual, ...derived];
+    report.edges = derived.length;
+    this.hierarchyReport = report;
+
+    if (report.dangling.length > 0) {
+      console.warn(`${report.dangling.length} employees reference a reporting manager that is not in the directory`);
+    }
+    console.log(`Derived ${derived.length} hierarchy relationships from Excel`);
+    return report;
+  }
+
+  // Manager of an employee from REPORTING ID ("80006.0"), falling back to
+  // the id in REPORTING MANAGER ("Ashish Jerath(80006)") and then its name
+  resolveManagerId(employee, employeeIdsByName) {
+    const reportingId = this.normalizeEmployeeId(employee.reportingId);
+    if (reportingId && this.employeeById.has(reportingId)) {
+      return { managerId: reportingId };
+    }
+
+    const manager = employee.reportingManager && employee.reportingManager !== '*' ? employee.reportingManager : '';
+    const managerIdMatch = manager.match(/\(([^)]+)\)\s*$/);
+    const managerId = managerIdMatch ? this.normalizeEmployeeId(managerIdMatch[1]) : null;
+    if (managerId && this.employeeById.has(managerId)) {
+      return { managerId };
+    }
+
+    const managerName = manager.replace(/\([^)]*\)\s*$/, '').trim().toLowerCase();
+    const idByName = managerName ? employeeIdsByName.get(managerName) : null;
+    if (idByName) {
+      return { managerId: idByName, byName: true };
+    }
+
+    return { managerId: null, reference: reportingId || managerId || manager || null };
+  }
+
+  // "80006.0", 80006 and " 80006 " all become "80006"; blanks and "*" become null
+  normalizeEmployeeId(value) {
+    if (value === null || value === undefined) return null;
+    const normalized = String(value).trim().replace(/\.0+$/, '');
+    return normalized === '' || normalized === '*' ? null : normalized;
+  }
+
+  // Load attendance data from Excel
+  async loadAttendanceData() {
+    try {
+      const worksheet = await this.openWorksheet('/attendance_data.xlsx');
+      const attendance = [];
+      this.consumeInBatches(this.iterateSheetRows(worksheet), batch => {
+        batch.forEach(row => attendance.push(this.normalizeAttendanceRow(row, attendance.length)));
       });
+      this.attendance = attendance;
 
       console.log(`Loaded ${this.attendance.length} attendance records`);
     } catch (error) {
@@ -195,10 +791,49 @@ class DataService {
     }
   }
 
+  // Convert one attendance sheet row into an attendance record
+  normalizeAttendanceRow(row, index) {
+    // Parse dates and times
+    const dateStr = String(row['date']);
+    let dateFormatted = '';
+    if (dateStr.includes('T')) {
+      const dateObj = new Date(dateStr);
+      dateFormatted = dateObj.toISOString().split('T')[0];
+    } else {
+      dateFormatted = dateStr.substring(0, 10);
+    }
+
+    // Parse punch in/out times
+    let punchIn = null, punchOut = null;
+    if (row['punch_in'] && String(row['punch_in']) !== 'nan') {
+      punchIn = new Date(String(row['punch_in'])).toISOString();
+    }
+    if (row['punch_out'] && String(row['punch_out']) !== 'nan') {
+      punchOut = new Date(String(row['punch_out'])).toISOString();
+    }
+
+    return {
+      id: `att_${(index + 1).toString().padStart(4, '0')}`,
+      employee_id: String(row['employee_id']),
+      employee_name: String(row['employee_name']),
+      date: dateFormatted,
+      punch_in: punchIn,
+      punch_out: punchOut,
+      punch_in_location: row['punch_in_location'] ? String(row['punch_in_location']) : null,
+      punch_out_location: row['punch_out_location'] ? String(row['punch_out_location']) : null,
+      status: String(row['status']).toLowerCase(),
+      total_hours: row['total_hours'] ? parseFloat(row['total_hours']) : 0.0,
+      remarks: row['remarks'] && String(row['remarks']) !== 'nan' ? String(row['remarks']) : null,
+      created_at: new Date().toISOString(),
+      updated_at: new Date().toISOString()
+    };
+  }
+
   // Initialize other data structures with sample data
   initializeOtherData() {
     // Initialize meeting rooms with persistence
     this.meetingRooms = this.generateMeetingRooms();
+    this.indexMeetingRoomBookings();
     
     // Initialize sample data for other modules
     this.news = [];
@@ -207,10 +842,12 @@ class DataService {
     this.help = [];
     this.policies = this.generateSamplePolicies();
     this.workflows = [];
+    this.buildSearchIndex();
     
     // Update locations to include all meeting room locations
     const meetingRoomLocations = [...new Set(this.meetingRooms.map(room => room.location))];
     this.locations = [...new Set([...this.locations, ...meetingRoomLocations])];
+    this.bumpVersion('meetingRooms', 'locations');
   }
 
   // Generate sample attendance data if Excel file is not available
@@ -275,7 +912,6 @@ class DataService {
         capacity: 10,
         amenities: "Projector, Whiteboard, Video Conference",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       
@@ -288,7 +924,6 @@ class DataService {
         capacity: 6,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       
@@ -301,7 +936,6 @@ class DataService {
         capacity: 10,
         amenities: "Projector, Video Conference, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -312,7 +946,6 @@ class DataService {
         capacity: 5,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -323,7 +956,6 @@ class DataService {
         capacity: 5,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -334,7 +966,6 @@ class DataService {
         capacity: 5,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -345,7 +976,6 @@ class DataService {
         capacity: 10,
         amenities: "Projector, Video Conference, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -356,7 +986,6 @@ class DataService {
         capacity: 5,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -367,7 +996,6 @@ class DataService {
         capacity: 5,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -378,7 +1006,6 @@ class DataService {
         capacity: 5,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -389,7 +1016,6 @@ class DataService {
         capacity: 20,
         amenities: "Projector, Video Conference, Whiteboard, Audio System",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       
@@ -402,7 +1028,6 @@ class DataService {
         capacity: 8,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -413,7 +1038,6 @@ class DataService {
         capacity: 6,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -424,7 +1048,6 @@ class DataService {
         capacity: 12,
         amenities: "Projector, Video Conference, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       },
       {
@@ -435,7 +1058,6 @@ class DataService {
         capacity: 8,
         amenities: "Projector, Whiteboard",
         status: "vacant",
-        bookings: [],
         current_booking: null
       }
     ];
@@ -449,11 +1071,11 @@ class DataService {
   // Load meeting rooms from localStorage
   loadMeetingRoomsFromStorage() {
     try {
-      const saved = localStorage.getItem('meetingRooms_data');
+      const saved = localStorage.getItem(MEETING_ROOMS_KEY);
       if (saved) {
         const parsed = JSON.parse(saved);
-        // Clean up expired bookings on load
-        this.cleanupExpiredBookings(parsed);
+        this.meetingRoomsRevision = localStorage.getItem(MEETING_ROOMS_REVISION_KEY);
+        this.loadBookingsFromStorage(parsed);
         return parsed;
       }
     } catch (error) {
@@ -462,120 +1084,491 @@ class DataService {
     return null;
   }
 
-  // Save meeting rooms to localStorage
+  // Save the room documents; bookings and the state derived from them
+  // are stored separately (see saveBookingsToStorage)
   saveMeetingRoomsToStorage(rooms = null) {
     try {
-      const roomsToSave = rooms || this.meetingRooms;
-      localStorage.setItem('meetingRooms_data', JSON.stringify(roomsToSave));
-      localStorage.setItem('meetingRooms_lastSaved', new Date().toISOString());
+      const roomsToSave = (rooms || this.meetingRooms).map(room => {
+        const { bookings, recurring_bookings, current_booking, next_bookings, booking_count, status, ...details } = room;
+        return details;
+      });
+      localStorage.setItem(MEETING_ROOMS_KEY, JSON.stringify(roomsToSave));
+      this.touchMeetingRoomsRevision();
     } catch (error) {
       console.error('Error saving meeting rooms to storage:', error);
     }
   }
 
-  // Clean up expired bookings
-  cleanupExpiredBookings(rooms) {
-    const now = new Date();
+  // Mark storage as changed so other tabs re-read it
+  touchMeetingRoomsRevision() {
+    const revision = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 8)}`;
+    localStorage.setItem(MEETING_ROOMS_REVISION_KEY, revision);
+    localStorage.setItem('meetingRooms_lastSaved', new Date().toISOString());
+    this.meetingRoomsRevision = revision;
+  }
+
+  // ===== BOOKINGS COLLECTION =====
+  // Single bookings are stored one localStorage entry per room and month,
+  // so a write re-serializes only that partition. Recurring bookings are
+  // few and share one entry. Ended bookings stay available for history
+  // for BOOKING_HISTORY_DAYS.
+
+  bookingPartitionKey(booking) {
+    return `${BOOKING_PARTITION_PREFIX}${booking.room_id}_${new Date(toEpoch(booking.start_time)).toISOString().slice(0, 7)}`;
+  }
+
+  // Read the bookings collection. Rooms saved before bookings had their
+  // own collection embed them instead; those are moved over here.
+  loadBookingsFromStorage(rooms) {
+    this.bookings.clear();
+    this.recurringBookings.clear();
+    this.bookingPartitions.clear();
+
+    const records = [];
+    for (let i = 0; i < localStorage.length; i++) {
+      const key = localStorage.key(i);
+      if (key && key.startsWith(BOOKING_PARTITION_PREFIX)) {
+        records.push(...JSON.parse(localStorage.getItem(key)));
+      }
+    }
+    const recurring = JSON.parse(localStorage.getItem(RECURRING_BOOKINGS_KEY) || '[]');
+
+    let migrated = false;
     rooms.forEach(room => {
-      if (room.current_booking) {
-        const endTime = new Date(room.current_booking.end_time);
-        if (endTime < now) {
-          room.status = 'vacant';
-          room.current_booking = null;
-          room.bookings = [];
-        }
+      if (!room.bookings && !room.recurring_bookings) return;
+      records.push(...(room.bookings || []).map(booking => ({ ...booking, room_id: room.id })));
+      recurring.push(...(room.recurring_bookings || []).map(booking => ({ ...booking, room_id: room.id })));
+      delete room.bookings;
+      delete room.recurring_bookings;
+      migrated = true;
+    });
+
+    // Drop bookings that have aged out of history (in memory; see purgeAgedBookings)
+    const cutoff = Date.now() - BOOKING_HISTORY_DAYS * 24 * 60 * 60 * 1000;
+    records.forEach(booking => {
+      if (toEpoch(booking.end_time) > cutoff) {
+        this.storeBooking(booking, migrated);
+      } else {
+        this.dirtyBookingPartitions.add(this.bookingPartitionKey(booking));
+      }
+    });
+    recurring.forEach(booking => {
+      if (new RecurrenceRule(booking).lastEnd > cutoff) {
+        this.recurringBookings.set(booking.id, booking);
+      } else {
+        this.recurringBookingsDirty = true;
       }
     });
+
+    if (migrated) {
+      this.recurringBookingsDirty = true;
+      this.saveMeetingRoomsToStorage(rooms);
+      this.saveBookingsToStorage();
+    } else if (this.dirtyBookingPartitions.size > 0 || this.recurringBookingsDirty) {
+      this.purgeAgedBookings();
+    }
   }
 
-  // Generate sample policies
-  generateSamplePolicies() {
-    return [
-      {
-        id: "policy_001",
-        title: "Employee Code of Conduct",
-        category: "hr",
-        content: "Guidelines for professional behavior and conduct",
-        effective_date: "2024-01-01",
-        version: "1.0"
-      },
-      {
-        id: "policy_002", 
-        title: "IT Security Policy",
-        category: "it",
-        content: "Information technology security guidelines and procedures",
-        effective_date: "2024-01-01",
-        version: "1.0"
+  // Reads load bookings outside the write lock, so writing the aged-out
+  // records away from there could overwrite another tab's write. The purge
+  // runs under the lock instead, on storage re-read there (and any locked
+  // write that comes first saves it along the way).
+  purgeAgedBookings() {
+    if (this.bookingPurge) return;
+    this.bookingPurge = this.withMeetingRoomsLock(() => {
+      this.syncMeetingRoomsFromStorage();
+      if (this.dirtyBookingPartitions.size > 0 || this.recurringBookingsDirty) {
+        this.saveBookingsToStorage();
       }
-    ];
+    }).catch(error => {
+      console.error('Error purging aged-out bookings:', error);
+    }).finally(() => {
+      this.bookingPurge = null;
+    });
   }
 
-  // Employee API methods
-  async getEmployees(searchParams = {}) {
-    if (!this.isLoaded) await this.loadAllData();
-    
-    let filtered = [...this.employees];
-    
-    if (searchParams.search) {
-      const search = searchParams.search.toLowerCase();
-      filtered = filtered.filter(emp => 
-        emp.name.toLowerCase().startsWith(search) ||
-        emp.id.toLowerCase().startsWith(search) ||
-        emp.department.toLowerCase().startsWith(search) ||
-        emp.location.toLowerCase().startsWith(search) ||
-        emp.grade.toLowerCase().startsWith(search) ||
-        emp.mobile.startsWith(search)
-      );
+  // Add a single booking to the collection (the caller indexes it)
+  storeBooking(booking, markDirty = true) {
+    const key = this.bookingPartitionKey(booking);
+    if (!this.bookingPartitions.has(key)) {
+      this.bookingPartitions.set(key, new Set());
     }
-    
-    if (searchParams.department && searchParams.department !== 'All Departments') {
-      filtered = filtered.filter(emp => emp.department === searchParams.department);
+    this.bookingPartitions.get(key).add(booking.id);
+    this.bookings.set(booking.id, booking);
+    if (markDirty) {
+      this.dirtyBookingPartitions.add(key);
     }
-    
-    if (searchParams.location && searchParams.location !== 'All Locations') {
-      filtered = filtered.filter(emp => emp.location === searchParams.location);
+  }
+
+  // Remove a single booking from the collection and both indexes
+  dropBooking(booking) {
+    const key = this.bookingPartitionKey(booking);
+    const partition = this.bookingPartitions.get(key);
+    if (partition) {
+      partition.delete(booking.id);
+    }
+    this.bookings.delete(booking.id);
+    this.dirtyBookingPartitions.add(key);
+
+    this.bookingIndex.remove(booking.room_id, booking.id);
+    if (booking.employee_id) {
+      this.employeeBookingIndex.remove(booking.employee_id, booking.id);
     }
-    
-    return filtered;
   }
 
-  async updateEmployeeImage(employeeId, imageData) {
-    if (!this.isLoaded) await this.loadAllData();
-    
-    const employee = this.employees.find(emp => emp.id === employeeId);
-    if (employee) {
-      employee.profileImage = imageData.profileImage || imageData;
-      return employee;
+  indexBooking(booking) {
+    this.bookingIndex.add(booking.room_id, booking);
+    if (booking.employee_id) {
+      this.employeeBookingIndex.add(booking.employee_id, booking);
     }
-    throw new Error('Employee not found');
   }
 
-  // Utility methods
-  async getDepartments() {
-    if (!this.isLoaded) await this.loadAllData();
-    return this.departments;
+  // Add (or replace, after an edit) a recurring booking in both indexes
+  indexRecurringBooking(booking) {
+    this.bookingIndex.addRule(booking.room_id, booking);
+    if (booking.employee_id) {
+      this.employeeBookingIndex.addRule(booking.employee_id, booking);
+    }
+    this.recurringBookingsDirty = true;
   }
 
-  async getLocations() {
-    if (!this.isLoaded) await this.loadAllData();
-    return this.locations;
+  unindexRecurringBooking(booking) {
+    this.bookingIndex.removeRule(booking.room_id, booking.id);
+    if (booking.employee_id) {
+      this.employeeBookingIndex.removeRule(booking.employee_id, booking.id);
+    }
+    this.recurringBookingsDirty = true;
   }
 
-  async getStats() {
-    if (!this.isLoaded) await this.loadAllData();
-    
-    return {
-      database: {
-        employees: this.employees.length,
-        departments: this.departments.length - 1, // Exclude "All Departments"
-        locations: this.locations.length - 1, // Exclude "All Locations"
-        attendance_records: this.attendance.length,
-        hierarchy_relations: this.hierarchy.length
-      },
-      excel: {
-        total_employees: this.employees.length,
-        departments_count: this.departments.length - 1,
-        locations_count: this.locations.length - 1
+  // Write the partitions touched since the last save
+  saveBookingsToStorage() {
+    try {
+      this.dirtyBookingPartitions.forEach(key => {
+        const ids = this.bookingPartitions.get(key);
+        if (!ids || ids.size === 0) {
+          localStorage.removeItem(key);
+          this.bookingPartitions.delete(key);
+        } else {
+          localStorage.setItem(key, JSON.stringify([...ids].map(id => this.bookings.get(id))));
+        }
+      });
+      this.dirtyBookingPartitions.clear();
+
+      if (this.recurringBookingsDirty) {
+        localStorage.setItem(RECURRING_BOOKINGS_KEY, JSON.stringify([...this.recurringBookings.values()]));
+        this.recurringBookingsDirty = false;
+      }
+      this.touchMeetingRoomsRevision();
+    } catch (error) {
+      console.error('Error saving bookings to storage:', error);
+    }
+  }
+
+  // Full booking record behind an index interval or a rule occurrence
+  resolveBooking(interval) {
+    const occurrence = RecurrenceRule.parseOccurrenceId(interval.id);
+    if (!occurrence) {
+      return this.bookings.get(interval.id);
+    }
+    const series = this.recurringBookings.get(occurrence.ruleId);
+    return this.bookingIndex.roomRules(series.room_id).get(series.id).materialize(interval);
+  }
+
+  // Booking fields carried on room listings
+  summarizeBooking(booking) {
+    return {
+      id: booking.id,
+      rule_id: booking.rule_id,
+      employee_id: booking.employee_id,
+      employee_name: booking.employee_name,
+      purpose: booking.purpose,
+      start_time: booking.start_time,
+      end_time: booking.end_time
+    };
+  }
+
+  // Pick up bookings written by other tabs since our last read or write
+  syncMeetingRoomsFromStorage() {
+    try {
+      const revision = localStorage.getItem(MEETING_ROOMS_REVISION_KEY);
+      if (revision === null || revision === this.meetingRoomsRevision) return false;
+
+      const saved = localStorage.getItem(MEETING_ROOMS_KEY);
+      if (!saved) return false;
+
+      this.meetingRooms = JSON.parse(saved);
+      this.meetingRoomsRevision = revision;
+      this.loadBookingsFromStorage(this.meetingRooms);
+      this.indexMeetingRoomBookings();
+      this.bumpVersion('meetingRooms');
+      return true;
+    } catch (error) {
+      console.error('Error syncing meeting rooms from storage:', error);
+      return false;
+    }
+  }
+
+  // Run a meeting room write exclusively. Across tabs this uses the Web
+  // Locks API; without it, writes are serialized within this tab.
+  // The write itself is synchronous: sync from storage, check, apply, save.
+  withMeetingRoomsLock(write) {
+    if (typeof navigator !== 'undefined' && navigator.locks) {
+      return navigator.locks.request(MEETING_ROOMS_LOCK, async () => write());
+    }
+    const run = this.meetingRoomsWriteQueue.then(write, write);
+    this.meetingRoomsWriteQueue = run.catch(() => {});
+    return run;
+  }
+
+  // Rebuild the (room_id, start) and (employee_id, start) indexes from the
+  // bookings collection, then every room's booking summary
+  indexMeetingRoomBookings() {
+    const bookings = [...this.bookings.values()];
+    const recurring = [...this.recurringBookings.values()];
+    this.bookingIndex.build(bookings, recurring, booking => booking.room_id);
+    this.employeeBookingIndex.build(bookings, recurring, booking => booking.employee_id);
+
+    this.bookingExpiryHeap.clear();
+    this.meetingRooms.forEach(room => {
+      this.refreshRoomState(room);
+      this.trackRoomExpiry(room);
+    });
+    this.scheduleBookingSweep();
+  }
+
+  // ===== EXPIRED BOOKING SWEEPER =====
+  // When a room's current booking ends, a timer moves the room on to its
+  // next booking, so reading rooms never has to recompute anything
+
+  trackRoomExpiry(room) {
+    if (room.current_booking) {
+      this.bookingExpiryHeap.push({ end: toEpoch(room.current_booking.end_time), roomId: room.id });
+    }
+  }
+
+  // (Re)arm the timer for the earliest tracked end time
+  scheduleBookingSweep() {
+    const next = this.bookingExpiryHeap.peek();
+    if (!next) return;
+    if (this.bookingSweepTimer !== null && this.bookingSweepAt <= next.end) return;
+
+    clearTimeout(this.bookingSweepTimer);
+    const delay = Math.min(Math.max(next.end - Date.now(), 0), MAX_TIMER_DELAY);
+    this.bookingSweepAt = next.end;
+    this.bookingSweepTimer = setTimeout(() => {
+      this.bookingSweepTimer = null;
+      this.bookingSweepAt = null;
+      this.sweepExpiredBookings();
+    }, delay);
+  }
+
+  // Refresh the rooms whose current booking has ended, then wait for the next one
+  // Ended bookings stay in the collection as history; only room state moves on
+  sweepExpiredBookings() {
+    try {
+      this.syncMeetingRoomsFromStorage();
+
+      // Entries of cancelled bookings are harmless: their room is just checked
+      const now = Date.now();
+      const roomIds = new Set();
+      while (this.bookingExpiryHeap.size > 0 && this.bookingExpiryHeap.peek().end <= now) {
+        roomIds.add(this.bookingExpiryHeap.pop().roomId);
+      }
+
+      let changed = 0;
+      this.meetingRooms.forEach(room => {
+        if (!roomIds.has(room.id)) return;
+        const previous = room.current_booking ? room.current_booking.id : null;
+        this.refreshRoomState(room);
+        this.trackRoomExpiry(room);
+        if ((room.current_booking ? room.current_booking.id : null) !== previous) {
+          changed++;
+        }
+      });
+
+      if (changed > 0) {
+        this.bumpVersion('meetingRooms');
+        this.events.publish('booking.expired', { room_ids: [...roomIds] });
+      }
+    } catch (error) {
+      console.error('Error sweeping expired bookings:', error);
+    }
+    this.scheduleBookingSweep();
+  }
+
+  // Derive a room's booking summary from the index: the current (or next)
+  // booking, the few after it, and how many single bookings plus running
+  // recurring series are still to come
+  // A room shows as occupied as soon as it has any upcoming booking
+  refreshRoomState(room) {
+    const now = Date.now();
+    const upcoming = [];
+    for (const interval of this.bookingIndex.busyIntervals(room.id, now, Infinity)) {
+      if (upcoming.length >= ROOM_NEXT_BOOKINGS) break;
+      upcoming.push(this.summarizeBooking(this.resolveBooking(interval)));
+    }
+
+    let runningSeries = 0;
+    this.bookingIndex.roomRules(room.id).forEach(rule => {
+      if (rule.lastEnd > now) runningSeries++;
+    });
+
+    room.current_booking = upcoming.length > 0 ? upcoming[0] : null;
+    room.next_bookings = upcoming;
+    room.booking_count = this.bookingIndex.countEndingAfter(room.id, now) + runningSeries;
+    room.status = room.current_booking ? 'occupied' : 'vacant';
+  }
+
+  // Generate sample policies
+  generateSamplePolicies() {
+    return [
+      {
+        id: "policy_001",
+        title: "Employee Code of Conduct",
+        category: "hr",
+        content: "Guidelines for professional behavior and conduct",
+        effective_date: "2024-01-01",
+        version: "1.0"
+      },
+      {
+        id: "policy_002", 
+        title: "IT Security Policy",
+        category: "it",
+        content: "Information technology security guidelines and procedures",
+        effective_date: "2024-01-01",
+        version: "1.0"
+      }
+    ];
+  }
+
+  // Employee API methods
+  async getEmployees(searchParams = {}) {
+    if (!this.isLoaded) await this.loadAllData();
+    
+    let filtered;
+    
+    if (searchParams.search) {
+      // Resolve matching ids from the prefix index, then restore Excel order
+      const matchingIds = this.employeeSearchIndex.lookup(searchParams.search);
+      filtered = [...matchingIds]
+        .map(id => this.employeeById.get(id))
+        .filter(Boolean)
+        .sort((a, b) => this.employeePositions.get(a.id) - this.employeePositions.get(b.id));
+    } else {
+      filtered = [...this.employees];
+    }
+    
+    if (searchParams.department && searchParams.department !== 'All Departments') {
+      filtered = filtered.filter(emp => emp.department === searchParams.department);
+    }
+    
+    if (searchParams.location && searchParams.location !== 'All Locations') {
+      filtered = filtered.filter(emp => emp.location === searchParams.location);
+    }
+    
+    return filtered;
+  }
+
+  // Paginated, projected employee listing
+  // params: search/department/location filters plus
+  //   limit  - page size (default 50, max 500)
+  //   cursor - next_cursor from the previous page
+  //   fields - array or comma-separated list of fields to return
+  async getEmployeePage(params = {}) {
+    const filtered = await this.getEmployees(params);
+    const limit = Math.min(Math.max(parseInt(params.limit, 10) || DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE);
+
+    // Cursor is the Excel position of the last employee on the previous page
+    let start = 0;
+    if (params.cursor !== undefined && params.cursor !== null && params.cursor !== '') {
+      const afterPosition = parseInt(params.cursor, 10);
+      if (isNaN(afterPosition)) {
+        throw new Error('Invalid cursor');
+      }
+      start = this.firstPositionAfter(filtered, afterPosition);
+    }
+
+    const page = filtered.slice(start, start + limit);
+    const hasMore = start + limit < filtered.length;
+    const fields = typeof params.fields === 'string'
+      ? params.fields.split(',').map(field => field.trim()).filter(Boolean)
+      : params.fields;
+
+    return {
+      items: fields && fields.length > 0 ? page.map(emp => this.projectFields(emp, fields)) : page,
+      total: filtered.length,
+      limit: limit,
+      next_cursor: hasMore && page.length > 0
+        ? String(this.employeePositions.get(page[page.length - 1].id))
+        : null
+    };
+  }
+
+  // Index of the first employee in an Excel-ordered list past the given position
+  firstPositionAfter(employees, afterPosition) {
+    let low = 0;
+    let high = employees.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (this.employeePositions.get(employees[mid].id) <= afterPosition) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  // Copy only the requested fields (id is always kept)
+  projectFields(record, fields) {
+    const projected = { id: record.id };
+    fields.forEach(field => {
+      if (field in record) {
+        projected[field] = record[field];
+      }
+    });
+    return projected;
+  }
+
+  async updateEmployeeImage(employeeId, imageData) {
+    if (!this.isLoaded) await this.loadAllData();
+    
+    const employee = this.employeeById.get(employeeId);
+    if (employee) {
+      employee.profileImage = imageData.profileImage || imageData;
+      this.employeeSearchIndex.upsert(employee);
+      this.bumpVersion('employees');
+      return employee;
+    }
+    throw new Error('Employee not found');
+  }
+
+  // Utility methods
+  async getDepartments() {
+    if (!this.isLoaded) await this.loadAllData();
+    return this.departments;
+  }
+
+  async getLocations() {
+    if (!this.isLoaded) await this.loadAllData();
+    return this.locations;
+  }
+
+  async getStats() {
+    if (!this.isLoaded) await this.loadAllData();
+    
+    return {
+      database: {
+        employees: this.employees.length,
+        departments: this.departments.length - 1, // Exclude "All Departments"
+        locations: this.locations.length - 1, // Exclude "All Locations"
+        attendance_records: this.attendance.length,
+        hierarchy_relations: this.hierarchy.length
+      },
+      excel: {
+        total_employees: this.employees.length,
+        departments_count: this.departments.length - 1,
+        locations_count: this.locations.length - 1
       }
     };
   }
@@ -585,44 +1578,200 @@ class DataService {
     return this.hierarchy;
   }
 
+  // A manual relationship replaces the employee's Excel-derived line, if any
   async createHierarchy(relationshipData) {
+    if (!this.isLoaded) await this.loadAllData();
+
+    const error = this.validateHierarchyRelation(relationshipData);
+    if (error) {
+      throw new Error(error);
+    }
+
     const newRelation = {
-      id: `hier_${Date.now()}`,
+      id: `hier_${Date.now()}_${++this.recordSequence}`,
       ...relationshipData,
       created_at: new Date().toISOString()
     };
+    if (this.hierarchyIndex.hasDerivedManager(newRelation.employeeId)) {
+      this.hierarchy = this.hierarchy.filter(rel => rel.employeeId !== newRelation.employeeId);
+    }
     this.hierarchy.push(newRelation);
+    this.hierarchyIndex.add(newRelation);
     return newRelation;
   }
 
+  // Validate and insert many relationships at once; nothing is inserted
+  // unless every relationship is valid (including against each other).
+  // As with createHierarchy, Excel-derived lines are replaced.
+  async createHierarchyBulk(relations) {
+    if (!this.isLoaded) await this.loadAllData();
+
+    if (!Array.isArray(relations) || relations.length === 0) {
+      throw new Error('No hierarchy relationships provided');
+    }
+
+    const createdAt = new Date().toISOString();
+    const derivedByEmployee = new Map(this.hierarchy.filter(rel => rel.source === 'excel').map(rel => [rel.employeeId, rel]));
+    const accepted = [];
+    const replaced = [];
+    const errors = [];
+
+    // Stage each valid relation in the index so later rows see earlier ones
+    relations.forEach((relationshipData, position) => {
+      const error = this.validateHierarchyRelation(relationshipData);
+      if (error) {
+        errors.push({ index: position, employeeId: relationshipData?.employeeId, error });
+        return;
+      }
+      const newRelation = {
+        id: `hier_${Date.now()}_${++this.recordSequence}`,
+        ...relationshipData,
+        created_at: createdAt
+      };
+      if (this.hierarchyIndex.hasDerivedManager(newRelation.employeeId)) {
+        replaced.push(derivedByEmployee.get(newRelation.employeeId));
+      }
+      this.hierarchyIndex.add(newRelation);
+      accepted.push(newRelation);
+    });
+
+    if (errors.length > 0) {
+      accepted.forEach(relation => this.hierarchyIndex.remove(relation.employeeId));
+      replaced.forEach(relation => this.hierarchyIndex.add(relation));
+      const error = new Error(`${errors.length} of ${relations.length} hierarchy relationships are invalid; nothing was imported`);
+      error.errors = errors;
+      throw error;
+    }
+
+    if (replaced.length > 0) {
+      const replacedIds = new Set(replaced.map(rel => rel.employeeId));
+      this.hierarchy = this.hierarchy.filter(rel => !(rel.source === 'excel' && replacedIds.has(rel.employeeId)));
+    }
+    this.hierarchy.push(...accepted);
+    return {
+      message: `${accepted.length} hierarchy relationships created`,
+      created: accepted.length,
+      replaced: replaced.length,
+      relationships: accepted
+    };
+  }
+
+  // Returns an error message, or null if the relationship can be added
+  // Duplicate and existence checks are map lookups; the cycle check
+  // walks the manager's reporting chain
+  validateHierarchyRelation(relationshipData) {
+    const { employeeId, reportsTo } = relationshipData || {};
+
+    if (!employeeId || !reportsTo) {
+      return 'Both employeeId and reportsTo are required';
+    }
+    if (employeeId === reportsTo) {
+      return 'Employee cannot report to themselves';
+    }
+    if (!this.employeeById.has(employeeId)) {
+      return `Employee ${employeeId} not found`;
+    }
+    if (!this.employeeById.has(reportsTo)) {
+      return `Manager ${reportsTo} not found`;
+    }
+    if (this.hierarchyIndex.hasManager(employeeId) && !this.hierarchyIndex.hasDerivedManager(employeeId)) {
+      return 'This employee already has a reporting manager';
+    }
+    if (this.hierarchyIndex.isAncestor(employeeId, reportsTo)) {
+      return `Adding this relationship would create a reporting cycle (${reportsTo} already reports up to ${employeeId})`;
+    }
+    return null;
+  }
+
+  // Accepts the relationship id or the employee id (DELETE /api/hierarchy/{employee_id})
   async deleteHierarchy(relationId) {
-    const index = this.hierarchy.findIndex(h => h.id === relationId);
+    const index = this.hierarchy.findIndex(h => h.id === relationId || h.employeeId === relationId);
     if (index > -1) {
-      this.hierarchy.splice(index, 1);
+      const [removed] = this.hierarchy.splice(index, 1);
+      this.hierarchyIndex.remove(removed.employeeId);
       return { message: 'Hierarchy relationship deleted' };
     }
     throw new Error('Hierarchy relationship not found');
   }
 
+  // Delete many relationships in one pass; ids may be relationship ids or
+  // employee ids, as for deleteHierarchy
+  async deleteHierarchyBulk(ids) {
+    const { kept, removed, notFound } = this.splitByIds(this.hierarchy, ids, h => [h.id, h.employeeId]);
+    this.hierarchy = kept;
+    removed.forEach(relation => this.hierarchyIndex.remove(relation.employeeId));
+    return this.bulkDeleteResult('hierarchy relationships', removed, notFound);
+  }
+
   async clearAllHierarchy() {
     this.hierarchy = [];
+    this.hierarchyIndex.clear();
     return { message: 'All hierarchy relationships cleared' };
   }
 
+  // Everyone reporting (directly or indirectly) to an employee
+  // depth limits how many levels are returned; omit it for the full subtree
+  async getHierarchySubtree(employeeId, depth = null) {
+    const maxDepth = depth === null || depth === undefined || depth === '' ? null : parseInt(depth, 10);
+    if (maxDepth !== null && (isNaN(maxDepth) || maxDepth < 0)) {
+      throw new Error('Depth must be a non-negative number');
+    }
+
+    const nodes = this.hierarchyIndex.subtree(employeeId, maxDepth);
+    return {
+      employeeId: employeeId,
+      depth: maxDepth,
+      count: nodes.length,
+      nodes: nodes
+    };
+  }
+
+  // Reporting chain above an employee, nearest manager first
+  async getHierarchyAncestors(employeeId) {
+    const ancestors = this.hierarchyIndex.ancestors(employeeId);
+    return {
+      employeeId: employeeId,
+      count: ancestors.length,
+      ancestors: ancestors
+    };
+  }
+
   // News methods
   async getNews() {
     return this.news;
   }
 
   async createNews(newsData) {
-    const newNews = {
-      id: `news_${Date.now()}`,
+    const newNews = this.buildNews(newsData);
+    this.news.unshift(newNews);
+    this.newsById.set(newNews.id, newNews);
+    this.indexSearchRecord('news', newNews);
+    this.changeLogs.news.record(newNews.id);
+    this.events.publish('news.created', { news_id: newNews.id });
+    return newNews;
+  }
+
+  // Create many news items with one insert and one notification
+  async createNewsBulk(items) {
+    this.requireBulkItems(items, 'news items');
+    const created = items.map(newsData => this.buildNews(newsData));
+    this.news.unshift(...created.slice().reverse());
+    created.forEach(item => {
+      this.newsById.set(item.id, item);
+      this.indexSearchRecord('news', item);
+      this.changeLogs.news.record(item.id);
+    });
+    this.events.publish('news.created', { news_ids: created.map(item => item.id) });
+    return { message: `${created.length} news items created`, created: created.length, items: created };
+  }
+
+  buildNews(newsData) {
+    return {
+      id: `news_${Date.now()}_${++this.recordSequence}`,
       ...newsData,
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString()
     };
-    this.news.unshift(newNews);
-    return newNews;
   }
 
   async updateNews(id, newsData) {
@@ -633,6 +1782,10 @@ class DataService {
         ...newsData,
         updated_at: new Date().toISOString()
       };
+      this.newsById.set(id, this.news[index]);
+      this.indexSearchRecord('news', this.news[index]);
+      this.changeLogs.news.record(id);
+      this.events.publish('news.updated', { news_id: id });
       return this.news[index];
     }
     throw new Error('News not found');
@@ -642,11 +1795,44 @@ class DataService {
     const index = this.news.findIndex(n => n.id === id);
     if (index > -1) {
       this.news.splice(index, 1);
+      this.newsById.delete(id);
+      this.unindexSearchRecord('news', id);
+      this.changeLogs.news.record(id, true);
+      this.events.publish('news.deleted', { news_id: id });
       return { message: 'News deleted' };
     }
     throw new Error('News not found');
   }
 
+  async deleteNewsBulk(ids) {
+    const { kept, removed, notFound } = this.splitByIds(this.news, ids);
+    this.news = kept;
+    removed.forEach(item => {
+      this.newsById.delete(item.id);
+      this.unindexSearchRecord('news', item.id);
+      this.changeLogs.news.record(item.id, true);
+    });
+    if (removed.length > 0) {
+      this.events.publish('news.deleted', { news_ids: removed.map(item => item.id) });
+    }
+    return this.bulkDeleteResult('news items', removed, notFound);
+  }
+
+  // News changed since a change-log version (see getAlertChanges)
+  async getNewsChanges(since) {
+    const log = this.changeLogs.news;
+    const changes = log.since(since);
+    if (changes.full) {
+      return { version: log.version, full: true, items: [...this.news], deleted: [] };
+    }
+    return {
+      version: log.version,
+      full: false,
+      items: changes.changed.map(id => this.newsById.get(id)),
+      deleted: changes.deleted
+    };
+  }
+
   // Task methods
   async getTasks() {
     return this.tasks;
@@ -654,7 +1840,7 @@ class DataService {
 
   async createTask(taskData) {
     const newTask = {
-      id: `task_${Date.now()}`,
+      id: `task_${Date.now()}_${++this.recordSequence}`,
       ...taskData,
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString()
@@ -685,6 +1871,12 @@ class DataService {
     throw new Error('Task not found');
   }
 
+  async deleteTasksBulk(ids) {
+    const { kept, removed, notFound } = this.splitByIds(this.tasks, ids);
+    this.tasks = kept;
+    return this.bulkDeleteResult('tasks', removed, notFound);
+  }
+
   // Knowledge methods
   async getKnowledge() {
     return this.knowledge;
@@ -692,12 +1884,13 @@ class DataService {
 
   async createKnowledge(knowledgeData) {
     const newKnowledge = {
-      id: `knowledge_${Date.now()}`,
+      id: `knowledge_${Date.now()}_${++this.recordSequence}`,
       ...knowledgeData,
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString()
     };
     this.knowledge.unshift(newKnowledge);
+    this.indexSearchRecord('knowledge', newKnowledge);
     return newKnowledge;
   }
 
@@ -709,6 +1902,7 @@ class DataService {
         ...knowledgeData,
         updated_at: new Date().toISOString()
       };
+      this.indexSearchRecord('knowledge', this.knowledge[index]);
       return this.knowledge[index];
     }
     throw new Error('Knowledge not found');
@@ -718,11 +1912,19 @@ class DataService {
     const index = this.knowledge.findIndex(k => k.id === id);
     if (index > -1) {
       this.knowledge.splice(index, 1);
+      this.unindexSearchRecord('knowledge', id);
       return { message: 'Knowledge deleted' };
     }
     throw new Error('Knowledge not found');
   }
 
+  async deleteKnowledgeBulk(ids) {
+    const { kept, removed, notFound } = this.splitByIds(this.knowledge, ids);
+    this.knowledge = kept;
+    removed.forEach(article => this.unindexSearchRecord('knowledge', article.id));
+    return this.bulkDeleteResult('knowledge articles', removed, notFound);
+  }
+
   // Help methods
   async getHelp() {
     return this.help;
@@ -730,13 +1932,14 @@ class DataService {
 
   async createHelp(helpData) {
     const newHelp = {
-      id: `help_${Date.now()}`,
+      id: `help_${Date.now()}_${++this.recordSequence}`,
       ...helpData,
       replies: [],
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString()
     };
     this.help.unshift(newHelp);
+    this.indexSearchRecord('help', newHelp);
     return newHelp;
   }
 
@@ -748,6 +1951,7 @@ class DataService {
         ...helpData,
         updated_at: new Date().toISOString()
       };
+      this.indexSearchRecord('help', this.help[index]);
       return this.help[index];
     }
     throw new Error('Help request not found');
@@ -757,12 +1961,13 @@ class DataService {
     const index = this.help.findIndex(h => h.id === id);
     if (index > -1) {
       const reply = {
-        id: `reply_${Date.now()}`,
+        id: `reply_${Date.now()}_${++this.recordSequence}`,
         ...replyData,
         created_at: new Date().toISOString()
       };
       this.help[index].replies.push(reply);
       this.help[index].updated_at = new Date().toISOString();
+      this.indexSearchRecord('help', this.help[index]);
       return reply;
     }
     throw new Error('Help request not found');
@@ -772,15 +1977,64 @@ class DataService {
     const index = this.help.findIndex(h => h.id === id);
     if (index > -1) {
       this.help.splice(index, 1);
+      this.unindexSearchRecord('help', id);
       return { message: 'Help request deleted' };
     }
     throw new Error('Help request not found');
   }
 
+  async deleteHelpBulk(ids) {
+    const { kept, removed, notFound } = this.splitByIds(this.help, ids);
+    this.help = kept;
+    removed.forEach(request => this.unindexSearchRecord('help', request.id));
+    return this.bulkDeleteResult('help requests', removed, notFound);
+  }
+
+  // ===== BULK DELETE HELPERS =====
+  // Bulk deletes make one pass over the collection instead of one
+  // findIndex/splice per id
+
+  requireBulkItems(items, label) {
+    if (!Array.isArray(items) || items.length === 0) {
+      throw new Error(`No ${label} provided`);
+    }
+  }
+
+  // Split records into those kept and those matching one of `ids`;
+  // getIds lists the ids a record can be addressed by
+  splitByIds(records, ids, getIds = record => [record.id]) {
+    this.requireBulkItems(ids, 'ids');
+    const wanted = new Set(ids);
+    const matched = new Set();
+    const kept = [];
+    const removed = [];
+    records.forEach(record => {
+      const hits = getIds(record).filter(id => wanted.has(id));
+      if (hits.length > 0) {
+        hits.forEach(id => matched.add(id));
+        removed.push(record);
+      } else {
+        kept.push(record);
+      }
+    });
+    return { kept, removed, notFound: [...wanted].filter(id => !matched.has(id)) };
+  }
+
+  bulkDeleteResult(label, removed, notFound) {
+    return {
+      message: `${removed.length} ${label} deleted`,
+      deleted: removed.length,
+      deleted_ids: removed.map(record => record.id),
+      not_found: notFound
+    };
+  }
+
   // Meeting Rooms methods
+  // Pure read: rooms carry only a booking summary, kept current by the
+  // background sweeper; full bookings come from getMeetingRoomSchedule /
+  // getBookingHistory
   async getMeetingRooms(filters = {}) {
-    // Clean up expired bookings first
-    this.cleanupExpiredBookings(this.meetingRooms);
+    this.syncMeetingRoomsFromStorage();
     
     let filtered = [...this.meetingRooms];
     
@@ -796,102 +2050,557 @@ class DataService {
       filtered = filtered.filter(room => room.status === filters.status);
     }
     
-    // Save any changes made by cleanup
-    this.saveMeetingRoomsToStorage();
-    
     return filtered;
   }
 
-  async bookMeetingRoom(roomId, bookingData) {
-    const room = this.meetingRooms.find(r => r.id === roomId);
-    if (!room) {
-      throw new Error('Meeting room not found');
-    }
-
-    // Check if room is already booked
-    if (room.status === 'occupied') {
-      throw new Error('Room is already booked. Multiple bookings are not allowed.');
-    }
+  // Earliest free slots across all matching rooms
+  // params: location, floor, min_capacity, duration (minutes, default 30),
+  //   from / to (window, default now .. now + 7 days), limit (default 10)
+  // Each room's free gaps come out of its interval index in time order;
+  // a min-heap merges those streams so only `limit` slots are produced
+  async getMeetingRoomAvailability(params = {}) {
+    if (!this.isLoaded) await this.loadAllData();
 
-    // Validate booking times
-    const startTime = new Date(bookingData.start_time);
-    const endTime = new Date(bookingData.end_time);
-    const now = new Date();
+    const duration = (parseFloat(params.duration) || 30) * 60 * 1000;
+    const from = params.from ? toEpoch(params.from) : Date.now();
+    const to = params.to ? toEpoch(params.to) : from + 7 * 24 * 60 * 60 * 1000;
+    const limit = Math.max(parseInt(params.limit, 10) || 10, 1);
+    const minCapacity = parseInt(params.min_capacity, 10) || 0;
 
-    if (startTime < now) {
-      throw new Error('Cannot book a room for past time');
+    if (isNaN(from) || isNaN(to) || to <= from) {
+      throw new Error('Invalid availability window');
     }
-
-    if (endTime <= startTime) {
-      throw new Error('End time must be after start time');
+    if (duration <= 0) {
+      throw new Error('Duration must be positive');
     }
 
-    const booking = {
-      id: `booking_${Date.now()}`,
-      ...bookingData,
-      room_id: roomId,
-      room_name: room.name,
-      created_at: new Date().toISOString()
-    };
+    const rooms = this.meetingRooms.filter(room =>
+      (!params.location || room.location === params.location) &&
+      (!params.floor || room.floor === params.floor) &&
+      room.capacity >= minCapacity
+    );
 
-    room.bookings = [booking];
-    room.current_booking = booking;
-    room.status = 'occupied';
+    const heap = new MinHeap(entry => entry.slot.start);
+    rooms.forEach(room => {
+      const slots = this.bookingIndex.iterateFreeSlots(room.id, from, to, duration);
+      const first = slots.next();
+      if (!first.done) {
+        heap.push({ room, slots, slot: first.value });
+      }
+    });
 
-    // Save to localStorage
-    this.saveMeetingRoomsToStorage();
+    const results = [];
+    while (heap.size > 0 && results.length < limit) {
+      const entry = heap.pop();
+      const { room, slot } = entry;
+      results.push({
+        room_id: room.id,
+        room_name: room.name,
+        location: room.location,
+        floor: room.floor,
+        capacity: room.capacity,
+        start_time: new Date(slot.start).toISOString(),
+        end_time: new Date(slot.start + duration).toISOString(),
+        available_until: new Date(slot.end).toISOString()
+      });
+
+      const next = entry.slots.next();
+      if (!next.done) {
+        entry.slot = next.value;
+        heap.push(entry);
+      }
+    }
+
+    return results;
+  }
+
+  // Bookings of one room overlapping [from, to) (default: the next 7 days),
+  // with recurring bookings expanded into occurrences for that window only
+  async getMeetingRoomSchedule(roomId, params = {}) {
+    if (!this.isLoaded) await this.loadAllData();
+    this.syncMeetingRoomsFromStorage();
+
+    const room = this.meetingRooms.find(r => r.id === roomId);
+    if (!room) {
+      throw new Error('Meeting room not found');
+    }
+
+    const from = params.from ? toEpoch(params.from) : Date.now();
+    const to = params.to ? toEpoch(params.to) : from + 7 * 24 * 60 * 60 * 1000;
+    if (isNaN(from) || isNaN(to) || to <= from) {
+      throw new Error('Invalid schedule window');
+    }
+
+    const schedule = [];
+    for (const interval of this.bookingIndex.busyIntervals(roomId, from, to)) {
+      schedule.push(this.resolveBooking(interval));
+    }
+    return schedule;
+  }
+
+  // Bookings of one employee starting in [from, to) (default: the next
+  // 30 days), read from the (employee_id, start) index
+  async getEmployeeBookings(employeeId, params = {}) {
+    if (!this.isLoaded) await this.loadAllData();
+    this.syncMeetingRoomsFromStorage();
+
+    const { from, to } = this.employeeBookingWindow(params);
+    const bookings = [];
+    for (const interval of this.employeeBookingIndex.startingBetween(employeeId, from, to)) {
+      bookings.push(this.resolveBooking(interval));
+    }
+    return bookings;
+  }
+
+  // The same bookings as an iCalendar file, streamed one event at a time
+  // Resolves to a ReadableStream of UTF-8 bytes
+  async getEmployeeBookingsCalendar(employeeId, params = {}) {
+    if (!this.isLoaded) await this.loadAllData();
+    this.syncMeetingRoomsFromStorage();
+
+    const { from, to } = this.employeeBookingWindow(params);
+    const employee = this.employeeById.get(employeeId);
+    const chunks = this.calendarExport.chunks(
+      this.iterateEmployeeCalendarEntries(employeeId, from, to),
+      employee ? `Meeting Room Bookings - ${employee.name}` : 'Meeting Room Bookings'
+    );
+    const encoder = new TextEncoder();
+
+    return new ReadableStream({
+      pull(controller) {
+        const next = chunks.next();
+        if (next.done) {
+          controller.close();
+        } else {
+          controller.enqueue(encoder.encode(next.value));
+        }
+      }
+    });
+  }
+
+  *iterateEmployeeCalendarEntries(employeeId, from, to) {
+    const roomsById = new Map(this.meetingRooms.map(room => [room.id, room]));
+    for (const interval of this.employeeBookingIndex.startingBetween(employeeId, from, to)) {
+      const booking = this.resolveBooking(interval);
+      yield { booking, room: roomsById.get(booking.room_id) || null };
+    }
+  }
+
+  employeeBookingWindow(params) {
+    const from = params.from ? toEpoch(params.from) : Date.now();
+    const to = params.to ? toEpoch(params.to) : from + EMPLOYEE_BOOKINGS_DAYS * 24 * 60 * 60 * 1000;
+    if (isNaN(from) || isNaN(to) || to <= from) {
+      throw new Error('Invalid booking window');
+    }
+    return { from, to };
+  }
+
+  // Ended bookings of one room or one employee, newest first
+  // params: room_id or employee_id, before (default now), limit, cursor
+  // Recurring bookings are not included
+  async getBookingHistory(params = {}) {
+    if (!this.isLoaded) await this.loadAllData();
+    this.syncMeetingRoomsFromStorage();
+
+    let index;
+    let key;
+    if (params.room_id) {
+      index = this.bookingIndex;
+      key = params.room_id;
+    } else if (params.employee_id) {
+      index = this.employeeBookingIndex;
+      key = params.employee_id;
+    } else {
+      throw new Error('room_id or employee_id is required');
+    }
+
+    const before = params.before ? toEpoch(params.before) : Date.now();
+    if (isNaN(before)) {
+      throw new Error('Invalid before date');
+    }
+    const limit = Math.min(Math.max(parseInt(params.limit, 10) || DEFAULT_HISTORY_PAGE_SIZE, 1), MAX_HISTORY_PAGE_SIZE);
+
+    const intervals = index.intervals(key);
+    let position = index.countStartingBefore(intervals, before) - 1;
+
+    // Cursor is "<start>:<id>" of the last booking on the previous page;
+    // the index is ordered by (start, id), so the page continues right
+    // below that key, whether or not the booking still exists
+    if (params.cursor) {
+      const separator = String(params.cursor).indexOf(':');
+      const cursorStart = parseInt(String(params.cursor).slice(0, separator), 10);
+      const cursorId = String(params.cursor).slice(separator + 1);
+      if (separator === -1 || isNaN(cursorStart)) {
+        throw new Error('Invalid cursor');
+      }
+      position = Math.min(position, index.countBefore(intervals, cursorStart, cursorId) - 1);
+    }
+
+    const items = [];
+    for (; position >= 0 && items.length < limit; position--) {
+      const interval = intervals[position];
+      if (interval.end > before) continue; // still running at `before`
+      items.push(this.bookings.get(interval.id));
+    }
+
+    const last = items[items.length - 1];
+    return {
+      items: items,
+      limit: limit,
+      next_cursor: items.length === limit && position >= 0
+        ? `${toEpoch(last.start_time)}:${last.id}`
+        : null
+    };
+  }
+
+  async bookMeetingRoom(roomId, bookingData) {
+    return this.withMeetingRoomsLock(() => this.applyBooking(roomId, bookingData));
+  }
+
+  // Conflict check and insert as one step; runs under the meeting rooms lock
+  applyBooking(roomId, bookingData) {
+    this.syncMeetingRoomsFromStorage();
+
+    const room = this.meetingRooms.find(r => r.id === roomId);
+    if (!room) {
+      throw new Error('Meeting room not found');
+    }
+
+    // Validate booking times (compared as UTC epoch milliseconds)
+    const startTime = toEpoch(bookingData.start_time);
+    const endTime = toEpoch(bookingData.end_time);
+
+    if (isNaN(startTime) || isNaN(endTime)) {
+      throw new Error('Invalid start or end time');
+    }
+
+    if (startTime < Date.now()) {
+      throw new Error('Cannot book a room for past time');
+    }
+
+    if (endTime <= startTime) {
+      throw new Error('End time must be after start time');
+    }
+
+    if (bookingData.recurrence) {
+      return this.applyRecurringBooking(room, bookingData, startTime, endTime);
+    }
+
+    // Check for an overlapping booking in O(log n), plus one lookup per recurring booking
+    const conflict = this.bookingIndex.findConflict(roomId, startTime, endTime);
+    if (conflict) {
+      throw new Error(`Room is already booked from ${new Date(conflict.start).toLocaleString()} to ${new Date(conflict.end).toLocaleString()}`);
+    }
+
+    const booking = {
+      id: `booking_${Date.now()}_${++this.bookingSequence}`,
+      ...bookingData,
+      room_id: roomId,
+      room_name: room.name,
+      created_at: new Date().toISOString()
+    };
+
+    this.storeBooking(booking);
+    this.indexBooking(booking);
+    this.refreshRoomState(room);
+    this.trackRoomExpiry(room);
+    this.scheduleBookingSweep();
+
+    // Save to localStorage (only this booking's partition is rewritten)
+    this.saveBookingsToStorage();
+    this.bumpVersion('meetingRooms');
+    this.events.publish('booking.created', { room_id: roomId, booking_id: booking.id });
 
     console.log(`Room ${room.name} booked successfully for ${booking.employee_name}`);
     return booking;
   }
 
+  // Store a recurring booking as a single rule; its occurrences are
+  // expanded on demand. Runs under the meeting rooms lock.
+  applyRecurringBooking(room, bookingData, startTime, endTime) {
+    RecurrenceRule.validate(bookingData.recurrence, startTime, endTime);
+
+    const booking = {
+      id: `recurring_${Date.now()}_${++this.bookingSequence}`,
+      ...bookingData,
+      room_id: room.id,
+      room_name: room.name,
+      exceptions: [],
+      created_at: new Date().toISOString()
+    };
+
+    // Check every occurrence against single bookings and other rules
+    const conflict = this.bookingIndex.findRuleConflict(room.id, new RecurrenceRule(booking));
+    if (conflict) {
+      throw new Error(`Room is already booked from ${new Date(conflict.start).toLocaleString()} to ${new Date(conflict.end).toLocaleString()}`);
+    }
+
+    this.recurringBookings.set(booking.id, booking);
+    this.indexRecurringBooking(booking);
+    this.refreshRoomState(room);
+    this.trackRoomExpiry(room);
+    this.scheduleBookingSweep();
+
+    // Save to localStorage
+    this.saveBookingsToStorage();
+    this.bumpVersion('meetingRooms');
+    this.events.publish('booking.created', { room_id: room.id, booking_id: booking.id });
+
+    console.log(`Room ${room.name} booked (recurring ${booking.recurrence.frequency}) for ${booking.employee_name}`);
+    return booking;
+  }
+
   async cancelMeetingRoomBooking(roomId, bookingId = null) {
+    return this.withMeetingRoomsLock(() => this.applyCancellation(roomId, bookingId));
+  }
+
+  // Runs under the meeting rooms lock
+  applyCancellation(roomId, bookingId) {
+    this.syncMeetingRoomsFromStorage();
+
     const room = this.meetingRooms.find(r => r.id === roomId);
     if (!room) {
       throw new Error('Meeting room not found');
     }
 
-    if (room.status === 'vacant') {
-      throw new Error('No booking found to cancel');
-    }
+    // Cancel the given booking, or the current one when no id is passed.
+    // An occurrence id skips one occurrence; a recurring booking id
+    // cancels the whole series.
+    const targetId = bookingId || (room.current_booking && room.current_booking.id);
+    const occurrence = RecurrenceRule.parseOccurrenceId(targetId);
+    const series = this.recurringBookings.get(occurrence ? occurrence.ruleId : targetId);
+    const single = this.bookings.get(targetId);
 
     const roomName = room.name;
-    const employeeName = room.current_booking ? room.current_booking.employee_name : 'Unknown';
+    let cancelled;
+    if (series && series.room_id === roomId) {
+      if (occurrence) {
+        cancelled = this.skipOccurrence(series, occurrence.start);
+      } else {
+        this.recurringBookings.delete(series.id);
+        this.unindexRecurringBooking(series);
+        cancelled = series;
+      }
+    } else if (single && single.room_id === roomId) {
+      this.dropBooking(single);
+      cancelled = single;
+    } else {
+      throw new Error('No booking found to cancel');
+    }
+    const employeeName = cancelled.employee_name || 'Unknown';
 
-    room.bookings = [];
-    room.current_booking = null;
-    room.status = 'vacant';
+    this.refreshRoomState(room);
+    this.trackRoomExpiry(room);
+    this.scheduleBookingSweep();
 
     // Save to localStorage
-    this.saveMeetingRoomsToStorage();
+    this.saveBookingsToStorage();
+    this.bumpVersion('meetingRooms');
+    this.events.publish('booking.cancelled', { room_id: roomId, booking_id: targetId });
 
     console.log(`Booking cancelled for ${roomName} (previously booked by ${employeeName})`);
     return { message: 'Booking cancelled successfully', room_name: roomName };
   }
 
-  async clearAllMeetingRoomBookings() {
-    let cancelledCount = 0;
-    
+  // Cancel many bookings (single, series or occurrence ids, in any rooms)
+  // with one save and one notification
+  async cancelMeetingRoomBookingsBulk(bookingIds) {
+    return this.withMeetingRoomsLock(() => this.applyBulkCancellation(bookingIds));
+  }
+
+  // Runs under the meeting rooms lock
+  applyBulkCancellation(bookingIds) {
+    this.requireBulkItems(bookingIds, 'booking ids');
+    this.syncMeetingRoomsFromStorage();
+
+    const cancelledIds = [];
+    const notFound = [];
+    const roomIds = new Set();
+    new Set(bookingIds).forEach(bookingId => {
+      const occurrence = RecurrenceRule.parseOccurrenceId(bookingId);
+      const series = this.recurringBookings.get(occurrence ? occurrence.ruleId : bookingId);
+      const single = this.bookings.get(bookingId);
+      try {
+        if (series && occurrence) {
+          this.skipOccurrence(series, occurrence.start);
+          roomIds.add(series.room_id);
+        } else if (series) {
+          this.recurringBookings.delete(series.id);
+          this.unindexRecurringBooking(series);
+          roomIds.add(series.room_id);
+        } else if (single) {
+          this.dropBooking(single);
+          roomIds.add(single.room_id);
+        } else {
+          notFound.push(bookingId);
+          return;
+        }
+        cancelledIds.push(bookingId);
+      } catch (error) {
+        notFound.push(bookingId); // occurrence already skipped or out of range
+      }
+    });
+
     this.meetingRooms.forEach(room => {
+      if (!roomIds.has(room.id)) return;
+      this.refreshRoomState(room);
+      this.trackRoomExpiry(room);
+    });
+    this.scheduleBookingSweep();
+
+    if (cancelledIds.length > 0) {
+      // Save to localStorage
+      this.saveBookingsToStorage();
+      this.bumpVersion('meetingRooms');
+      this.events.publish('booking.cancelled', { booking_ids: cancelledIds });
+    }
+
+    return {
+      message: `${cancelledIds.length} bookings cancelled`,
+      cancelled: cancelledIds.length,
+      cancelled_ids: cancelledIds,
+      not_found: notFound
+    };
+  }
+
+  // Record one occurrence of a recurring booking as an exception
+  skipOccurrence(series, start) {
+    const rule = this.bookingIndex.roomRules(series.room_id).get(series.id);
+    const occurrence = rule && rule.occurrenceIn(start, start + 1);
+    if (!occurrence || occurrence.start !== start) {
+      throw new Error('No booking found to cancel');
+    }
+
+    series.exceptions = [...(series.exceptions || []), new Date(start).toISOString()];
+    this.indexRecurringBooking(series);
+    return rule.materialize(occurrence);
+  }
+
+  // Clear a room's recurring bookings inside [from, to). A series fully
+  // inside the window is removed; otherwise its occurrences in the window
+  // become exceptions, or the series is cut short when the window has no end.
+  // Returns the cleared series / occurrence ids.
+  clearRecurringBookings(room, from, to) {
+    const clearedIds = [];
+
+    [...this.bookingIndex.roomRules(room.id).values()].forEach(rule => {
+      const series = this.recurringBookings.get(rule.id);
+      const first = rule.occurrenceIn(from, to);
+      if (!first) return;
+
+      // Nothing would be left when the window reaches the first occurrence
+      // (which may already be running) and covers the last one
+      if (first.start <= rule.start && to >= rule.lastEnd) {
+        this.recurringBookings.delete(series.id);
+        this.unindexRecurringBooking(series);
+        clearedIds.push(series.id);
+        return;
+      }
+
+      if (to === Infinity) {
+        series.recurrence = { ...series.recurrence, until: new Date(first.start - 1).toISOString() };
+        clearedIds.push(series.id);
+      } else {
+        const skipped = [...rule.occurrences(from, to)];
+        series.exceptions = [
+          ...(series.exceptions || []),
+          ...skipped.map(occurrence => new Date(occurrence.start).toISOString())
+        ];
+        clearedIds.push(...skipped.map(occurrence => occurrence.id));
+      }
+      this.indexRecurringBooking(series);
+    });
+
+    return clearedIds;
+  }
+
+  async clearAllMeetingRoomBookings(filters = {}) {
+    return this.withMeetingRoomsLock(() => this.applyClearAllBookings(filters));
+  }
+
+  // Clear bookings in one pass and one save. Optional filters: room_id,
+  // location, floor, and a from/to window (bookings overlapping it are
+  // cleared). Ended bookings are history and are never cleared.
+  // Runs under the meeting rooms lock.
+  applyClearAllBookings(filters = {}) {
+    this.syncMeetingRoomsFromStorage();
+
+    const requestedFrom = filters.from ? toEpoch(filters.from) : -Infinity;
+    const to = filters.to ? toEpoch(filters.to) : Infinity;
+    if (isNaN(requestedFrom) || isNaN(to) || to <= requestedFrom) {
+      throw new Error('Invalid date range');
+    }
+    const from = Math.max(requestedFrom, Date.now());
+
+    const rooms = this.meetingRooms.filter(room =>
+      (!filters.room_id || room.id === filters.room_id) &&
+      (!filters.location || room.location === filters.location) &&
+      (!filters.floor || room.floor === filters.floor)
+    );
+
+    const clearedBookingIds = [];
+    let roomsUpdated = 0;
+    let cancelledCount = 0;
+
+    rooms.forEach(room => {
+      const removedIds = to > from ? this.bookingIndex.removeOverlapping(room.id, from, to) : [];
+      const clearedSeriesIds = to > from ? this.clearRecurringBookings(room, from, to) : [];
+      if (removedIds.length === 0 && clearedSeriesIds.length === 0) return;
+
       if (room.status === 'occupied') {
         cancelledCount++;
       }
-      room.bookings = [];
-      room.current_booking = null;
-      room.status = 'vacant';
+      removedIds.forEach(id => this.dropBooking(this.bookings.get(id)));
+      this.refreshRoomState(room);
+      this.trackRoomExpiry(room);
+      clearedBookingIds.push(...removedIds, ...clearedSeriesIds);
+      roomsUpdated++;
     });
+    this.scheduleBookingSweep();
 
-    // Save to localStorage
-    this.saveMeetingRoomsToStorage();
+    if (roomsUpdated > 0) {
+      // Save to localStorage
+      this.saveBookingsToStorage();
+      this.bumpVersion('meetingRooms');
+      this.events.publish('booking.cleared', { booking_ids: clearedBookingIds });
+    }
 
-    console.log(`Cleared all bookings: ${cancelledCount} rooms were occupied, now all ${this.meetingRooms.length} rooms are vacant`);
+    const scope = this.describeClearScope(filters, rooms);
+    console.log(`Cleared ${clearedBookingIds.length} bookings across ${roomsUpdated} of ${rooms.length} matching rooms`);
+    // rooms_updated keeps its meaning: every room in scope, now clear
     return { 
-      message: 'All bookings cleared successfully',
-      rooms_updated: this.meetingRooms.length,
-      previously_occupied: cancelledCount
+      message: clearedBookingIds.length > 0
+        ? `${clearedBookingIds.length} booking${clearedBookingIds.length === 1 ? '' : 's'} cleared from ${scope}`
+        : `No bookings to clear in ${scope}`,
+      scope: scope,
+      cleared_count: clearedBookingIds.length,
+      rooms_updated: rooms.length,
+      rooms_changed: roomsUpdated,
+      previously_occupied: cancelledCount,
+      cleared_booking_ids: clearedBookingIds
     };
   }
 
+  // Human-readable scope of a clear-bookings request, e.g.
+  // "rooms at IFC, 14th Floor from 10/17/2026, 10:00:00 AM"
+  describeClearScope(filters, rooms) {
+    let scope;
+    if (filters.room_id) {
+      scope = rooms.length > 0 ? rooms[0].name : `room ${filters.room_id}`;
+    } else if (filters.location || filters.floor) {
+      scope = `rooms at ${[filters.location, filters.floor].filter(Boolean).join(', ')}`;
+    } else {
+      scope = 'all rooms';
+    }
+    if (filters.from) {
+      scope += ` from ${new Date(toEpoch(filters.from)).toLocaleString()}`;
+    }
+    if (filters.to) {
+      scope += ` until ${new Date(toEpoch(filters.to)).toLocaleString()}`;
+    }
+    return scope;
+  }
+
   // Attendance methods
   async getAttendance(searchParams = {}) {
     let filtered = [...this.attendance];
@@ -909,7 +2618,7 @@ class DataService {
 
   async createAttendance(attendanceData) {
     const newAttendance = {
-      id: `att_${Date.now()}`,
+      id: `att_${Date.now()}_${++this.recordSequence}`,
       ...attendanceData,
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString()
@@ -925,15 +2634,439 @@ class DataService {
 
   async createPolicy(policyData) {
     const newPolicy = {
-      id: `policy_${Date.now()}`,
+      id: `policy_${Date.now()}_${++this.recordSequence}`,
       ...policyData,
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString()
     };
     this.policies.unshift(newPolicy);
+    this.indexSearchRecord('policies', newPolicy);
     return newPolicy;
   }
 
+  async updatePolicy(id, policyData) {
+    const policy = this.policies.find(p => p.id === id);
+    if (!policy) {
+      throw new Error('Policy not found');
+    }
+
+    Object.assign(policy, policyData, {
+      updated_at: new Date().toISOString()
+    });
+    this.indexSearchRecord('policies', policy);
+    return policy;
+  }
+
+  async deletePolicy(id) {
+    const index = this.policies.findIndex(p => p.id === id);
+    if (index === -1) {
+      throw new Error('Policy not found');
+    }
+
+    this.policies.splice(index, 1);
+    this.unindexSearchRecord('policies', id);
+    return { message: 'Policy deleted successfully' };
+  }
+
+  // ===== POLICY DOCUMENTS =====
+  // The policy PDFs are read once: their text is extracted, cached in
+  // localStorage under the file's signature and split into chunks for the
+  // policy chunk index. Later loads re-extract only a PDF whose signature
+  // changed, and searches only ever read the index.
+
+  // Check every policy PDF and (re)index the ones that changed; resolves
+  // to the ingestion status. Concurrent calls share one run.
+  ingestPolicyDocuments() {
+    if (!this.policyIngestion) {
+      this.policyIngestion = this.runPolicyIngestion().finally(() => {
+        this.policyIngestion = null;
+      });
+    }
+    return this.policyIngestion.then(() => this.getPolicyIngestionStatus());
+  }
+
+  // One document at a time, so the PDFs are never all in memory at once
+  async runPolicyIngestion() {
+    for (const document of POLICY_DOCUMENTS) {
+      try {
+        await this.ingestPolicyDocument(document);
+      } catch (error) {
+        console.error(`Error indexing policy document ${document.title}:`, error);
+        this.policyDocumentState.set(document.id, {
+          ...this.policyDocumentState.get(document.id),
+          error: error.message
+        });
+      }
+    }
+  }
+
+  async ingestPolicyDocument(document) {
+    const url = POLICY_DOCUMENTS_PATH + document.file;
+    const source = await this.getFileSignature(url);
+    const state = this.policyDocumentState.get(document.id);
+    if (state && state.signature === source.signature && !state.error) return;
+
+    let pages = this.loadPolicyText(document.id, source.signature);
+    if (!pages) {
+      let arrayBuffer = source.arrayBuffer;
+      if (!arrayBuffer) {
+        const response = await fetch(url);
+        if (!response.ok) {
+          throw new Error(`Failed to fetch ${url}: ${response.status}`);
+        }
+        arrayBuffer = await response.arrayBuffer();
+      }
+      pages = await this.pdfTextExtractor.extract(arrayBuffer);
+      this.savePolicyText(document.id, source.signature, pages);
+      console.log(`Extracted ${pages.length} pages from ${document.title}`);
+    }
+
+    const chunks = this.chunkPolicyText(pages);
+    this.unindexPolicyDocument(document.id);
+    chunks.forEach((chunk, position) => {
+      this.policyChunkIndex.add(`${document.id}#${position}`, {
+        type: 'policy_document',
+        id: document.id,
+        title: document.title,
+        text: chunk.text,
+        meta: { page: chunk.page }
+      });
+    });
+    this.policyDocumentState.set(document.id, {
+      signature: source.signature,
+      pages: pages.length,
+      chunks: chunks.length,
+      error: null
+    });
+  }
+
+  unindexPolicyDocument(documentId) {
+    const state = this.policyDocumentState.get(documentId);
+    for (let position = 0; state && position < state.chunks; position++) {
+      this.policyChunkIndex.remove(`${documentId}#${position}`);
+    }
+  }
+
+  // Split page texts into chunks of about POLICY_CHUNK_SIZE characters at
+  // paragraph (then line, then word) boundaries; chunks never span pages
+  chunkPolicyText(pages) {
+    const chunks = [];
+    pages.forEach((pageText, index) => {
+      let current = '';
+      const flush = () => {
+        if (current.trim()) chunks.push({ page: index + 1, text: current.trim() });
+        current = '';
+      };
+      const append = (piece, separator) => {
+        if (current && current.length + piece.length > POLICY_CHUNK_SIZE) flush();
+        current += (current ? separator : '') + piece;
+      };
+
+      pageText.split(/\n{2,}/).forEach(paragraph => {
+        if (paragraph.length <= POLICY_CHUNK_SIZE) {
+          append(paragraph, '\n\n');
+          return;
+        }
+        paragraph.split('\n').forEach(line => {
+          if (line.length <= POLICY_CHUNK_SIZE) {
+            append(line, '\n');
+            return;
+          }
+          line.split(' ').forEach(word => append(word, ' '));
+        });
+      });
+      flush();
+    });
+    return chunks;
+  }
+
+  loadPolicyText(documentId, signature) {
+    try {
+      const saved = localStorage.getItem(POLICY_TEXT_PREFIX + documentId);
+      if (!saved) return null;
+      const cached = JSON.parse(saved);
+      return cached.format === POLICY_TEXT_FORMAT && cached.signature === signature ? cached.pages : null;
+    } catch (error) {
+      console.error('Error loading cached policy text:', error);
+      return null;
+    }
+  }
+
+  savePolicyText(documentId, signature, pages) {
+    try {
+      localStorage.setItem(POLICY_TEXT_PREFIX + documentId, JSON.stringify({
+        format: POLICY_TEXT_FORMAT,
+        signature: signature,
+        pages: pages
+      }));
+    } catch (error) {
+      console.error('Error caching policy text:', error);
+    }
+  }
+
+  // The policy PDFs and how far each one is indexed
+  getPolicyDocuments() {
+    return POLICY_DOCUMENTS.map(document => {
+      const state = this.policyDocumentState.get(document.id) || {};
+      return {
+        id: document.id,
+        title: document.title,
+        category: document.category,
+        url: POLICY_DOCUMENTS_PATH + document.file,
+        indexed: Boolean(state.signature),
+        pages: state.pages || 0,
+        chunks: state.chunks || 0,
+        error: state.error || null
+      };
+    });
+  }
+
+  getPolicyIngestionStatus() {
+    const documents = this.getPolicyDocuments();
+    return {
+      running: this.policyIngestion !== null,
+      total: documents.length,
+      indexed: documents.filter(document => document.indexed).length,
+      failed: documents.filter(document => document.error).map(document => document.id),
+      chunks: this.policyChunkIndex.size
+    };
+  }
+
+  // Ranked passages from the policy PDFs
+  // params: q, limit. Resolves to { query, count, indexing, results:
+  // [{ document_id, title, category, url, page, score, snippet }] }
+  async searchPolicyDocuments(params = {}) {
+    const query = String(params.q || '').trim();
+    const limit = Math.min(Math.max(parseInt(params.limit, 10) || DEFAULT_SEARCH_LIMIT, 1), MAX_SEARCH_LIMIT);
+    const documents = new Map(POLICY_DOCUMENTS.map(document => [document.id, document]));
+
+    const results = query ? this.policyChunkIndex.search(query, { limit }) : [];
+    return {
+      query,
+      count: results.length,
+      indexing: this.policyIngestion !== null,
+      results: results.map(result => {
+        const document = documents.get(result.id);
+        return {
+          document_id: result.id,
+          title: result.title,
+          category: document.category,
+          url: POLICY_DOCUMENTS_PATH + document.file,
+          page: result.meta.page,
+          score: result.score,
+          snippet: result.snippet
+        };
+      })
+    };
+  }
+
+  // ===== FULL-TEXT SEARCH =====
+  // One inverted index over knowledge, news, policies and help threads
+  // (replies included), updated as each record is written
+
+  buildSearchIndex() {
+    this.searchIndex.clear();
+    Object.keys(SEARCH_SOURCES).forEach(collection => {
+      this[collection].forEach(record => this.indexSearchRecord(collection, record));
+    });
+  }
+
+  indexSearchRecord(collection, record) {
+    const source = SEARCH_SOURCES[collection];
+    this.searchIndex.add(`${source.type}:${record.id}`, {
+      type: source.type,
+      id: record.id,
+      title: source.title(record) || '',
+      text: source.text(record)
+    });
+  }
+
+  unindexSearchRecord(collection, id) {
+    this.searchIndex.remove(`${SEARCH_SOURCES[collection].type}:${id}`);
+  }
+
+  // Ranked matches across content types (GET /api/search?q=)
+  // params: q, types (array or comma-separated: knowledge, news, policy, help), limit
+  // Resolves to { query, count, results: [{ type, id, title, score, snippet }] }
+  async search(params = {}) {
+    const query = String(params.q || '').trim();
+    const limit = Math.min(Math.max(parseInt(params.limit, 10) || DEFAULT_SEARCH_LIMIT, 1), MAX_SEARCH_LIMIT);
+    const types = typeof params.types === 'string'
+      ? params.types.split(',').map(type => type.trim()).filter(Boolean)
+      : params.types || null;
+
+    const results = query ? this.searchIndex.search(query, { limit, types }) : [];
+    return {
+      query,
+      count: results.length,
+      results: results.map(({ key, meta, ...result }) => result)
+    };
+  }
+
+  // ===== CHAT =====
+  // Offline question answering: directory questions are answered from the
+  // employee index, everything else from the best passages of the policy
+  // PDF chunk index and the knowledge base. Answers are cached per question
+  // until either index or the employee data changes.
+
+  // Resolves to { response, sessionId, sources: [{ type, title, url, page }] }
+  async sendChatMessage(message, sessionId = null) {
+    const text = String(message || '').trim();
+    if (!text) {
+      throw new Error('Message is required');
+    }
+    if (!this.isLoaded) await this.loadAllData();
+
+    const session = sessionId || `chat_${Date.now()}_${++this.recordSequence}`;
+    this.chatHistory.add(session, { role: 'user', content: text, created_at: new Date().toISOString() });
+
+    const answer = this.answerChatQuestion(text);
+    this.chatHistory.add(session, {
+      role: 'assistant',
+      content: answer.response,
+      sources: answer.sources,
+      created_at: new Date().toISOString()
+    });
+    return { response: answer.response, sessionId: session, sources: answer.sources };
+  }
+
+  async getChatHistory(sessionId) {
+    return this.chatHistory.get(sessionId);
+  }
+
+  async clearChatHistory(sessionId) {
+    this.chatHistory.clear(sessionId);
+    return { message: 'Chat history cleared' };
+  }
+
+  answerChatQuestion(question) {
+    const normalized = tokenize(question).join(' ');
+    const key = [
+      this.versions.employees.version,
+      this.searchIndex.version,
+      this.policyChunkIndex.version,
+      DIRECTORY_QUESTION.test(question) ? 'directory' : 'passages',
+      normalized || question.toLowerCase()
+    ].join('|');
+
+    let answer = this.chatAnswers.get(key);
+    if (answer) {
+      this.chatAnswers.delete(key); // re-inserted below as most recent
+    } else {
+      answer = this.answerFromDirectory(question) || this.answerFromPassages(question);
+      if (this.chatAnswers.size >= CHAT_CACHE_SIZE) {
+        this.chatAnswers.delete(this.chatAnswers.keys().next().value);
+      }
+    }
+    this.chatAnswers.set(key, answer);
+    return answer;
+  }
+
+  // Employees a directory question names, or null if it is not one
+  answerFromDirectory(question) {
+    if (!DIRECTORY_QUESTION.test(question)) return null;
+
+    const words = question.toLowerCase().replace(/'s\b/g, '').match(/[a-z0-9]+/g) || [];
+    const byId = words.map(word => this.employeeById.get(word) || this.employeeById.get(word.toUpperCase())).filter(Boolean);
+    const name = words.filter(word => !DIRECTORY_FILLER.has(word)).join(' ');
+
+    const employees = byId.length > 0
+      ? byId
+      : name ? [...this.employeeSearchIndex.lookup(name, ['name'])].map(id => this.employeeById.get(id)).filter(Boolean) : [];
+    if (employees.length === 0) return null;
+
+    if (employees.length > CHAT_DIRECTORY_MATCHES) {
+      const names = employees.slice(0, CHAT_DIRECTORY_MATCHES).map(emp => `${emp.name} (${emp.department || 'No department'})`);
+      return {
+        response: `I found ${employees.length} employees matching "${name}", including ${names.join(', ')}. Please use the full name or employee ID.`,
+        sources: []
+      };
+    }
+
+    const cards = employees.map(emp => {
+      const manager = emp.reportingManager && emp.reportingManager !== '*' ? emp.reportingManager : null;
+      return [
+        `${emp.name} (${emp.id})`,
+        [emp.department, emp.grade, emp.location].filter(Boolean).join(', '),
+        emp.mobile ? `Mobile: ${emp.mobile}` : null,
+        emp.extension && emp.extension !== '0' ? `Extension: ${emp.extension}` : null,
+        emp.email ? `Email: ${emp.email}` : null,
+        manager ? `Reports to: ${manager}` : null
+      ].filter(Boolean).join('\n');
+    });
+    return {
+      response: cards.join('\n\n'),
+      sources: employees.map(emp => ({ type: 'employee', title: emp.name, id: emp.id }))
+    };
+  }
+
+  // The best passages across policy PDFs and knowledge articles, answered
+  // with the sentences of the top passage that match the question best.
+  // BM25 scores from the two indexes are not comparable, so passages are
+  // ranked by how many of the question's terms they contain first.
+  answerFromPassages(question) {
+    const documents = new Map(POLICY_DOCUMENTS.map(document => [document.id, document]));
+    const terms = new Set(tokenize(question));
+    const coverage = (index, key) => index.documents.get(key).terms.filter(term => terms.has(term)).length;
+    const passages = [
+      ...this.policyChunkIndex.search(question, { limit: CHAT_PASSAGES }).map(result => ({
+        ...result,
+        index: this.policyChunkIndex,
+        source: {
+          type: 'policy_document',
+          title: result.title,
+          url: POLICY_DOCUMENTS_PATH + documents.get(result.id).file,
+          page: result.meta.page
+        }
+      })),
+      ...this.searchIndex.search(question, { limit: CHAT_PASSAGES, types: ['knowledge', 'policy'] }).map(result => ({
+        ...result,
+        index: this.searchIndex,
+        source: { type: result.type, title: result.title, id: result.id }
+      }))
+    ]
+      .map(passage => ({ ...passage, coverage: coverage(passage.index, passage.key) }))
+      .sort((a, b) => b.coverage - a.coverage || b.score - a.score)
+      .slice(0, CHAT_PASSAGES);
+
+    if (passages.length === 0) {
+      const indexing = this.policyIngestion !== null ? ' The policy documents are still being indexed, so please try again shortly.' : '';
+      return {
+        response: `I couldn't find anything about that in the company policies or the knowledge base.${indexing} Try rephrasing, or ask about leave, attendance, travel or a colleague's contact details.`,
+        sources: []
+      };
+    }
+
+    const label = passage => (passage.source.page ? `${passage.title} (page ${passage.source.page})` : passage.title);
+    const [best, ...others] = passages;
+    const text = best.index.documents.get(best.key).text;
+    const related = [...new Set(others.map(label))].filter(where => where !== label(best));
+
+    let response = `According to ${label(best)}:\n${this.bestSentences(text, question)}`;
+    if (related.length > 0) {
+      response += `\n\nSee also: ${related.join('; ')}`;
+    }
+    return { response, sources: passages.map(passage => passage.source) };
+  }
+
+  // Up to CHAT_ANSWER_SENTENCES sentences sharing the most terms with the
+  // question, in their original order
+  bestSentences(text, question) {
+    const terms = new Set(tokenize(question));
+    const sentences = text.split(/(?<=[.!?])\s+|\n+/).map(sentence => sentence.trim()).filter(Boolean);
+    const ranked = sentences
+      .map((sentence, position) => ({
+        sentence,
+        position,
+        hits: tokenize(sentence).filter(term => terms.has(term)).length
+      }))
+      .filter(entry => entry.hits > 0)
+      .sort((a, b) => b.hits - a.hits || a.position - b.position)
+      .slice(0, CHAT_ANSWER_SENTENCES)
+      .sort((a, b) => a.position - b.position);
+    return ranked.length > 0 ? ranked.map(entry => entry.sentence).join(' ') : sentences.slice(0, CHAT_ANSWER_SENTENCES).join(' ');
+  }
+
   // Workflows methods
   async getWorkflows() {
     return this.workflows;
@@ -941,7 +3074,7 @@ class DataService {
 
   async createWorkflow(workflowData) {
     const newWorkflow = {
-      id: `workflow_${Date.now()}`,
+      id: `workflow_${Date.now()}_${++this.recordSequence}`,
       ...workflowData,
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString()
@@ -952,31 +3085,86 @@ class DataService {
 
   // ===== ALERTS MANAGEMENT =====
   
-  // Get all alerts with backend-compatible format
-  async getAlerts() {
-    const now = new Date();
-    return this.alerts.filter(alert => {
-      // Filter out expired alerts
-      if (alert.expires_at && new Date(alert.expires_at) < now) {
-        return false;
+  // Get unexpired alerts with backend-compatible format, highest priority
+  // first and newest first within a priority
+  // targetAudience 'all' returns every alert; any other audience gets the
+  // alerts aimed at it plus those aimed at everyone. limit returns just the
+  // top N without ordering the rest.
+  async getAlerts(targetAudience = 'all', limit = null) {
+    this.syncTimeBasedChanges('alerts');
+    const audience = targetAudience || 'all';
+    const count = parseInt(limit, 10);
+    if (!(count > 0)) {
+      return [...this.activeAlertsFor(audience)];
+    }
+    const cached = this.activeAlertsByAudience.get(audience);
+    return cached ? cached.slice(0, count) : this.alertIndex.list(audience, count);
+  }
+
+  // Alerts changed since a change-log version, for cheap polling
+  // Resolves to { version, full, items, deleted }: pass `version` back as
+  // `since` next time. items are the changed alerts this audience sees;
+  // deleted lists ids to drop (deleted, expired or retargeted). With no or
+  // a stale `since` (including one from an earlier page load), full is
+  // true and items is the whole list.
+  async getAlertChanges(since, targetAudience = 'all') {
+    this.syncTimeBasedChanges('alerts');
+    const audience = targetAudience || 'all';
+    const log = this.changeLogs.alerts;
+    const changes = log.since(since);
+    if (changes.full) {
+      return { version: log.version, full: true, items: await this.getAlerts(audience), deleted: [] };
+    }
+
+    const now = Date.now();
+    const items = [];
+    const deleted = [...changes.deleted];
+    changes.changed.forEach(id => {
+      const alert = this.alertById.get(id);
+      if (alert && this.alertVisibleTo(alert, audience, now)) {
+        items.push(alert);
+      } else {
+        deleted.push(id);
       }
-      return true;
     });
+    return { version: log.version, full: false, items, deleted };
   }
 
   // Get active alerts (for user display)
   getActiveAlerts() {
-    const now = new Date();
-    return this.alerts.filter(alert => 
-      alert.isActive && 
-      (!alert.expires_at || new Date(alert.expires_at) > now)
-    );
+    this.syncTimeBasedChanges('alerts');
+    return this.activeAlertsFor('all').filter(alert => alert.isActive);
   }
 
   // Create a new alert (Admin only) - Backend-compatible format
   async createAlert(alertData) {
-    const newAlert = {
-      id: `alert_${Date.now()}`,
+    const newAlert = this.buildAlert(alertData);
+    this.alerts.unshift(newAlert);
+    this.alertById.set(newAlert.id, newAlert);
+    this.indexAlert(newAlert);
+    this.alertsChanged('alert.created', newAlert.id);
+    return newAlert;
+  }
+
+  // Create many alerts (e.g. one broadcast per location) with one insert,
+  // one cache/version refresh and one notification (Admin only)
+  async createAlertsBulk(alertsData) {
+    this.requireBulkItems(alertsData, 'alerts');
+    const created = alertsData.map(alertData => this.buildAlert(alertData));
+    this.alerts.unshift(...created.slice().reverse());
+    created.forEach(alert => {
+      this.alertById.set(alert.id, alert);
+      this.indexAlert(alert);
+      this.changeLogs.alerts.record(alert.id);
+    });
+    this.alertsChanged();
+    this.events.publish('alert.created', { alert_ids: created.map(alert => alert.id) });
+    return { message: `${created.length} alerts created`, created: created.length, alerts: created };
+  }
+
+  buildAlert(alertData) {
+    return {
+      id: `alert_${Date.now()}_${++this.recordSequence}`,
       title: alertData.title || 'Alert',
       message: alertData.message || '',
       type: alertData.type || 'general', // general, system, announcement
@@ -987,8 +3175,6 @@ class DataService {
       created_at: new Date().toISOString(),
       updated_at: new Date().toISOString()
     };
-    this.alerts.unshift(newAlert);
-    return newAlert;
   }
 
   // Update alert (Admin only)
@@ -998,11 +3184,15 @@ class DataService {
       throw new Error('Alert not found');
     }
 
+    this.alertIndex.remove(this.alerts[alertIndex]);
     this.alerts[alertIndex] = {
       ...this.alerts[alertIndex],
       ...alertData,
       updated_at: new Date().toISOString()
     };
+    this.alertById.set(alertId, this.alerts[alertIndex]);
+    this.indexAlert(this.alerts[alertIndex]);
+    this.alertsChanged('alert.updated', alertId);
     
     return this.alerts[alertIndex];
   }
@@ -1014,10 +3204,29 @@ class DataService {
       throw new Error('Alert not found');
     }
 
-    const deletedAlert = this.alerts.splice(alertIndex, 1)[0];
+    this.alertIndex.remove(this.alerts[alertIndex]);
+    this.alerts.splice(alertIndex, 1);
+    this.alertById.delete(alertId);
+    this.alertsChanged('alert.deleted', alertId);
     return { message: 'Alert deleted successfully' };
   }
 
+  // Delete many alerts in one pass (Admin only)
+  async deleteAlertsBulk(alertIds) {
+    const { kept, removed, notFound } = this.splitByIds(this.alerts, alertIds);
+    this.alerts = kept;
+    removed.forEach(alert => {
+      this.alertIndex.remove(alert);
+      this.alertById.delete(alert.id);
+      this.changeLogs.alerts.record(alert.id, true);
+    });
+    if (removed.length > 0) {
+      this.alertsChanged();
+      this.events.publish('alert.deleted', { alert_ids: removed.map(alert => alert.id) });
+    }
+    return this.bulkDeleteResult('alerts', removed, notFound);
+  }
+
   // Toggle alert status (Admin only)
   toggleAlertStatus(alertId) {
     const alert = this.alerts.find(alert => alert.id === alertId);
@@ -1027,9 +3236,112 @@ class DataService {
 
     alert.isActive = !alert.isActive;
     alert.updated_at = new Date().toISOString();
+    this.alertsChanged('alert.updated', alertId);
     return alert;
   }
 
+  // Bump the alerts version, drop the cached active lists, recompute the
+  // next expiry deadline and notify subscribers (eventType is omitted for
+  // bulk/demo loads)
+  alertsChanged(eventType = null, alertId = null) {
+    if (alertId) {
+      this.changeLogs.alerts.record(alertId, eventType === 'alert.deleted');
+    }
+    this.activeAlertsByAudience.clear();
+    this.updateNextAlertExpiry();
+    this.bumpVersion('alerts');
+    if (eventType) {
+      this.events.publish(eventType, { alert_id: alertId });
+    }
+  }
+
+  // ===== ALERT INDEXES AND ACTIVE-ALERT CACHE =====
+  // Unexpired alerts sit in per-audience partitions kept in priority/recency
+  // order (see AlertIndex), updated on every write and when an alert
+  // expires. Expiry deadlines sit in a min-heap (a TTL index). The full list
+  // each audience sees is merged once and reused until the next alert write
+  // or the next expiry deadline, whichever comes first.
+
+  // Rebuild the id map, the audience partitions and the expiry index from this.alerts
+  indexAlerts() {
+    const now = Date.now();
+    this.alertById = new Map(this.alerts.map(alert => [alert.id, alert]));
+    this.alertIndex.build(this.alerts.filter(alert => !this.alertExpired(alert, now)));
+    this.alertExpiryIndex.clear();
+    this.alerts.forEach(alert => this.indexAlertExpiry(alert));
+  }
+
+  // Add a new or updated alert to the audience partitions and the expiry index
+  indexAlert(alert) {
+    if (this.alertExpired(alert, Date.now())) return;
+    this.alertIndex.add(alert);
+    this.indexAlertExpiry(alert);
+  }
+
+  indexAlertExpiry(alert) {
+    if (!alert.expires_at) return;
+    const expiry = toEpoch(alert.expires_at);
+    if (expiry > Date.now()) {
+      this.alertExpiryIndex.push({ expiry, alert });
+    }
+  }
+
+  activeAlertsFor(audience) {
+    if (!this.activeAlertsByAudience.has(audience)) {
+      this.activeAlertsByAudience.set(audience, this.alertIndex.list(audience));
+    }
+    return this.activeAlertsByAudience.get(audience);
+  }
+
+  alertExpired(alert, now) {
+    return Boolean(alert.expires_at) && toEpoch(alert.expires_at) <= now;
+  }
+
+  // Unexpired, and aimed at this audience (or at everyone)
+  alertVisibleTo(alert, audience, now) {
+    return !this.alertExpired(alert, now) &&
+      (audience === 'all' || alert.target_audience === 'all' || alert.target_audience === audience);
+  }
+
+  // Pop expired entries, and entries left behind by updates and deletes,
+  // off the expiry index; the top entry is the next deadline. Expired
+  // alerts leave their audience partition and are recorded as tombstones
+  // for delta readers.
+  updateNextAlertExpiry() {
+    const now = Date.now();
+    const index = this.alertExpiryIndex;
+    while (index.size > 0) {
+      const { expiry, alert } = index.peek();
+      const current = this.alertById.get(alert.id) === alert;
+      if (current && expiry > now) break;
+      index.pop();
+      if (current) {
+        this.alertIndex.remove(alert);
+        this.changeLogs.alerts.record(alert.id, true);
+      }
+    }
+    this.nextAlertExpiry = index.size > 0 ? index.peek().expiry : null;
+    this.scheduleAlertExpiry();
+  }
+
+  // Fire an 'alert.expired' event when the next alert runs out, so
+  // subscribers drop it without polling
+  scheduleAlertExpiry() {
+    clearTimeout(this.alertExpiryTimer);
+    this.alertExpiryTimer = null;
+    if (this.nextAlertExpiry === null) return;
+
+    const delay = Math.min(Math.max(this.nextAlertExpiry - Date.now(), 0), MAX_TIMER_DELAY);
+    this.alertExpiryTimer = setTimeout(() => {
+      this.alertExpiryTimer = null;
+      if (this.nextAlertExpiry !== null && Date.now() >= this.nextAlertExpiry) {
+        this.alertsChanged('alert.expired');
+      } else {
+        this.scheduleAlertExpiry();
+      }
+    }, delay);
+  }
+
   // Initialize demo alerts for testing
   initializeDemoAlerts() {
     // Only add demo alerts if alerts array is empty
@@ -1062,6 +3374,9 @@ class DataService {
       ];
       
       this.alerts = demoAlerts;
+      this.indexAlerts();
+      demoAlerts.forEach(alert => this.changeLogs.alerts.record(alert.id));
+      this.alertsChanged();
       console.log('Demo alerts initialized:', this.alerts.length);
     }
   }
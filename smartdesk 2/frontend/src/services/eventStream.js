@@ -0,0 +1,113 @@
+// Event Stream Service - in-process pub/sub for data change events
+// Writers publish compact events ({ seq, type, ts, ...ids }); subscribers
+// get them in batches instead of polling. Events of the `relay` types are
+// also relayed to other tabs through BroadcastChannel when the browser
+// supports it; only relay collections other tabs can actually re-read
+// (persisted ones), or their refetch comes back without the change.
+// A relayed event gets the receiver's next seq; the sender's is kept as
+// `remote_seq`.
+//
+// Backpressure: each subscriber has a bounded queue. If a subscriber falls
+// behind by more than `maxQueue` events, its backlog is dropped and it gets
+// a single { type: 'resync' } event telling it to refetch.
+
+class EventStream {
+  constructor(channelName, { relay = [] } = {}) {
+    this.subscribers = new Set();
+    this.sequence = 0;
+    this.relay = relay; // event type prefixes relayed between tabs
+    this.channel = null;
+
+    if (typeof BroadcastChannel !== 'undefined' && relay.length > 0) {
+      this.channel = new BroadcastChannel(channelName);
+      this.channel.onmessage = (message) => this.receive(message.data);
+    }
+  }
+
+  // Publish an event to local subscribers and, for relayed types, other tabs
+  publish(type, data = {}) {
+    const event = { seq: ++this.sequence, type, ts: Date.now(), ...data };
+    this.deliver(event);
+    if (this.channel && this.matchesAny(this.relay, type)) {
+      try {
+        this.channel.postMessage(event);
+      } catch (error) {
+        console.error('Error relaying event to other tabs:', error);
+      }
+    }
+    return event;
+  }
+
+  // Deliver an event relayed from another tab
+  receive(data) {
+    if (!data || !this.matchesAny(this.relay, data.type)) return;
+    const { seq, ...event } = data;
+    this.deliver({ ...event, seq: ++this.sequence, remote_seq: seq, remote: true });
+  }
+
+  // Subscribe to event types by prefix ('booking' matches 'booking.created');
+  // '*' matches everything. handler(events) receives an array of events.
+  // Returns an unsubscribe function.
+  subscribe(types, handler, { maxQueue = 100 } = {}) {
+    const subscriber = {
+      types: Array.isArray(types) ? types : [types],
+      handler,
+      maxQueue,
+      queue: [],
+      overflowed: false,
+      scheduled: false
+    };
+    this.subscribers.add(subscriber);
+    return () => this.subscribers.delete(subscriber);
+  }
+
+  matches(subscriber, type) {
+    return this.matchesAny(subscriber.types, type);
+  }
+
+  matchesAny(prefixes, type) {
+    return prefixes.some(prefix =>
+      prefix === '*' || type === prefix || type.startsWith(`${prefix}.`)
+    );
+  }
+
+  deliver(event) {
+    this.subscribers.forEach(subscriber => {
+      if (!this.matches(subscriber, event.type)) return;
+
+      if (subscriber.overflowed) {
+        // Already behind: a resync is pending, nothing else to keep
+      } else if (subscriber.queue.length >= subscriber.maxQueue) {
+        subscriber.queue = [];
+        subscriber.overflowed = true;
+      } else {
+        subscriber.queue.push(event);
+      }
+
+      if (!subscriber.scheduled) {
+        subscriber.scheduled = true;
+        setTimeout(() => this.flush(subscriber), 0);
+      }
+    });
+  }
+
+  flush(subscriber) {
+    subscriber.scheduled = false;
+    if (!this.subscribers.has(subscriber)) return;
+
+    const events = subscriber.overflowed
+      ? [{ seq: this.sequence, type: 'resync', ts: Date.now() }]
+      : subscriber.queue;
+    subscriber.queue = [];
+    subscriber.overflowed = false;
+
+    if (events.length === 0) return;
+    try {
+      subscriber.handler(events);
+    } catch (error) {
+      console.error('Error in event subscriber:', error);
+    }
+  }
+}
+
+export default EventStream;
@@ -0,0 +1,117 @@
+// Hierarchy Index Service - in-memory reporting graph
+// Keeps parent and children maps next to the flat relationship list so
+// subtree and ancestor-chain queries only touch the nodes they return.
+
+class HierarchyIndex {
+  constructor() {
+    this.parentOf = new Map();   // employeeId -> reportsTo
+    this.childrenOf = new Map(); // reportsTo -> Set of employeeIds
+    this.derivedIds = new Set(); // employees whose line was derived from Excel
+  }
+
+  clear() {
+    this.parentOf.clear();
+    this.childrenOf.clear();
+    this.derivedIds.clear();
+  }
+
+  // Rebuild from a list of { employeeId, reportsTo, source } relationships
+  build(relations) {
+    this.clear();
+    relations.forEach(relation => this.add(relation));
+  }
+
+  add({ employeeId, reportsTo, source }) {
+    this.remove(employeeId);
+    this.parentOf.set(employeeId, reportsTo);
+    if (source === 'excel') {
+      this.derivedIds.add(employeeId);
+    }
+    if (!this.childrenOf.has(reportsTo)) {
+      this.childrenOf.set(reportsTo, new Set());
+    }
+    this.childrenOf.get(reportsTo).add(employeeId);
+  }
+
+  // Remove the reporting line of an employee (their own reports stay attached)
+  remove(employeeId) {
+    const reportsTo = this.parentOf.get(employeeId);
+    if (reportsTo === undefined) return false;
+
+    this.parentOf.delete(employeeId);
+    this.derivedIds.delete(employeeId);
+    const siblings = this.childrenOf.get(reportsTo);
+    siblings.delete(employeeId);
+    if (siblings.size === 0) {
+      this.childrenOf.delete(reportsTo);
+    }
+    return true;
+  }
+
+  hasManager(employeeId) {
+    return this.parentOf.has(employeeId);
+  }
+
+  // Excel-derived lines may be replaced by a manual relationship
+  hasDerivedManager(employeeId) {
+    return this.derivedIds.has(employeeId);
+  }
+
+  // Breadth-first walk below rootId, limited to maxDepth levels (null = unlimited)
+  // Returns [{ employeeId, reportsTo, depth }] in level order
+  subtree(rootId, maxDepth = null) {
+    const nodes = [];
+    const visited = new Set([rootId]);
+    let level = [rootId];
+    let depth = 0;
+
+    while (level.length > 0 && (maxDepth === null || depth < maxDepth)) {
+      depth++;
+      const nextLevel = [];
+      level.forEach(managerId => {
+        const children = this.childrenOf.get(managerId);
+        if (!children) return;
+        children.forEach(employeeId => {
+          if (visited.has(employeeId)) return;
+          visited.add(employeeId);
+          nodes.push({ employeeId, reportsTo: managerId, depth });
+          nextLevel.push(employeeId);
+        });
+      });
+      level = nextLevel;
+    }
+
+    return nodes;
+  }
+
+  // True if ancestorId appears in the reporting chain above employeeId
+  isAncestor(ancestorId, employeeId) {
+    const visited = new Set();
+    let current = this.parentOf.get(employeeId);
+
+    while (current !== undefined && !visited.has(current)) {
+      if (current === ancestorId) return true;
+      visited.add(current);
+      current = this.parentOf.get(current);
+    }
+
+    return false;
+  }
+
+  // Managers above an employee, nearest first
+  ancestors(employeeId) {
+    const chain = [];
+    const visited = new Set([employeeId]);
+    let current = this.parentOf.get(employeeId);
+
+    while (current !== undefined && !visited.has(current)) {
+      chain.push(current);
+      visited.add(current);
+      current = this.parentOf.get(current);
+    }
+
+    return chain;
+  }
+}
+
+export default HierarchyIndex;
@@ -0,0 +1,62 @@
+// Min Heap - binary heap ordered by a key function
+// Used for merging sorted streams and for deadline scheduling.
+
+class MinHeap {
+  constructor(getKey = item => item) {
+    this.getKey = getKey;
+    this.items = [];
+  }
+
+  get size() {
+    return this.items.length;
+  }
+
+  peek() {
+    return this.items.length > 0 ? this.items[0] : undefined;
+  }
+
+  push(item) {
+    const items = this.items;
+    items.push(item);
+
+    // Sift up
+    let index = items.length - 1;
+    while (index > 0) {
+      const parent = (index - 1) >>> 1;
+      if (this.getKey(items[parent]) <= this.getKey(items[index])) break;
+      [items[parent], items[index]] = [items[index], items[parent]];
+      index = parent;
+    }
+  }
+
+  pop() {
+    const items = this.items;
+    if (items.length === 0) return undefined;
+
+    const top = items[0];
+    const last = items.pop();
+    if (items.length > 0) {
+      items[0] = last;
+
+      // Sift down
+      let index = 0;
+      for (;;) {
+        const left = 2 * index + 1;
+        const right = left + 1;
+        let smallest = index;
+        if (left < items.length && this.getKey(items[left]) < this.getKey(items[smallest])) smallest = left;
+        if (right < items.length && this.getKey(items[right]) < this.getKey(items[smallest])) smallest = right;
+        if (smallest === index) break;
+        [items[smallest], items[index]] = [items[index], items[smallest]];
+        index = smallest;
+      }
+    }
+    return top;
+  }
+
+  clear() {
+    this.items = [];
+  }
+}
+
+export default MinHeap;
@@ -0,0 +1,508 @@
+// PDF Text Service - plain-text extraction for the company policy PDFs
+// Covers what those documents use: classic cross-reference files (no object
+// streams, no encryption), FlateDecode streams, and fonts mapped to Unicode
+// through a ToUnicode CMap or WinAnsiEncoding. Glyph widths place the text,
+// so words on a line are split where the PDF leaves a gap and lines and
+// paragraphs follow the text's vertical position.
+
+const WHITESPACE = ' \t\r\n\f\0';
+const DELIMITERS = '()<>[]{}/%';
+
+// Byte -> character for single-byte fonts without a ToUnicode map
+const WIN_ANSI = (() => {
+  const decoder = typeof TextDecoder !== 'undefined' ? new TextDecoder('windows-1252') : null;
+  return Array.from({ length: 256 }, (_, code) =>
+    decoder ? decoder.decode(Uint8Array.of(code)) : String.fromCharCode(code));
+})();
+
+// One character per byte, so string offsets are byte offsets
+const toBinaryString = (bytes) => {
+  let text = '';
+  for (let i = 0; i < bytes.length; i += 8192) {
+    text += String.fromCharCode.apply(null, bytes.subarray(i, i + 8192));
+  }
+  return text;
+};
+
+const fromUtf16Hex = (hex) => {
+  let text = '';
+  for (let i = 0; i + 4 <= hex.length; i += 4) {
+    text += String.fromCharCode(parseInt(hex.slice(i, i + 4), 16));
+  }
+  return text;
+};
+
+// Tokenizer for PDF objects and content streams
+class PdfLexer {
+  constructor(text, position = 0) {
+    this.text = text;
+    this.position = position;
+  }
+
+  skipWhitespace() {
+    const text = this.text;
+    while (this.position < text.length) {
+      const char = text[this.position];
+      if (char === '%') {
+        while (this.position < text.length && text[this.position] !== '\n' && text[this.position] !== '\r') {
+          this.position++;
+        }
+      } else if (WHITESPACE.includes(char)) {
+        this.position++;
+      } else {
+        break;
+      }
+    }
+  }
+
+  // { type: number|name|string|keyword|punct, value } or null at the end
+  next() {
+    this.skipWhitespace();
+    const text = this.text;
+    if (this.position >= text.length) return null;
+
+    const char = text[this.position];
+    if (char === '/') {
+      let end = this.position + 1;
+      while (end < text.length && !WHITESPACE.includes(text[end]) && !DELIMITERS.includes(text[end])) end++;
+      const value = text.slice(this.position + 1, end).replace(/#([0-9A-Fa-f]{2})/g, (_, hex) => String.fromCharCode(parseInt(hex, 16)));
+      this.position = end;
+      return { type: 'name', value };
+    }
+    if (char === '(') return { type: 'string', value: this.readLiteralString() };
+    if (char === '<' && text[this.position + 1] === '<') {
+      this.position += 2;
+      return { type: 'punct', value: '<<' };
+    }
+    if (char === '>' && text[this.position + 1] === '>') {
+      this.position += 2;
+      return { type: 'punct', value: '>>' };
+    }
+    if (char === '<') {
+      const end = text.indexOf('>', this.position);
+      const hex = text.slice(this.position + 1, end).replace(/[^0-9A-Fa-f]/g, '');
+      this.position = end + 1;
+      let value = '';
+      for (let i = 0; i < hex.length; i += 2) {
+        value += String.fromCharCode(parseInt(hex.slice(i, i + 2).padEnd(2, '0'), 16));
+      }
+      return { type: 'string', value, hex: true };
+    }
+    if ('[]{}'.includes(char)) {
+      this.position++;
+      return { type: 'punct', value: char };
+    }
+
+    let end = this.position;
+    while (end < text.length && !WHITESPACE.includes(text[end]) && !DELIMITERS.includes(text[end])) end++;
+    if (end === this.position) end++; // stray delimiter
+    const word = text.slice(this.position, end);
+    this.position = end;
+    return /^[+-]?(\d+\.?\d*|\.\d+)$/.test(word)
+      ? { type: 'number', value: parseFloat(word) }
+      : { type: 'keyword', value: word };
+  }
+
+  readLiteralString() {
+    const text = this.text;
+    let depth = 0;
+    let value = '';
+    let position = this.position;
+    for (; position < text.length; position++) {
+      const char = text[position];
+      if (char === '\\') {
+        const escaped = text[++position];
+        const simple = { n: '\n', r: '\r', t: '\t', b: '\b', f: '\f' };
+        if (simple[escaped]) {
+          value += simple[escaped];
+        } else if (escaped >= '0' && escaped <= '7') {
+          let octal = escaped;
+          while (octal.length < 3 && text[position + 1] >= '0' && text[position + 1] <= '7') {
+            octal += text[++position];
+          }
+          value += String.fromCharCode(parseInt(octal, 8) & 0xff);
+        } else if (escaped === '\r') {
+          if (text[position + 1] === '\n') position++;
+        } else if (escaped !== '\n') {
+          value += escaped;
+        }
+      } else if (char === '(') {
+        if (depth > 0) value += char;
+        depth++;
+      } else if (char === ')') {
+        depth--;
+        if (depth === 0) break;
+        value += char;
+      } else {
+        value += char;
+      }
+    }
+    this.position = position + 1;
+    return value;
+  }
+
+  // Next complete object: numbers, names ('/Name' -> 'Name'), strings,
+  // arrays, dictionaries (plain objects) and references ({ ref: number })
+  readObject(token = this.next()) {
+    if (!token) return null;
+    if (token.type === 'punct' && token.value === '[') {
+      const items = [];
+      for (let next = this.next(); next && !(next.type === 'punct' && next.value === ']'); next = this.next()) {
+        items.push(this.readObject(next));
+      }
+      return items;
+    }
+    if (token.type === 'punct' && token.value === '<<') {
+      const dict = {};
+      for (let key = this.next(); key && !(key.type === 'punct' && key.value === '>>'); key = this.next()) {
+        dict[key.value] = this.readObject();
+      }
+      return dict;
+    }
+    if (token.type === 'number' && Number.isInteger(token.value)) {
+      // "12 0 R" is a reference
+      const saved = this.position;
+      const generation = this.next();
+      const marker = generation && generation.type === 'number' ? this.next() : null;
+      if (marker && marker.type === 'keyword' && marker.value === 'R') {
+        return { ref: token.value };
+      }
+      this.position = saved;
+    }
+    if (token.type === 'keyword') {
+      if (token.value === 'true') return true;
+      if (token.value === 'false') return false;
+      if (token.value === 'null') return null;
+    }
+    return token.type === 'string' ? { string: token.value } : token.value;
+  }
+}
+
+// Character codes -> text and widths for one font
+class PdfFont {
+  constructor(document, dict) {
+    this.twoByte = dict.Subtype === 'Type0';
+    this.toUnicode = null;
+    this.widths = new Map();
+    this.defaultWidth = 1000;
+
+    const toUnicode = document.resolve(dict.ToUnicode);
+    if (toUnicode && toUnicode.data) {
+      this.toUnicode = this.parseCMap(toBinaryString(toUnicode.data));
+    }
+
+    if (this.twoByte) {
+      const descendants = document.resolve(dict.DescendantFonts) || [];
+      const descendant = document.resolve(descendants[0]) || {};
+      this.defaultWidth = descendant.DW || 1000;
+      this.readCidWidths(document.resolve(descendant.W) || []);
+    } else {
+      const first = dict.FirstChar || 0;
+      const widths = document.resolve(dict.Widths) || [];
+      widths.forEach((width, index) => this.widths.set(first + index, document.resolve(width)));
+      const descriptor = document.resolve(dict.FontDescriptor) || {};
+      this.defaultWidth = descriptor.MissingWidth || 500;
+    }
+  }
+
+  // W array: "c [w1 w2 ...]" or "cFirst cLast w"
+  readCidWidths(list) {
+    for (let i = 0; i < list.length;) {
+      const start = list[i];
+      if (Array.isArray(list[i + 1])) {
+        list[i + 1].forEach((width, offset) => this.widths.set(start + offset, width));
+        i += 2;
+      } else {
+        for (let code = start; code <= list[i + 1]; code++) this.widths.set(code, list[i + 2]);
+        i += 3;
+      }
+    }
+  }
+
+  // bfchar / bfrange sections of a ToUnicode CMap
+  parseCMap(text) {
+    const map = new Map();
+    const sections = /begin(bfchar|bfrange)([\s\S]*?)end\1/g;
+    let section;
+    while ((section = sections.exec(text)) !== null) {
+      const lexer = new PdfLexer(section[2]);
+      const tokens = [];
+      for (let token = lexer.next(); token; token = lexer.next()) {
+        tokens.push(token.type === 'punct' && token.value === '[' ? lexer.readObject(token) : token);
+      }
+      const hex = token => Array.from(token.value, char => char.charCodeAt(0).toString(16).padStart(2, '0')).join('');
+      if (section[1] === 'bfchar') {
+        for (let i = 0; i + 1 < tokens.length; i += 2) {
+          map.set(parseInt(hex(tokens[i]), 16), fromUtf16Hex(hex(tokens[i + 1])));
+        }
+      } else {
+        for (let i = 0; i + 2 < tokens.length; i += 3) {
+          const low = parseInt(hex(tokens[i]), 16);
+          const high = parseInt(hex(tokens[i + 1]), 16);
+          const target = tokens[i + 2];
+          for (let code = low; code <= high && code - low < 65536; code++) {
+            if (Array.isArray(target)) {
+              const entry = target[code - low];
+              if (entry && entry.string !== undefined) {
+                map.set(code, fromUtf16Hex(hex({ value: entry.string })));
+              }
+            } else {
+              const base = hex(target);
+              const last = parseInt(base.slice(-4), 16) + (code - low);
+              map.set(code, fromUtf16Hex(base.slice(0, -4) + last.toString(16).padStart(4, '0')));
+            }
+          }
+        }
+      }
+    }
+    return map;
+  }
+
+  // [{ code, text, width }] for a shown string (width in 1/1000 text space)
+  decode(bytes) {
+    const glyphs = [];
+    const step = this.twoByte ? 2 : 1;
+    for (let i = 0; i + step <= bytes.length; i += step) {
+      const code = this.twoByte
+        ? (bytes.charCodeAt(i) << 8) | bytes.charCodeAt(i + 1)
+        : bytes.charCodeAt(i);
+      const mapped = this.toUnicode && this.toUnicode.get(code);
+      glyphs.push({
+        code,
+        text: mapped !== undefined && mapped !== null ? mapped : (this.twoByte ? '' : WIN_ANSI[code]),
+        width: this.widths.has(code) ? this.widths.get(code) : this.defaultWidth
+      });
+    }
+    return glyphs;
+  }
+}
+
+class PdfDocument {
+  constructor(bytes) {
+    this.bytes = bytes;
+    this.text = toBinaryString(bytes);
+    this.objects = new Map(); // number -> { dict/value, data (raw stream bytes) }
+    this.readObjects();
+  }
+
+  readObjects() {
+    const text = this.text;
+    const header = /(\d+)\s+\d+\s+obj\b/g;
+    let match;
+    while ((match = header.exec(text)) !== null) {
+      const lexer = new PdfLexer(text, header.lastIndex);
+      const value = lexer.readObject();
+      const entry = { value, data: null };
+
+      const after = new PdfLexer(text, lexer.position);
+      const keyword = after.next();
+      if (keyword && keyword.type === 'keyword' && keyword.value === 'stream') {
+        let start = after.position;
+        if (text[start] === '\r') start++;
+        if (text[start] === '\n') start++;
+        const length = value && typeof value.Length === 'number' ? value.Length : null;
+        let end = length !== null && text.startsWith('endstream', this.skipEol(start + length))
+          ? start + length
+          : text.indexOf('endstream', start);
+        if (end === -1) end = text.length;
+        const dataEnd = length !== null && end === start + length ? end : this.trimEol(start, end);
+        entry.data = this.bytes.subarray(start, dataEnd);
+        header.lastIndex = end;
+      }
+      this.objects.set(parseInt(match[1], 10), entry);
+    }
+  }
+
+  skipEol(position) {
+    while (this.text[position] === '\r' || this.text[position] === '\n') position++;
+    return position;
+  }
+
+  trimEol(start, end) {
+    while (end > start && (this.text[end - 1] === '\r' || this.text[end - 1] === '\n')) end--;
+    return end;
+  }
+
+  // Follow a reference; stream objects come back as their dictionary with
+  // `data` holding the decoded bytes (after inflate())
+  resolve(value) {
+    if (value && typeof value === 'object' && value.ref !== undefined) {
+      const entry = this.objects.get(value.ref);
+      if (!entry) return null;
+      if (entry.data && entry.value && typeof entry.value === 'object') {
+        return { ...entry.value, data: entry.decoded || entry.data };
+      }
+      return entry.value;
+    }
+    return value;
+  }
+
+  // Inflate every FlateDecode stream up front (DecompressionStream is async)
+  async inflate() {
+    for (const entry of this.objects.values()) {
+      if (!entry.data || !entry.value) continue;
+      const filter = entry.value.Filter;
+      const filters = Array.isArray(filter) ? filter : filter ? [filter] : [];
+      if (filters.length === 1 && filters[0] === 'FlateDecode') {
+        try {
+          entry.decoded = await inflateBytes(entry.data);
+        } catch (error) {
+          entry.decoded = new Uint8Array(0);
+        }
+      } else if (filters.length > 0) {
+        entry.decoded = new Uint8Array(0); // images and other filters carry no text
+      }
+    }
+  }
+
+  // Page dictionaries in reading order, with inherited resources
+  pages() {
+    const trailerRoot = /\/Root\s+(\d+)\s+\d+\s+R/.exec(this.text);
+    let root = trailerRoot ? this.resolve({ ref: parseInt(trailerRoot[1], 10) }) : null;
+    if (!root) {
+      for (const entry of this.objects.values()) {
+        if (entry.value && entry.value.Type === 'Catalog') root = entry.value;
+      }
+    }
+    const pages = [];
+    const visit = (node, resources, depth) => {
+      if (!node || depth > 32) return;
+      const ownResources = this.resolve(node.Resources) || resources;
+      if (node.Type === 'Pages' || node.Kids) {
+        (this.resolve(node.Kids) || []).forEach(kid => visit(this.resolve(kid), ownResources, depth + 1));
+      } else {
+        pages.push({ page: node, resources: ownResources || {} });
+      }
+    };
+    visit(root ? this.resolve(root.Pages) : null, null, 0);
+    return pages;
+  }
+}
+
+const inflateBytes = async (bytes) => {
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+};
+
+class PdfTextExtractor {
+  // Text of each page, in order
+  async extract(arrayBuffer) {
+    const document = new PdfDocument(new Uint8Array(arrayBuffer));
+    await document.inflate();
+
+    return document.pages().map(({ page, resources }) => {
+      const contents = document.resolve(page.Contents);
+      const streams = Array.isArray(contents) ? contents.map(item => document.resolve(item)) : [contents];
+      const content = streams.filter(stream => stream && stream.data).map(stream => toBinaryString(stream.data)).join('\n');
+      return this.pageText(document, content, resources);
+    });
+  }
+
+  pageText(document, content, resources) {
+    const fontDicts = document.resolve(resources.Font) || {};
+    const fonts = new Map();
+    const fontFor = (name) => {
+      if (!fonts.has(name)) {
+        const dict = document.resolve(fontDicts[name]);
+        fonts.set(name, dict ? new PdfFont(document, dict) : null);
+      }
+      return fonts.get(name);
+    };
+
+    const state = {
+      font: null, size: 0, charSpacing: 0, wordSpacing: 0, scale: 1, leading: 0,
+      matrix: [1, 0, 0, 1, 0, 0], line: [1, 0, 0, 1, 0, 0]
+    };
+    let out = '';
+    let lastY = null;
+    let lastEnd = null;
+
+    const moveTo = (matrix) => {
+      state.matrix = matrix;
+      state.line = matrix;
+    };
+    const translate = (tx, ty) => {
+      const [a, b, c, d, e, f] = state.line;
+      moveTo([a, b, c, d, e + tx * a + ty * c, f + tx * b + ty * d]);
+    };
+    const show = (bytes) => {
+      if (!state.font) return;
+      const [a, , , d, x, y] = state.matrix;
+      const size = state.size * Math.abs(d || a || 1);
+      if (lastY !== null && Math.abs(y - lastY) > size * 0.5) {
+        out += Math.abs(y - lastY) > size * 2 ? '\n\n' : '\n';
+        lastEnd = null;
+      } else if (lastEnd !== null && x - lastEnd > size * 0.15 && !/\s$/.test(out)) {
+        out += ' ';
+      }
+
+      let advance = 0;
+      state.font.decode(bytes).forEach(glyph => {
+        out += glyph.text;
+        advance += (glyph.width / 1000) * state.size + state.charSpacing +
+          (!state.font.twoByte && glyph.code === 32 ? state.wordSpacing : 0);
+      });
+      state.matrix = [...state.matrix];
+      state.matrix[4] += advance * state.scale * a;
+      lastY = y;
+      lastEnd = state.matrix[4];
+    };
+
+    const lexer = new PdfLexer(content);
+    let operands = [];
+    for (let token = lexer.next(); token; token = lexer.next()) {
+      if (token.type !== 'keyword') {
+        operands.push(lexer.readObject(token));
+        continue;
+      }
+      const op = token.value;
+      const num = index => (typeof operands[index] === 'number' ? operands[index] : 0);
+      switch (op) {
+        case 'BT': moveTo([1, 0, 0, 1, 0, 0]); break;
+        case 'Tf': state.font = fontFor(operands[0]); state.size = num(1); break;
+        case 'Tc': state.charSpacing = num(0); break;
+        case 'Tw': state.wordSpacing = num(0); break;
+        case 'Tz': state.scale = num(0) / 100; break;
+        case 'TL': state.leading = num(0); break;
+        case 'Tm': moveTo(operands.slice(0, 6).map((value, index) => (typeof value === 'number' ? value : num(index)))); break;
+        case 'Td': translate(num(0), num(1)); break;
+        case 'TD': state.leading = -num(1); translate(num(0), num(1)); break;
+        case 'T*': translate(0, -state.leading); break;
+        case 'Tj': if (operands[0] && operands[0].string !== undefined) show(operands[0].string); break;
+        case "'":
+          translate(0, -state.leading);
+          if (operands[0] && operands[0].string !== undefined) show(operands[0].string);
+          break;
+        case '"':
+          state.wordSpacing = num(0);
+          state.charSpacing = num(1);
+          translate(0, -state.leading);
+          if (operands[2] && operands[2].string !== undefined) show(operands[2].string);
+          break;
+        case 'TJ':
+          (Array.isArray(operands[0]) ? operands[0] : []).forEach(item => {
+            if (typeof item === 'number') {
+              state.matrix = [...state.matrix];
+              state.matrix[4] -= (item / 1000) * state.size * state.scale * state.matrix[0];
+            } else if (item && item.string !== undefined) {
+              show(item.string);
+            }
+          });
+          break;
+        case 'ID': {
+          // Inline image data runs up to "EI"
+          const end = content.indexOf('EI', lexer.position);
+          lexer.position = end === -1 ? content.length : end + 2;
+          break;
+        }
+        default:
+          break;
+      }
+      operands = [];
+    }
+
+    return out.replace(/[ \t]+\n/g, '\n').replace(/\n{3,}/g, '\n\n').trim();
+  }
+}
+
+export default PdfTextExtractor;
@@ -0,0 +1,117 @@
+// Prefix Index Service - "starts with" lookups without scanning every record
+// Each field keeps its lowercased values in a sorted array, so a prefix query
+// is a binary search to the first match followed by a walk over the matches.
+
+class PrefixIndex {
+  constructor(fields) {
+    // fields: { fieldName: record => value }
+    this.fields = fields;
+    this.keys = {};   // field -> sorted array of lowercased values
+    this.ids = {};    // field -> record ids, parallel to this.keys[field]
+    this.keysById = new Map(); // id -> { field: key } for updates/removals
+    this.clear();
+  }
+
+  clear() {
+    Object.keys(this.fields).forEach(field => {
+      this.keys[field] = [];
+      this.ids[field] = [];
+    });
+    this.keysById.clear();
+  }
+
+  // Normalize a value the same way for indexing and querying
+  normalize(value) {
+    return value === null || value === undefined ? '' : String(value).toLowerCase();
+  }
+
+  // Rebuild the whole index from a list of records
+  build(records, getId = record => record.id) {
+    this.clear();
+
+    Object.entries(this.fields).forEach(([field, getValue]) => {
+      const pairs = records.map(record => [this.normalize(getValue(record)), getId(record)]);
+      pairs.sort((a, b) => (a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0));
+      this.keys[field] = pairs.map(pair => pair[0]);
+      this.ids[field] = pairs.map(pair => pair[1]);
+    });
+
+    records.forEach(record => {
+      const keys = {};
+      Object.entries(this.fields).forEach(([field, getValue]) => {
+        keys[field] = this.normalize(getValue(record));
+      });
+      this.keysById.set(getId(record), keys);
+    });
+  }
+
+  // Insert or re-index a single record
+  upsert(record, getId = record => record.id) {
+    const id = getId(record);
+    this.remove(id);
+
+    const keys = {};
+    Object.entries(this.fields).forEach(([field, getValue]) => {
+      const key = this.normalize(getValue(record));
+      const position = this.lowerBound(this.keys[field], key);
+      this.keys[field].splice(position, 0, key);
+      this.ids[field].splice(position, 0, id);
+      keys[field] = key;
+    });
+    this.keysById.set(id, keys);
+  }
+
+  // Remove a record from every field
+  remove(id) {
+    const keys = this.keysById.get(id);
+    if (!keys) return;
+
+    Object.entries(keys).forEach(([field, key]) => {
+      const fieldKeys = this.keys[field];
+      const fieldIds = this.ids[field];
+      for (let i = this.lowerBound(fieldKeys, key); i < fieldKeys.length && fieldKeys[i] === key; i++) {
+        if (fieldIds[i] === id) {
+          fieldKeys.splice(i, 1);
+          fieldIds.splice(i, 1);
+          break;
+        }
+      }
+    });
+    this.keysById.delete(id);
+  }
+
+  // Return the set of ids whose value starts with prefix in any of the given fields
+  lookup(prefix, fields = Object.keys(this.fields)) {
+    const search = this.normalize(prefix);
+    const matches = new Set();
+
+    fields.forEach(field => {
+      const fieldKeys = this.keys[field];
+      const fieldIds = this.ids[field];
+      if (!fieldKeys) return;
+
+      for (let i = this.lowerBound(fieldKeys, search); i < fieldKeys.length && fieldKeys[i].startsWith(search); i++) {
+        matches.add(fieldIds[i]);
+      }
+    });
+
+    return matches;
+  }
+
+  // First position whose key is >= value
+  lowerBound(sortedKeys, value) {
+    let low = 0;
+    let high = sortedKeys.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (sortedKeys[mid] < value) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+}
+
+export default PrefixIndex;
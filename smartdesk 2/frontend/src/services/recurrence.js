@@ -0,0 +1,194 @@
+// Recurrence Service - lazy expansion of recurring bookings
+// A recurring booking is stored once, as its first occurrence plus a rule
+// ({ frequency, interval, days_of_week, until, count }) and a list of
+// skipped occurrence starts. Occurrences are generated on demand for the
+// window being queried; nothing is materialized up front.
+//
+// Occurrences keep the wall-clock time of the first one (day steps use
+// local calendar days), and must not overlap each other.
+
+import { toEpoch } from './bookingIndex';
+
+const DAY = 24 * 60 * 60 * 1000;
+const FREQUENCIES = ['daily', 'weekly'];
+
+const gcd = (a, b) => (b === 0 ? a : gcd(b, a % b));
+
+class RecurrenceRule {
+  constructor(booking) {
+    const recurrence = booking.recurrence;
+    this.booking = booking;
+    this.id = booking.id;
+    this.start = toEpoch(booking.start_time);
+    this.duration = toEpoch(booking.end_time) - this.start;
+    this.interval = recurrence.interval || 1;
+    this.stepDays = recurrence.frequency === 'weekly' ? 7 * this.interval : this.interval;
+    this.until = recurrence.until ? toEpoch(recurrence.until) : Infinity;
+    this.count = recurrence.count || Infinity;
+    this.exceptions = new Set((booking.exceptions || []).map(toEpoch));
+
+    // Day offsets inside one period, relative to the first occurrence's day.
+    // Weekly periods are calendar weeks (Sunday first, like days_of_week), so
+    // days earlier in the week than the first occurrence get negative offsets
+    // and are skipped in period 0 only.
+    const firstWeekday = new Date(this.start).getDay();
+    const days = recurrence.frequency === 'weekly' && recurrence.days_of_week && recurrence.days_of_week.length > 0
+      ? recurrence.days_of_week
+      : [firstWeekday];
+    this.offsets = recurrence.frequency === 'weekly'
+      ? [...new Set(days.map(day => day - firstWeekday))].sort((a, b) => a - b)
+      : [0];
+    // Offsets that fall before the first occurrence in period 0
+    this.skipped = this.offsets.filter(offset => offset < 0).length;
+
+    this.lastEnd = this.computeLastEnd();
+  }
+
+  // Throws if a recurrence definition cannot be stored
+  static validate(recurrence, start, end) {
+    if (!recurrence || !FREQUENCIES.includes(recurrence.frequency)) {
+      throw new Error(`Recurrence frequency must be one of: ${FREQUENCIES.join(', ')}`);
+    }
+
+    const interval = recurrence.interval === undefined ? 1 : recurrence.interval;
+    if (!Number.isInteger(interval) || interval < 1) {
+      throw new Error('Recurrence interval must be a positive whole number');
+    }
+
+    const days = recurrence.days_of_week || [];
+    if (days.some(day => !Number.isInteger(day) || day < 0 || day > 6)) {
+      throw new Error('days_of_week must contain weekday numbers 0 (Sunday) to 6 (Saturday)');
+    }
+    if (days.length > 0 && recurrence.frequency !== 'weekly') {
+      throw new Error('days_of_week is only supported for weekly recurrence');
+    }
+    // The booked slot itself is the first occurrence, so its (local)
+    // weekday must be one of the repeat days
+    if (days.length > 0 && !days.includes(new Date(start).getDay())) {
+      throw new Error('days_of_week must include the weekday of the first booking');
+    }
+
+    if (recurrence.until !== undefined && recurrence.until !== null) {
+      const until = toEpoch(recurrence.until);
+      if (isNaN(until) || until < start) {
+        throw new Error('Recurrence end date must be after the first occurrence');
+      }
+    }
+    if (recurrence.count !== undefined && recurrence.count !== null &&
+        (!Number.isInteger(recurrence.count) || recurrence.count < 1)) {
+      throw new Error('Recurrence count must be a positive whole number');
+    }
+
+    // Consecutive occurrences must not overlap, including the last day of
+    // one period and the first day of the next
+    const rule = new RecurrenceRule({ id: 'validate', start_time: start, end_time: end, recurrence });
+    const offsets = rule.offsets;
+    let minGapDays = rule.stepDays - offsets[offsets.length - 1] + offsets[0];
+    for (let i = 1; i < offsets.length; i++) {
+      minGapDays = Math.min(minGapDays, offsets[i] - offsets[i - 1]);
+    }
+    if (end - start > minGapDays * DAY) {
+      throw new Error('Booking is longer than the gap between its occurrences');
+    }
+  }
+
+  // "<ruleId>@<start epoch>" identifies one occurrence
+  static occurrenceId(ruleId, start) {
+    return `${ruleId}@${start}`;
+  }
+
+  static parseOccurrenceId(id) {
+    const separator = typeof id === 'string' ? id.lastIndexOf('@') : -1;
+    if (separator === -1) return null;
+    const start = Number(id.slice(separator + 1));
+    return isNaN(start) ? null : { ruleId: id.slice(0, separator), start };
+  }
+
+  // Start of the n-th candidate day after the first occurrence (local calendar days)
+  startOnDay(dayIndex) {
+    const date = new Date(this.start);
+    date.setDate(date.getDate() + dayIndex);
+    return date.getTime();
+  }
+
+  // End of the last occurrence, or Infinity for open-ended rules
+  computeLastEnd() {
+    let last = null;
+    if (this.count !== Infinity) {
+      const slot = this.count - 1 + this.skipped;
+      const period = Math.floor(slot / this.offsets.length);
+      last = this.startOnDay(period * this.stepDays + this.offsets[slot % this.offsets.length]);
+    }
+    if (this.until !== Infinity) {
+      last = last === null ? this.until : Math.min(last, this.until);
+    }
+    return last === null ? Infinity : last + this.duration;
+  }
+
+  // Occurrences overlapping [from, to), earliest first, exceptions skipped
+  *occurrences(from = -Infinity, to = Infinity) {
+    if (to <= this.start || from >= this.lastEnd) return;
+
+    // Jump close to `from`; one period of slack covers DST shifts
+    const periodLength = this.stepDays * DAY;
+    let period = from === -Infinity
+      ? 0
+      : Math.max(Math.floor((from - this.duration - this.start) / periodLength) - 1, 0);
+
+    for (;; period++) {
+      for (let i = period === 0 ? this.skipped : 0; i < this.offsets.length; i++) {
+        const ordinal = period * this.offsets.length + i - this.skipped;
+        const start = this.startOnDay(period * this.stepDays + this.offsets[i]);
+        if (ordinal >= this.count || start > this.until || start >= to) return;
+        if (start + this.duration <= from || this.exceptions.has(start)) continue;
+        yield { start, end: start + this.duration, id: RecurrenceRule.occurrenceId(this.id, start) };
+      }
+    }
+  }
+
+  // First occurrence overlapping [from, to), or null
+  occurrenceIn(from, to) {
+    const next = this.occurrences(from, to).next();
+    return next.done ? null : next.value;
+  }
+
+  // First pair of overlapping occurrences between two rules, or null.
+  // Both rules repeat with a common period of lcm(stepDays) days, so once
+  // past their exceptions one common period is enough to find a clash.
+  firstOverlapWith(other) {
+    const from = Math.max(this.start, other.start);
+    const commonDays = (this.stepDays * other.stepDays) / gcd(this.stepDays, other.stepDays);
+    const lastException = Math.max(from, ...this.exceptions, ...other.exceptions);
+    const to = Math.min(this.lastEnd, other.lastEnd, lastException + (commonDays + 1) * DAY);
+
+    const mine = this.occurrences(from, to);
+    const theirs = other.occurrences(from, to);
+    let a = mine.next();
+    let b = theirs.next();
+    while (!a.done && !b.done) {
+      if (a.value.start < b.value.end && b.value.start < a.value.end) {
+        return a.value;
+      }
+      if (a.value.end <= b.value.end) {
+        a = mine.next();
+      } else {
+        b = theirs.next();
+      }
+    }
+    return null;
+  }
+
+  // Booking-shaped record for one occurrence
+  materialize(occurrence) {
+    const { recurrence, exceptions, ...booking } = this.booking;
+    return {
+      ...booking,
+      id: occurrence.id,
+      rule_id: this.id,
+      start_time: new Date(occurrence.start).toISOString(),
+      end_time: new Date(occurrence.end).toISOString()
+    };
+  }
+}
+
+export default RecurrenceRule;
@@ -0,0 +1,203 @@
+// Search Index Service - in-memory inverted index with BM25 ranking
+// Documents are tokenized and lightly stemmed into terms; each term keeps a
+// posting list of the documents containing it with their term counts. A
+// query only visits the postings of its own terms, and documents are
+// added, replaced and removed one at a time as the collections change.
+
+import MinHeap from './minHeap';
+
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+const SNIPPET_LENGTH = 160;
+
+const STOP_WORDS = new Set([
+  'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have',
+  'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'were',
+  'will', 'with', 'this', 'these', 'those', 'i', 'we', 'you', 'our', 'your'
+]);
+
+// Light suffix stripping (plurals, -ing, -ed, -ly, ...). Not a full Porter
+// stemmer, but queries go through the same function, so "policies" finds
+// "policy" and "booking" finds "booked". A final "ll" is always reduced to
+// "l", so British and American spellings meet: "travelling" and
+// "travel", "cancelled" and "cancel" (and "call" and "calling").
+export const stem = (word) => {
+  if (word.length <= 3 || /^\d+$/.test(word)) return word;
+
+  let stemmed = word;
+  if (stemmed.endsWith('ies') && stemmed.length > 4) {
+    stemmed = stemmed.slice(0, -3) + 'y';
+  } else if (stemmed.endsWith('sses')) {
+    stemmed = stemmed.slice(0, -2);
+  } else if (stemmed.endsWith('s') && !stemmed.endsWith('ss') && !stemmed.endsWith('us')) {
+    stemmed = stemmed.slice(0, -1);
+  }
+
+  for (const suffix of ['ingly', 'edly', 'ing', 'ed', 'ly', 'ment']) {
+    if (stemmed.endsWith(suffix) && stemmed.length - suffix.length >= 3) {
+      stemmed = stemmed.slice(0, -suffix.length);
+      // hopping -> hopp -> hop
+      if (/([^aeiouslz])\1$/.test(stemmed)) stemmed = stemmed.slice(0, -1);
+      break;
+    }
+  }
+  if (stemmed.endsWith('ll')) stemmed = stemmed.slice(0, -1);
+  return stemmed;
+};
+
+// Lowercased words with their stems, stop words dropped
+export const tokenize = (text) => {
+  const words = String(text === null || text === undefined ? '' : text).toLowerCase().match(/[a-z0-9]+/g) || [];
+  return words.filter(word => !STOP_WORDS.has(word)).map(stem);
+};
+
+class SearchIndex {
+  constructor() {
+    this.documents = new Map(); // key -> { key, type, id, title, text, meta, length, terms }
+    this.postings = new Map();  // term -> Map of document key -> term count
+    this.totalLength = 0;
+    this.version = 0; // bumped on every change, for callers caching results
+  }
+
+  clear() {
+    this.documents.clear();
+    this.postings.clear();
+    this.totalLength = 0;
+    this.version++;
+  }
+
+  get size() {
+    return this.documents.size;
+  }
+
+  // document: { type, id, title, text, meta }; the title counts twice, so
+  // title matches outrank body matches. meta is returned with results
+  // as-is. Re-adding a key replaces the document.
+  add(key, document) {
+    this.remove(key);
+
+    const tokens = [...tokenize(document.title), ...tokenize(document.title), ...tokenize(document.text)];
+    const terms = new Map();
+    tokens.forEach(term => terms.set(term, (terms.get(term) || 0) + 1));
+
+    terms.forEach((count, term) => {
+      if (!this.postings.has(term)) {
+        this.postings.set(term, new Map());
+      }
+      this.postings.get(term).set(key, count);
+    });
+
+    this.documents.set(key, {
+      key,
+      type: document.type,
+      id: document.id,
+      title: document.title || '',
+      text: document.text || '',
+      meta: document.meta || null,
+      length: tokens.length,
+      terms: [...terms.keys()]
+    });
+    this.totalLength += tokens.length;
+    this.version++;
+  }
+
+  remove(key) {
+    const document = this.documents.get(key);
+    if (!document) return false;
+
+    document.terms.forEach(term => {
+      const posting = this.postings.get(term);
+      posting.delete(key);
+      if (posting.size === 0) this.postings.delete(term);
+    });
+    this.documents.delete(key);
+    this.totalLength -= document.length;
+    this.version++;
+    return true;
+  }
+
+  // BM25 scores for the documents matching any query term
+  // filter (optional): document => boolean
+  score(query, filter = null) {
+    const terms = [...new Set(tokenize(query))];
+    const scores = new Map();
+    if (terms.length === 0 || this.documents.size === 0) return scores;
+
+    const documentCount = this.documents.size;
+    const averageLength = this.totalLength / documentCount || 1;
+
+    terms.forEach(term => {
+      const posting = this.postings.get(term);
+      if (!posting) return;
+
+      const idf = Math.log(1 + (documentCount - posting.size + 0.5) / (posting.size + 0.5));
+      posting.forEach((count, key) => {
+        const document = this.documents.get(key);
+        if (filter && !filter(document)) return;
+        const norm = BM25_K1 * (1 - BM25_B + BM25_B * document.length / averageLength);
+        scores.set(key, (scores.get(key) || 0) + idf * (count * (BM25_K1 + 1)) / (count + norm));
+      });
+    });
+    return scores;
+  }
+
+  // Best `limit` [key, score] pairs, best first, kept in a bounded min-heap
+  // instead of sorting every match
+  top(scores, limit) {
+    const heap = new MinHeap(entry => entry[1]);
+    scores.forEach((score, key) => {
+      if (score <= 0) return;
+      if (heap.size < limit) {
+        heap.push([key, score]);
+      } else if (score > heap.peek()[1]) {
+        heap.pop();
+        heap.push([key, score]);
+      }
+    });
+
+    const ranked = [];
+    while (heap.size > 0) ranked.push(heap.pop());
+    return ranked.reverse();
+  }
+
+  // Top `limit` matches, best first: [{ key, type, id, title, meta, score, snippet }]
+  search(query, { limit = 10, types = null } = {}) {
+    const filter = types && types.length > 0 ? document => types.includes(document.type) : null;
+    const ranked = this.top(this.score(query, filter), limit);
+
+    const terms = new Set(tokenize(query));
+    return ranked.map(([key, score]) => {
+      const document = this.documents.get(key);
+      return {
+        key,
+        type: document.type,
+        id: document.id,
+        title: document.title,
+        meta: document.meta,
+        score: Math.round(score * 1000) / 1000,
+        snippet: this.snippet(document.text, terms)
+      };
+    });
+  }
+
+  // About SNIPPET_LENGTH characters of text around the first query term
+  snippet(text, terms) {
+    if (text.length <= SNIPPET_LENGTH) return text;
+
+    const pattern = /[A-Za-z0-9]+/g;
+    let position = 0;
+    let match;
+    while ((match = pattern.exec(text)) !== null) {
+      if (terms.has(stem(match[0].toLowerCase()))) {
+        position = match.index;
+        break;
+      }
+    }
+
+    const start = Math.max(0, Math.min(position - SNIPPET_LENGTH / 4, text.length - SNIPPET_LENGTH));
+    const end = Math.min(text.length, start + SNIPPET_LENGTH);
+    return (start > 0 ? '…' : '') + text.slice(start, end).trim() + (end < text.length ? '…' : '');
+  }
+}
+
+export default SearchIndex;